@@ -0,0 +1,532 @@
+"""
+Implements the recursive kernels used by the technical
+indicators, with a numpy backend and a numba backend.
+The numpy backend is the default. The backend is chosen with
+set_backend or with the FINANCE_TOOLKIT_BACKEND environment
+variable (numpy, numba or auto, which uses numba if installed).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Environment variable read when no backend was set
+ENV_VAR = 'FINANCE_TOOLKIT_BACKEND'
+
+# Upper bound for log(alpha ** -k) inside a scan block.
+# Keeps the rescaled terms of the recurrence finite.
+_SCAN_LIMIT = 50.0
+
+# Backend chosen with set_backend, None falls back to the environment
+_backend = None
+
+def available_backends():
+    """
+    Names of the backends that can be used.
+    Returns
+    ----------
+    list
+        numpy and, if it is installed, numba
+    """
+
+    return ['numpy', 'numba'] if numba is not None else ['numpy']
+
+def _resolve(name):
+    """
+    Check a backend name, auto is replaced by the fastest available.
+    """
+
+    if not isinstance(name, str):
+        raise TypeError('Backend name is not a string.')
+
+    name = name.lower()
+    if name == 'auto':
+        return available_backends()[-1]
+    if name not in ['numpy', 'numba']:
+        raise ValueError('Backend must be one of numpy, numba or auto.')
+    if name not in available_backends():
+        raise ValueError('Backend numba is not available, numba is not installed.')
+
+    return name
+
+def set_backend(name):
+    """
+    Choose the backend used by the kernels.
+    Parameters
+    ----------
+    name: str
+        numpy, numba or auto. None goes back to the
+        FINANCE_TOOLKIT_BACKEND environment variable.
+    Returns
+    ----------
+    str
+        Name of the previous backend
+    """
+
+    global _backend
+
+    previous = get_backend()
+    _backend = None if name is None else _resolve(name)
+
+    return previous
+
+def get_backend():
+    """
+    Name of the backend used by the kernels.
+    Returns
+    ----------
+    str
+        numpy or numba
+    """
+
+    if _backend is not None:
+        return _backend
+
+    return _resolve(os.environ.get(ENV_VAR, 'numpy'))
+
+def _numpy_linear_recurrence(values, alpha, beta, start, seed, out):
+    """
+    Blocked closed form scan, see linear_recurrence.
+    Inside each block the recurrence has the closed form
+    y[k] = alpha^k * (y[0] + sum(beta * x[j] / alpha^j)), which
+    is computed with a cumulative sum. Only the last value of a
+    block is carried to the next one.
+    """
+
+    n = values.shape[0]
+
+    out[start] = seed
+    if alpha == 0:
+        np.multiply(values[start+1:], beta, out=out[start+1:])
+        return out
+
+    # Largest block where alpha ** -block stays well inside float range
+    block = max(1, int(_SCAN_LIMIT / -np.log(alpha)))
+    decay = alpha ** np.arange(1, min(block, n) + 1)
+    if values.ndim > 1:
+        decay = decay.reshape((-1,) + (1,) * (values.ndim - 1))
+
+    # Blocks are computed in float64, a float32 output only stores them
+    prev = out[start]
+    for i in range(start + 1, n, block):
+        chunk = values[i:i+block]
+        w = decay[:chunk.shape[0]]
+        y = w * (prev + np.cumsum(beta * chunk / w, axis=0))
+        out[i:i+block] = y
+        prev = y[-1]
+
+    return out
+
+def _numpy_ewm_mean(values, alpha, out):
+    """
+    pandas compiled weighted mean, see ewm_mean. It is faster
+    than a scan over two linear recurrences and has the same rules.
+    """
+
+    frame = pd.DataFrame(values, copy=False) if values.ndim > 1 \
+        else pd.Series(values, copy=False)
+    out[...] = frame.ewm(alpha=alpha).mean().to_numpy()
+
+    return out
+
+def _numpy_macd(values, slow_alpha, fast_alpha, signal_alpha, slow, fast, line, signal):
+    """
+    Three pandas weighted means, see macd. The slow mean buffer
+    holds the MACD line when the means are not kept. Each mean is
+    a separate pass: fusing them needs a compiled loop (numba), and
+    a numpy scan over linear_recurrence is slower than pandas ewm.
+    """
+
+    keep = slow.shape[0] > 0
+    slow = _numpy_ewm_mean(values, slow_alpha, slow if keep else line)
+    fast = _numpy_ewm_mean(values, fast_alpha, fast if keep else np.empty_like(line))
+    np.subtract(slow, fast, out=line)
+    np.abs(line, out=line)
+    _numpy_ewm_mean(line, signal_alpha, signal)
+
+    return line, signal
+
+def _numpy_rolling_mean_std(values, window, mean, std):
+    """
+    pandas compiled rolling kernels, see rolling_mean_std. The mean
+    keeps a compensated running sum and the variance Welford updates,
+    both updated as values enter and leave the window.
+    """
+
+    frame = pd.DataFrame if values.ndim > 1 else pd.Series
+    mean[...] = frame(values, copy=False).rolling(window).mean().to_numpy()
+    # Variance does not change with a shift, the running sums
+    # are kept small by taking each series from its average
+    shift = pd.DataFrame(_as_2d(mean), copy=False).mean().to_numpy()
+    std[...] = frame(mean - shift.reshape(mean.shape[1:]), copy=False) \
+        .rolling(window).std().to_numpy()
+
+    return mean, std
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _numba_linear_recurrence(values, alpha, beta, start, seed, out):
+        """
+        Row by row loop over a 2-D array, see linear_recurrence.
+        """
+
+        out[start] = seed
+        for i in range(start + 1, values.shape[0]):
+            for j in range(values.shape[1]):
+                out[i, j] = alpha * out[i-1, j] + beta * values[i, j]
+
+        return out
+
+    @numba.njit(cache=True)
+    def _ewm_step(mean, weight, x, decay):
+        """
+        One update of a weighted mean with pandas adjust=True rules,
+        in the same operations as pandas, so results are equal.
+        weight is the total weight of the past values.
+        """
+
+        if np.isnan(mean):
+            # Up to the first valid value
+            return x, weight
+        weight *= decay
+        if not np.isnan(x):
+            # Constant series stay constant
+            if mean != x:
+                mean = (weight * mean + x) / (weight + 1.0)
+            weight += 1.0
+
+        return mean, weight
+
+    @numba.njit(cache=True)
+    def _numba_ewm_mean(values, decay, out):
+        """
+        Row by row loop over a 2-D array, see ewm_mean.
+        """
+
+        means = np.full(values.shape[1], np.nan)
+        weights = np.ones(values.shape[1])
+        for i in range(values.shape[0]):
+            for j in range(values.shape[1]):
+                means[j], weights[j] = _ewm_step(means[j], weights[j], values[i, j], decay)
+                out[i, j] = means[j]
+
+        return out
+
+    @numba.njit(cache=True)
+    def _numba_macd(values, slow_decay, fast_decay, signal_decay, slow, fast, line, signal):
+        """
+        Row by row loop over a 2-D array, see macd. The slow, fast and
+        signal means are updated together from one read of each value.
+        The slow and fast means are only written when their arrays have rows.
+        """
+
+        keep = slow.shape[0] > 0
+        m = values.shape[1]
+        # Mean and weight of the slow, fast and signal means of each column
+        means = np.full((3, m), np.nan)
+        weights = np.ones((3, m))
+        for i in range(values.shape[0]):
+            for j in range(m):
+                x = values[i, j]
+                means[0, j], weights[0, j] = _ewm_step(means[0, j], weights[0, j], x, slow_decay)
+                means[1, j], weights[1, j] = _ewm_step(means[1, j], weights[1, j], x, fast_decay)
+                if keep:
+                    slow[i, j] = means[0, j]
+                    fast[i, j] = means[1, j]
+
+                # The signal is the weighted mean of the line as stored
+                line[i, j] = abs(means[0, j] - means[1, j])
+                means[2, j], weights[2, j] = _ewm_step(means[2, j], weights[2, j], line[i, j],
+                                                       signal_decay)
+                signal[i, j] = means[2, j]
+
+        return line, signal
+
+    @numba.njit(cache=True)
+    def _numba_rolling_mean_std(values, window, mean, std):
+        """
+        Single loop over each column of a 2-D array, see rolling_mean_std.
+        The sum of the values in the window is Kahan compensated, the
+        variance of the means in the window follows Welford updates.
+        Rounding of the updates adds up over the series, so once every
+        window rows both are summed again from the window, which keeps
+        the loop O(n). A missing value makes every window that holds it NaN.
+        """
+
+        n = values.shape[0]
+        for j in range(values.shape[1]):
+            total = 0.0
+            compensation = 0.0
+            nans = 0
+            count = 0
+            average = 0.0
+            m2 = 0.0
+            mean_nans = 0
+            pivot = 0.0
+            for i in range(n):
+                # Rolling mean, value i enters and value i - window leaves
+                x = values[i, j]
+                if np.isnan(x):
+                    nans += 1
+                else:
+                    y = x - compensation
+                    t = total + y
+                    compensation = (t - total) - y
+                    total = t
+                if i >= window:
+                    x = values[i-window, j]
+                    if np.isnan(x):
+                        nans -= 1
+                    else:
+                        y = -x - compensation
+                        t = total + y
+                        compensation = (t - total) - y
+                        total = t
+                resync = i % window == window - 1
+                if resync and nans == 0:
+                    total = 0.0
+                    compensation = 0.0
+                    for k in range(i - window + 1, i + 1):
+                        y = values[k, j] - compensation
+                        t = total + y
+                        compensation = (t - total) - y
+                        total = t
+                if i >= window - 1 and nans == 0:
+                    mean[i, j] = total / window
+                else:
+                    mean[i, j] = np.nan
+
+                # Rolling variance of the stored means, so the same
+                # rounded value enters and leaves the window. Means are
+                # taken from a pivot near them, which keeps the updates
+                # exact at large price levels.
+                x = mean[i, j] - pivot
+                if np.isnan(x):
+                    mean_nans += 1
+                else:
+                    count += 1
+                    delta = x - average
+                    average += delta / count
+                    m2 += delta * (x - average)
+                if i >= window:
+                    x = mean[i-window, j] - pivot
+                    if np.isnan(x):
+                        mean_nans -= 1
+                    else:
+                        count -= 1
+                        if count == 0:
+                            average = 0.0
+                            m2 = 0.0
+                        else:
+                            delta = x - average
+                            average -= delta / count
+                            m2 -= delta * (x - average)
+                if resync and mean_nans == 0:
+                    # Two pass variance of the window, from a new pivot
+                    pivot = mean[i, j]
+                    average = 0.0
+                    for k in range(i - window + 1, i + 1):
+                        average += mean[k, j] - pivot
+                    average /= window
+                    m2 = 0.0
+                    for k in range(i - window + 1, i + 1):
+                        m2 += (mean[k, j] - pivot - average) ** 2
+                if window > 1 and i >= window - 1 and mean_nans == 0:
+                    std[i, j] = np.sqrt(max(m2, 0.0) / (window - 1))
+                else:
+                    std[i, j] = np.nan
+
+        return mean, std
+
+def _decay(alpha):
+    """
+    Decay of the weights for a smoothing factor, computed as pandas
+    does from the center of mass 1 / alpha - 1, to the last bit.
+    """
+
+    return 1 - 1 / (1 + (1 / alpha - 1))
+
+def _float(values):
+    """
+    Array of floats, float32 and float64 arrays are kept as they are.
+    """
+
+    values = np.asarray(values)
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(float)
+
+    return values
+
+def _as_2d(values):
+    """
+    View of a 1-D or 2-D array as 2-D (observations x series).
+    """
+
+    return values.reshape(values.shape[0], -1)
+
+def linear_recurrence(values, alpha, beta, start, seed, out=None):
+    """
+    Solve y[i] = alpha * y[i-1] + beta * x[i] along the first axis.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with input values,
+        float32 input gives float32 output
+    alpha: float
+        Decay factor, must be in [0, 1)
+    beta: float
+        Weight of the new observation
+    start: int
+        Position of the seed value, all positions before it are NaN
+    seed: float/np.ndarray
+        Value of y at position start (one per column for 2-D input)
+    out: np.ndarray
+        Array where the result is written, can be values itself
+    Returns
+    ----------
+    np.ndarray
+        Array with the same shape as values
+    """
+
+    values = _float(values)
+    if out is None:
+        out = np.empty(values.shape, dtype=values.dtype)
+
+    out[:start] = np.nan
+    if start >= values.shape[0]:
+        return out
+
+    if get_backend() == 'numba':
+        seed = np.broadcast_to(np.asarray(seed, dtype=float), values.shape[1:]).reshape(-1)
+        _numba_linear_recurrence(_as_2d(values), float(alpha), float(beta),
+                                 start, seed, _as_2d(out))
+        return out
+
+    return _numpy_linear_recurrence(values, alpha, beta, start, seed, out)
+
+def ewm_mean(values, alpha, out=None):
+    """
+    Exponentially weighted mean along the first axis, with
+    the same rules as pandas ewm(alpha=alpha).mean(): weights
+    (1 - alpha)^k are adjusted for the start of the series and
+    missing values keep the previous mean while its weights decay.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with input values,
+        float32 input gives float32 output
+    alpha: float
+        Smoothing factor, must be in (0, 1]. A span s gives 2 / (s + 1).
+    out: np.ndarray
+        Array where the result is written
+    Returns
+    ----------
+    np.ndarray
+        Array with the same shape as values, NaN before
+        the first valid observation
+    """
+
+    values = _float(values)
+    if out is None:
+        out = np.empty(values.shape, dtype=values.dtype)
+    if values.shape[0] == 0:
+        return out
+
+    if get_backend() == 'numba':
+        _numba_ewm_mean(_as_2d(values), _decay(float(alpha)), _as_2d(out))
+        return out
+
+    return _numpy_ewm_mean(values, alpha, out)
+
+def macd(values, slow_alpha, fast_alpha, signal_alpha, emas=False):
+    """
+    MACD line and signal line along the first axis. The line is
+    the absolute difference of the slow and fast weighted means
+    of values, the signal its weighted mean, all with the rules
+    of ewm_mean (pandas ewm(alpha=alpha).mean(), adjust=True).
+    The numba backend computes the three means in one pass, the
+    numpy backend needs one pandas ewm pass for each of them.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with input values,
+        float32 input gives float32 output
+    slow_alpha: float
+        Smoothing factor of the slow mean. A span s gives 2 / (s + 1).
+    fast_alpha: float
+        Smoothing factor of the fast mean
+    signal_alpha: float
+        Smoothing factor of the signal line
+    emas: bool
+        Return the slow and fast means too
+    Returns
+    ----------
+    tuple
+        MACD line and signal line, preceded by the slow and fast
+        means with emas, arrays with the same shape as values
+    """
+
+    values = _float(values)
+    line = np.empty(values.shape, dtype=values.dtype)
+    signal = np.empty(values.shape, dtype=values.dtype)
+    # Means are only kept on request, rows of an empty array are never written
+    rows = values.shape[0] if emas else 0
+    slow = np.empty((rows,) + values.shape[1:], dtype=values.dtype)
+    fast = np.empty((rows,) + values.shape[1:], dtype=values.dtype)
+
+    if values.shape[0] > 0:
+        if get_backend() == 'numba':
+            columns = _as_2d(values).shape[1]
+            _numba_macd(_as_2d(values), _decay(float(slow_alpha)), _decay(float(fast_alpha)),
+                        _decay(float(signal_alpha)),
+                        slow.reshape(rows, columns), fast.reshape(rows, columns),
+                        _as_2d(line), _as_2d(signal))
+        else:
+            _numpy_macd(values, slow_alpha, fast_alpha, signal_alpha, slow, fast, line, signal)
+
+    if emas:
+        return slow, fast, line, signal
+
+    return line, signal
+
+def rolling_mean_std(values, window):
+    """
+    Rolling mean of values and rolling standard deviation of that
+    mean along the first axis, the two series of Bollinger bands,
+    with the same rules as pandas rolling(window): a window with a
+    missing value is NaN. Both are updated as values enter and leave
+    the window, O(n) for any window, with compensated sums so large
+    price levels do not cost precision.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with input values,
+        float32 input gives float32 output
+    window: int
+        Number of observations in each window
+    Returns
+    ----------
+    tuple
+        Rolling mean and rolling standard deviation of the mean,
+        arrays with the same shape as values
+    """
+
+    values = _float(values)
+    mean = np.empty(values.shape, dtype=values.dtype)
+    std = np.empty(values.shape, dtype=values.dtype)
+    if values.shape[0] == 0:
+        return mean, std
+
+    # Empty windows are left to pandas rules
+    if get_backend() == 'numba' and window >= 1:
+        _numba_rolling_mean_std(_as_2d(values), window, _as_2d(mean), _as_2d(std))
+        return mean, std
+
+    return _numpy_rolling_mean_std(values, window, mean, std)
@@ -0,0 +1,60 @@
+"""
+Compare the Wilder smoothing kernel used by technical.ADX against
+the former row by row iloc recursion.
+Run from the repository root:
+    python3 benchmarks/adx_benchmark.py [rows ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import technical as ti
+
+def synthetic_ohlc(rows, seed=42):
+    '''Random walk ohlc data with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    high = close + rng.random(rows)
+    low = close - rng.random(rows)
+    return pd.DataFrame({'High': high, 'Low': low, 'Close': close})
+
+def legacy_smoothing(full_df, ma):
+    '''Former ADX smoothing, one iloc call per row'''
+    roll_tr = [None for i in range(ma)]
+    roll_dmp = [None for i in range(ma)]
+    roll_dmn = [None for i in range(ma)]
+    roll_tr.append(full_df['tr'].iloc[1:ma+1].sum())
+    roll_dmp.append(full_df['dm_pos'].iloc[1:ma+1].sum())
+    roll_dmn.append(full_df['dm_neg'].iloc[1:ma+1].sum())
+    for i in range(ma+1, full_df.shape[0]):
+        roll_tr.append(roll_tr[-1] - (roll_tr[-1] / ma) + full_df.iloc[i, 0])
+        roll_dmp.append(roll_dmp[-1] - (roll_dmp[-1] / ma) + full_df.iloc[i, 1])
+        roll_dmn.append(roll_dmn[-1] - (roll_dmn[-1] / ma) + full_df.iloc[i, 2])
+    return roll_tr, roll_dmp, roll_dmn
+
+def kernel_smoothing(full_df, ma):
+    '''Wilder smoothing with the numpy kernel'''
+    return (ti._wilder(full_df['tr'].to_numpy(), ma, ma),
+            ti._wilder(full_df['dm_pos'].to_numpy(), ma, ma),
+            ti._wilder(full_df['dm_neg'].to_numpy(), ma, ma))
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+if __name__ == '__main__':
+    ma = 14
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+
+    print(f'{"rows":>10} {"legacy (s)":>12} {"kernel (s)":>12} {"speedup":>9} {"max abs diff":>13}')
+    for rows in sizes:
+        full = ti.ADX(synthetic_ohlc(rows), ma, full_output=True)
+        full_df = full[['tr', 'dm_pos', 'dm_neg']]
+
+        t_legacy, legacy = timeit(legacy_smoothing, full_df, ma)
+        t_kernel, kernel = timeit(kernel_smoothing, full_df, ma)
+        diff = max(np.nanmax(np.abs(np.array(a, dtype=float) - b)) for a, b in zip(legacy, kernel))
+
+        print(f'{rows:>10} {t_legacy:>12.4f} {t_kernel:>12.4f} {t_legacy / t_kernel:>8.0f}x {diff:>13.2e}')
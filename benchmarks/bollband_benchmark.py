@@ -0,0 +1,76 @@
+"""
+Compare technical.bollband with the former version, which computed
+the rolling deviation twice with pandas running sums, for each
+backend. Also prints the largest deviation error of both against
+an exact two pass computation, for prices around 1e9.
+Run from the repository root:
+    python3 benchmarks/bollband_benchmark.py [rows ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import backend
+
+PRECISION_ROWS = 20_000
+
+def synthetic_close(rows, level=100, seed=42):
+    '''Random walk close prices with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    return pd.Series(level + np.cumsum(rng.normal(0, 1, rows)), name='Close')
+
+def legacy_bollband(series, ma):
+    '''Former bollband, the deviation of the moving average computed for each band'''
+    ma_values = series.rolling(ma).mean()
+    up = ma_values + 2 * ma_values.rolling(ma).std()
+    low = ma_values - 2 * ma_values.rolling(ma).std()
+    return pd.DataFrame({'bollband_up': up, 'bollband_low': low})
+
+def exact_bollband(series, ma):
+    '''Bands from the values of each window, two pass'''
+    windows = np.lib.stride_tricks.sliding_window_view
+    ma_values = np.full(series.shape[0], np.nan)
+    ma_values[ma-1:] = windows(series.to_numpy(), ma).mean(axis=-1)
+    std = np.full(series.shape[0], np.nan)
+    std[2*ma-2:] = windows(ma_values[ma-1:], ma).std(axis=-1, ddof=1)
+    return pd.DataFrame({'bollband_up': ma_values + 2 * std, 'bollband_low': ma_values - 2 * std})
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def with_backend(name, func, *args):
+    previous = backend._backend
+    backend.set_backend(name)
+    try:
+        return timeit(func, *args)
+    finally:
+        backend._backend = previous
+
+if __name__ == '__main__':
+    ma = 20
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [100_000, 1_000_000, 10_000_000]
+    names = backend.available_backends()
+
+    # Precision at a large price level
+    series = synthetic_close(PRECISION_ROWS, level=1e9)
+    exact = exact_bollband(series, ma).to_numpy()
+    diff = np.nanmax(np.abs(legacy_bollband(series, ma).to_numpy() - exact))
+    print(f'max abs error at 1e9, legacy: {diff:.2e}')
+    for name in names:
+        _, result = with_backend(name, ti.bollband, series, ma)
+        print(f'max abs error at 1e9, {name}: {np.nanmax(np.abs(result.to_numpy() - exact)):.2e}')
+
+    # Compiles the numba kernel before timing it
+    for name in names:
+        with_backend(name, ti.bollband, synthetic_close(100), ma)
+
+    print(f'{"rows":>10} {"legacy (s)":>12}' + ''.join(f' {name + " (s)":>12}' for name in names))
+    for rows in sizes:
+        series = synthetic_close(rows)
+        t_legacy, _ = timeit(legacy_bollband, series, ma)
+        times = [with_backend(name, ti.bollband, series, ma)[0] for name in names]
+        print(f'{rows:>10} {t_legacy:>12.4f}' + ''.join(f' {t:>12.4f}' for t in times))
@@ -0,0 +1,18 @@
+import os
+import sys
+
+# Add repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+# Add functions/scripts
+import technical
+import performance
+import streaming
+import backend
+import sweep
+import universe
+import store
+import rolling
+import expanding
+import pipeline
+import resample
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Peak memory allocated by each technical indicator, measured
+with tracemalloc, next to the size of its output.
+Run from the repository root:
+    python3 benchmarks/memory_benchmark.py [rows]
+"""
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from context import technical as ti
+
+def synthetic_ohlc(rows, seed=42):
+    '''Random walk ohlc+volume data with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.1, rows),
+        'High': close + rng.random(rows),
+        'Low': close - rng.random(rows),
+        'Close': close,
+        'Volume': rng.integers(0, 10_000, rows).astype(float),
+    })
+
+def peak_memory(func, *args, **kwargs):
+    '''Peak traced memory in bytes, output size and elapsed time'''
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, np.sum(result.memory_usage(index=False, deep=True)), elapsed
+
+if __name__ == '__main__':
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000
+    data = synthetic_ohlc(rows)
+    mb = 1024 ** 2
+
+    indicators = [
+        ('ADX', ti.ADX, (14,)),
+        ('ATR', ti.ATR, (14,)),
+        ('bollband', ti.bollband, (20,)),
+        ('MACD', ti.MACD, (26, 12, 9)),
+        ('RSI', ti.RSI, (14,)),
+        ('OBV', ti.OBV, ()),
+    ]
+
+    print(f'{rows} rows, input {data.memory_usage(index=False).sum() / mb:.0f} MB')
+    print(f'{"indicator":>10} {"peak (MB)":>10} {"output (MB)":>12} {"peak/output":>12} {"time (s)":>9}')
+    for name, func, args in indicators:
+        peak, output, elapsed = peak_memory(func, data[['High', 'Low', 'Close', 'Volume']], *args)
+        print(f'{name:>10} {peak / mb:>10.0f} {output / mb:>12.0f} {peak / output:>12.1f} {elapsed:>9.2f}')
@@ -0,0 +1,41 @@
+"""
+Compare performance.performance_report with calling CAGR,
+volatility, sharpe, max_dd and calmar one after another.
+Run from the repository root:
+    python3 benchmarks/report_benchmark.py [rows ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import performance as pi
+
+def synthetic_close(rows, seed=42):
+    '''Random walk close prices with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows))), name='Close')
+
+def separate(series, rf_rate):
+    '''Five indicators, one call each'''
+    return (pi.CAGR(series, 'D'), pi.volatility(series, 'D'), pi.sharpe(series, rf_rate, 'D'),
+            pi.max_dd(series), pi.calmar(series, 'D'))
+
+def best_of(func, *args, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+if __name__ == '__main__':
+    rf_rate = 0.05
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [1_000, 100_000, 10_000_000]
+
+    print(f'{"rows":>10} {"separate (s)":>13} {"report (s)":>11} {"speedup":>8}')
+    for rows in sizes:
+        series = synthetic_close(rows)
+        t_separate = best_of(separate, series, rf_rate)
+        t_report = best_of(pi.performance_report, series, rf_rate, 'D')
+        print(f'{rows:>10} {t_separate:>13.4f} {t_report:>11.4f} {t_separate / t_report:>7.1f}x')
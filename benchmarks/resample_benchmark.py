@@ -0,0 +1,55 @@
+"""
+Compare resample.resample_ohlcv, which builds every timeframe in
+one pass cascading from lower timeframes, against one pandas
+resample().agg() call for each timeframe.
+Run from the repository root:
+    python3 benchmarks/resample_benchmark.py [rows ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import resample
+
+# Timeframes built from the 1 minute bars
+TIMEFRAMES = ['5m', '15m', '1h', '1D']
+# pandas aggregation of each field
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def synthetic_minutes(rows, seed=42):
+    '''Random walk 1 minute ohlcv bars of a 9:30 to 16:00 session'''
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    days = pd.bdate_range('2000-01-03', periods=rows // 390 + 1)
+    index = (days.repeat(390) + pd.to_timedelta(np.tile(np.arange(570, 960), len(days)), unit='min'))[:rows]
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.0001, rows)),
+        'High': close * (1 + rng.random(rows) / 1000),
+        'Low': close * (1 - rng.random(rows) / 1000),
+        'Close': close,
+        'Volume': rng.integers(0, 10_000, rows),
+    }, index=index.rename('Datetime'))
+
+def pandas_resample(data):
+    '''One resample per timeframe, empty bins dropped'''
+    return {tf: data.resample(pd.Timedelta(tf)).agg(AGG).dropna(subset=['Close']) for tf in TIMEFRAMES}
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+if __name__ == '__main__':
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [100_000, 1_000_000, 5_000_000]
+
+    print(f'{"rows":>10} {"pandas (s)":>12} {"cascade (s)":>12} {"speedup":>9} {"max abs diff":>13}')
+    for rows in sizes:
+        data = synthetic_minutes(rows)
+
+        t_pandas, expected = timeit(pandas_resample, data)
+        t_cascade, result = timeit(resample.resample_ohlcv, data, TIMEFRAMES)
+        diff = max(np.nanmax(np.abs(expected[tf].to_numpy(dtype=float) - result[tf].to_numpy(dtype=float)))
+                   for tf in TIMEFRAMES)
+
+        print(f'{rows:>10} {t_pandas:>12.4f} {t_cascade:>12.4f} {t_pandas / t_cascade:>8.1f}x {diff:>13.2e}')
@@ -0,0 +1,68 @@
+"""
+Compare technical.RSI with the former row by row iloc recursion.
+The former loop is too slow for the largest inputs, above LEGACY_MAX
+rows its time is extrapolated from the per row cost measured on
+LEGACY_MAX rows and marked with ~.
+Run from the repository root:
+    python3 benchmarks/rsi_benchmark.py [rows ...]
+"""
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import technical as ti
+
+LEGACY_MAX = 100_000
+
+def synthetic_close(rows, seed=42):
+    '''Random walk close prices with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, rows)), name='Close')
+
+def legacy_rsi(series, ma):
+    '''Former RSI, one iloc call per row'''
+    full_df = pd.DataFrame()
+    full_df['gain'] = series - series.shift(1)
+    full_df['loss'] = series.shift(1) - series
+    full_df.loc[full_df['gain'] < 0, 'gain'] = 0
+    full_df.loc[full_df['loss'] < 0, 'loss'] = 0
+    full_df['av_gain'] = full_df['gain'].rolling(ma).mean()
+    full_df['av_loss'] = full_df['loss'].rolling(ma).mean()
+    av_gain = [None for i in range(ma)]
+    av_loss = [None for i in range(ma)]
+    av_gain.append(full_df['av_gain'].iloc[ma])
+    av_loss.append(full_df['av_loss'].iloc[ma])
+    for i in range(ma+1, series.shape[0]):
+        av_gain.append((av_gain[-1] * (ma - 1) + full_df.iloc[i, -2]) / ma)
+        av_loss.append((av_loss[-1] * (ma - 1) + full_df.iloc[i, -1]) / ma)
+    full_df['av_gain'] = av_gain
+    full_df['av_loss'] = av_loss
+    return 100 - (100 / (1 + (full_df['av_gain'] / full_df['av_loss'])))
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+if __name__ == '__main__':
+    ma = 14
+    sizes = [int(float(arg)) for arg in sys.argv[1:]] or [100_000, 1_000_000, 10_000_000]
+
+    # Per row cost of the former loop
+    legacy_rows = min(max(sizes), LEGACY_MAX)
+    t_sample, legacy = timeit(legacy_rsi, synthetic_close(legacy_rows), ma)
+    diff = np.nanmax(np.abs(legacy - ti.RSI(synthetic_close(legacy_rows), ma)))
+    print(f'max abs diff on {legacy_rows} rows: {diff:.2e}')
+
+    print(f'{"rows":>10} {"legacy (s)":>12} {"kernel (s)":>12} {"speedup":>9}')
+    for rows in sizes:
+        series = synthetic_close(rows)
+        t_kernel, _ = timeit(ti.RSI, series, ma)
+        if rows <= LEGACY_MAX:
+            t_legacy, _ = timeit(legacy_rsi, series, ma)
+            mark = ' '
+        else:
+            t_legacy = t_sample / legacy_rows * rows
+            mark = '~'
+        print(f'{rows:>10} {mark}{t_legacy:>11.2f} {t_kernel:>12.4f} {mark}{t_legacy / t_kernel:>7.0f}x')
@@ -0,0 +1,83 @@
+"""
+Compare opening OHLC data with pd.read_csv and with the
+columnar store (store.load_store). Each measurement runs in a
+fresh process: open time, resident memory (RSS) growth after
+opening and after computing ATR on the opened data.
+Files stay in the OS page cache between runs, so open times
+do not include disk reads.
+Run from the repository root:
+    python3 benchmarks/store_benchmark.py [rows]
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from context import store
+
+def synthetic_ohlc(rows, seed=42):
+    '''Random walk ohlc+volume data with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame({
+        'Datetime': pd.date_range('2000-01-03', periods=rows, freq='min'),
+        'Open': close + rng.normal(0, 0.1, rows),
+        'High': close + rng.random(rows),
+        'Low': close - rng.random(rows),
+        'Close': close,
+        'Volume': rng.integers(0, 10_000, rows),
+    })
+
+# Runs in a fresh process, prints timings and rss growth as json
+CHILD = '''
+import sys, time, json, resource
+sys.path.insert(0, {root!r})
+import pandas as pd
+import store
+import technical as ti
+
+def rss():
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * resource.getpagesize()
+
+base = rss()
+start = time.perf_counter()
+if {kind!r} == 'csv':
+    data = pd.read_csv({path!r}, index_col='Datetime', parse_dates=True)
+else:
+    data = store.load_store({path!r})
+opened = time.perf_counter() - start
+rss_open = rss() - base
+start = time.perf_counter()
+ti.ATR(data, 14)
+atr = time.perf_counter() - start
+print(json.dumps([opened, rss_open, atr, rss() - base]))
+'''
+
+def measure(kind, path):
+    '''Open time, rss after open, ATR time and rss after ATR'''
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+    code = CHILD.format(root=root, kind=kind, path=path)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+if __name__ == '__main__':
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 2_000_000
+    folder = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(folder, 'ohlc.csv')
+        store_path = os.path.join(folder, 'ohlc')
+        synthetic_ohlc(rows).to_csv(csv_path, index=False)
+        store.to_store(csv_path, store_path)
+
+        print(f'{rows} rows')
+        print(f'{"format":>8} {"open (s)":>10} {"rss open (MB)":>14} {"atr (s)":>9} {"rss atr (MB)":>13}')
+        for kind, path in [('csv', csv_path), ('store', store_path)]:
+            opened, rss_open, atr, rss_atr = measure(kind, path)
+            print(f'{kind:>8} {opened:>10.4f} {rss_open / 2**20:>14.1f} {atr:>9.3f} {rss_atr / 2**20:>13.1f}')
+    finally:
+        shutil.rmtree(folder)
@@ -0,0 +1,175 @@
+"""
+Benchmark suite for every function of technical.py and
+performance.py. Synthetic OHLCV data with a fixed seed is
+generated for each input size, each function is timed (best
+of a few runs) and its peak memory is measured with tracemalloc
+in a separate run. Results are written to a JSON report, and a
+previous report can be given to compare two revisions.
+Run from the repository root:
+    python3 benchmarks/suite_benchmark.py [--sizes 1e3 1e5] [--output report.json]
+                                          [--compare old.json] [--only ADX RSI]
+"""
+
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import datetime
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import backend
+
+# Fixed seed of the synthetic data
+SEED = 42
+# Risk free rate of the performance functions
+RF_RATE = 0.05
+
+# (module, function, args, input) for each benchmark, input is
+# 'ohlcv' for the whole DataFrame or 'close' for the close prices
+CASES = [
+    (ti, 'ADX', (14,), 'ohlcv'),
+    (ti, 'ATR', (14,), 'ohlcv'),
+    (ti, 'bollband', (20,), 'close'),
+    (ti, 'MACD', (26, 12, 9), 'close'),
+    (ti, 'RSI', (14,), 'close'),
+    (ti, 'OBV', (), 'ohlcv'),
+    (pi, 'CAGR', ('D',), 'close'),
+    (pi, 'volatility', ('D',), 'close'),
+    (pi, 'sharpe', (RF_RATE, 'D'), 'close'),
+    (pi, 'max_dd', (), 'close'),
+    (pi, 'calmar', ('D',), 'close'),
+    (pi, 'performance_report', (RF_RATE, 'D'), 'close'),
+]
+
+def synthetic_ohlcv(rows, seed=SEED):
+    '''Random walk ohlc+volume data with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.001, rows)),
+        'High': close * (1 + rng.random(rows) / 100),
+        'Low': close * (1 - rng.random(rows) / 100),
+        'Close': close,
+        'Volume': rng.integers(0, 10_000, rows),
+    }, index=pd.date_range('2000-01-03', periods=rows, freq='min', name='Datetime'))
+
+def missing_cases():
+    '''Public functions of the modules without a benchmark'''
+    covered = {(module.__name__, name) for module, name, _, _ in CASES}
+    missing = []
+    for module in [ti, pi]:
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ == module.__name__ and not name.startswith('_') \
+                    and (module.__name__, name) not in covered:
+                missing.append(module.__name__ + '.' + name)
+    return missing
+
+def best_time(func, args, repeat):
+    '''Best elapsed time of repeat calls'''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def peak_memory(func, args):
+    '''Peak memory traced during one call, in bytes'''
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def revision():
+    '''Current git commit, None outside a repository'''
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes, repeat=5, only=None, memory=True):
+    '''Run every case for every size, returns the report as a dict'''
+    results = []
+    for rows in sizes:
+        data = synthetic_ohlcv(rows)
+        inputs = {'ohlcv': data, 'close': data['Close']}
+        # Fewer runs for big inputs, a single one from 1e6 rows
+        runs = max(1, min(repeat, 1_000_000 // rows))
+        for module, name, args, kind in CASES:
+            if only and name not in only:
+                continue
+            func = getattr(module, name)
+            call_args = (inputs[kind],) + args
+            elapsed = best_time(func, call_args, runs)
+            peak = peak_memory(func, call_args) if memory else None
+            results.append({'name': module.__name__ + '.' + name, 'rows': rows,
+                            'time': elapsed, 'peak_bytes': peak, 'runs': runs})
+            peak_text = '' if peak is None else f'{peak / 1024**2:>10.1f}'
+            print(f'{module.__name__ + "." + name:>32} {rows:>10} {elapsed:>10.4f} {peak_text}', flush=True)
+
+    return {
+        'meta': {
+            'revision': revision(),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'backend': backend.get_backend(),
+            'machine': platform.machine(),
+            'seed': SEED,
+        },
+        'results': results,
+    }
+
+def compare(report, base):
+    '''Print time and memory ratios against a previous report'''
+    previous = {(item['name'], item['rows']): item for item in base['results']}
+    print(f'\ncompared with {base["meta"].get("revision")}: ratios new / old, above 1 is slower')
+    print(f'{"function":>32} {"rows":>10} {"time":>8} {"memory":>8}')
+    for item in report['results']:
+        old = previous.get((item['name'], item['rows']))
+        if old is None:
+            continue
+        time_ratio = item['time'] / old['time'] if old['time'] else float('nan')
+        if item['peak_bytes'] and old.get('peak_bytes'):
+            memory_ratio = f'{item["peak_bytes"] / old["peak_bytes"]:>8.2f}'
+        else:
+            memory_ratio = f'{"-":>8}'
+        print(f'{item["name"]:>32} {item["rows"]:>10} {time_ratio:>8.2f} {memory_ratio}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the technical and performance functions.')
+    parser.add_argument('--sizes', nargs='+', type=float, default=[1e3, 1e4, 1e5, 1e6, 1e7],
+                        help='input sizes in rows')
+    parser.add_argument('--repeat', type=int, default=5, help='runs of each timing on small inputs')
+    parser.add_argument('--only', nargs='+', help='function names to run, e.g. ADX RSI')
+    parser.add_argument('--no-memory', action='store_true', help='skip peak memory measurements')
+    parser.add_argument('--output', default='benchmark_report.json', help='path of the JSON report')
+    parser.add_argument('--compare', help='previous JSON report to compare with')
+    options = parser.parse_args()
+
+    missing = missing_cases()
+    if missing:
+        print('Functions without a benchmark: ' + ', '.join(missing), file=sys.stderr)
+
+    print(f'{"function":>32} {"rows":>10} {"time (s)":>10} {"peak (MB)":>10}')
+    report = run([int(size) for size in options.sizes], options.repeat, options.only,
+                 not options.no_memory)
+
+    with open(options.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f'\nreport written to {options.output}')
+
+    if options.compare:
+        with open(options.compare) as file:
+            compare(report, json.load(file))
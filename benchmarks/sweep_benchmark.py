@@ -0,0 +1,54 @@
+"""
+Compare the parameter sweeps with a loop calling the
+technical indicator once for each parameter value.
+Run from the repository root:
+    python3 benchmarks/sweep_benchmark.py [rows]
+"""
+
+import sys
+import time
+import itertools
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import sweep
+
+def synthetic_ohlc(rows, seed=42):
+    '''Random walk ohlc data with a fixed seed'''
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame({
+        'High': close + rng.random(rows),
+        'Low': close - rng.random(rows),
+        'Close': close,
+    })
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def loop(func, data, params):
+    '''One indicator call for each parameter value'''
+    return [func(data, *(p if isinstance(p, tuple) else (p,))) for p in params]
+
+if __name__ == '__main__':
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    data = synthetic_ohlc(rows)
+    mas = range(2, 201)
+    grid = [(slow, fast, ma) for slow, fast, ma in
+            itertools.product(range(20, 41, 2), range(5, 16), range(5, 11)) if slow > fast]
+
+    cases = [
+        ('RSI', ti.RSI, sweep.RSI, mas),
+        ('ATR', ti.ATR, sweep.ATR, mas),
+        ('bollband', ti.bollband, sweep.bollband, mas),
+        ('MACD', ti.MACD, sweep.MACD, grid),
+    ]
+
+    print(f'{rows} rows')
+    print(f'{"indicator":>10} {"params":>7} {"loop (s)":>10} {"sweep (s)":>10} {"speedup":>8}')
+    for name, single, swept, params in cases:
+        t_loop, _ = timeit(loop, single, data, params)
+        t_sweep, _ = timeit(swept, data, params)
+        print(f'{name:>10} {len(params):>7} {t_loop:>10.2f} {t_sweep:>10.2f} {t_loop / t_sweep:>7.1f}x')
@@ -0,0 +1,58 @@
+"""
+Scaling of universe.run_universe with the number of worker
+processes. Speedup is relative to 1 worker, which runs in this
+process, efficiency is speedup divided by the number of workers.
+Near linear scaling needs as many free cores as workers.
+Run from the repository root:
+    python3 benchmarks/universe_benchmark.py [symbols] [rows] [max workers]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import universe
+
+def synthetic_universe(symbols, rows, seed=42):
+    '''Random walk ohlc+volume data with a fixed seed for each symbol'''
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2000-01-03', periods=rows)
+    data = {}
+    for i in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+        data[f'S{i:04d}'] = pd.DataFrame({
+            'High': close * (1 + rng.random(rows) / 100),
+            'Low': close * (1 - rng.random(rows) / 100),
+            'Close': close,
+            'Volume': rng.integers(0, 10_000, rows).astype(float),
+        }, index=index)
+    return data
+
+SPECS = [
+    (ti.ADX, {'ma': 14}),
+    (ti.RSI, {'ma': 14}),
+    (ti.ATR, {'ma': 14}),
+    (pi.sharpe, {'rf_rate': 0.02, 'frequency': 'D'}),
+    (pi.calmar, {'frequency': 'D'}),
+]
+
+if __name__ == '__main__':
+    symbols = int(float(sys.argv[1])) if len(sys.argv) > 1 else 200
+    rows = int(float(sys.argv[2])) if len(sys.argv) > 2 else 50_000
+    cores = os.cpu_count() or 1
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else cores
+    data = synthetic_universe(symbols, rows)
+    counts = [n for n in [1, 2, 4, 8, 16, 32, 64] if n < max_workers] + [max_workers]
+
+    print(f'{symbols} symbols x {rows} rows, {cores} cores')
+    print(f'{"workers":>8} {"time (s)":>10} {"speedup":>8} {"efficiency":>11}')
+    base = None
+    for workers in counts:
+        start = time.perf_counter()
+        universe.run_universe(data, SPECS, workers=workers)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f'{workers:>8} {elapsed:>10.2f} {base / elapsed:>7.2f}x {base / elapsed / workers:>10.0%}')
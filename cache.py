@@ -0,0 +1,388 @@
+"""
+Implements an opt-in memoization layer for the indicators.
+Results are keyed on a fingerprint of the input data and on
+the function parameters, kept in a least recently used memory
+tier bounded in bytes and, optionally, in a directory on disk.
+"""
+
+import os
+import sys
+import copy
+import zlib
+import pickle
+import hashlib
+import inspect
+import weakref
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import technical as ti
+import chunked
+
+# Indicators whose state can be carried to new rows, by the chunked
+# class that holds it. Built from the bound parameters of a call.
+_RESUMABLE = {
+    ti.ADX: lambda params: chunked.ADXChunks(params['ma']),
+    ti.ATR: lambda params: chunked.ATRChunks(params['ma']),
+    ti.RSI: lambda params: chunked.RSIChunks(params['ma']),
+    ti.MACD: lambda params: chunked.MACDChunks(params['slow'], params['fast'], params['ma']),
+    ti.bollband: lambda params: chunked.BollingerChunks(params['ma'], params['mult']),
+    ti.OBV: lambda params: chunked.OBVChunks(),
+}
+# Saved states for each call, a few lengths of the same history
+_RESUME_STATES = 4
+
+def fingerprint(data):
+    """
+    Cheap content fingerprint of a pandas object or array.
+    A crc32 checksum of the raw buffer of each column, with column
+    names, dtypes, shape and the first and last index labels.
+    It is meant to tell data apart, it is not a cryptographic hash.
+    Parameters
+    ----------
+    data: pd.DataFrame/pd.Series/np.ndarray
+        Input data of an indicator
+    Returns
+    ----------
+    str
+        Hex digest, equal for equal data
+    """
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    def add(values):
+        values = np.asarray(values)
+        if values.dtype == object:
+            values = pd.util.hash_array(values.ravel())
+        checksum = zlib.crc32(np.ascontiguousarray(values).view(np.uint8).ravel())
+        digest.update(repr((str(values.dtype), checksum)).encode())
+
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr((type(data).__name__, data.shape, list(data.columns))).encode())
+        for i in range(data.shape[1]):
+            add(data.iloc[:, i].to_numpy())
+    elif isinstance(data, pd.Series):
+        digest.update(repr((type(data).__name__, data.shape, data.name)).encode())
+        add(data.to_numpy())
+    else:
+        digest.update(repr((type(data).__name__, np.shape(data))).encode())
+        add(data)
+
+    index = getattr(data, 'index', None)
+    if index is not None and len(index) > 0:
+        digest.update(repr((type(index).__name__, len(index), index[0], index[-1])).encode())
+
+    return digest.hexdigest()
+
+def _nbytes(result):
+    """
+    Memory used by a result, in bytes.
+    """
+
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    if isinstance(result, (pd.Series, pd.Index)):
+        return int(result.memory_usage(deep=True))
+    if isinstance(result, np.ndarray):
+        return int(result.nbytes)
+
+    return sys.getsizeof(result)
+
+class IndicatorCache:
+    """
+    Memoization of indicator results.
+    Parameters
+    ----------
+    max_bytes: int
+        Size of the memory tier, least recently used results
+        are evicted when it is exceeded
+    path: str
+        Directory of the disk tier, None to keep results only in memory
+    assume_immutable: bool
+        Fingerprint each input object only once, while it is alive.
+        Hits become almost free, but changes made in place to a
+        DataFrame already seen by the cache are not noticed.
+    resume: bool
+        Keep the recursive state of ADX, ATR, RSI, MACD, bollband and
+        OBV. When new data starts with the rows of a cached input and
+        has more rows at the end, only the new rows are computed.
+        These indicators are then computed by their chunked versions,
+        equal to the technical functions up to rounding.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, path=None, assume_immutable=False, resume=False):
+        if not isinstance(max_bytes, int) or max_bytes < 0:
+            raise ValueError('Cache size must be a non negative integer.')
+
+        if not isinstance(assume_immutable, bool):
+            raise TypeError('Value for assume_immutable must be a boolean.')
+
+        if not isinstance(resume, bool):
+            raise TypeError('Value for resume must be a boolean.')
+
+        self.max_bytes = max_bytes
+        self.path = path
+        self.assume_immutable = assume_immutable
+        self.resume = resume
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.resumes = 0
+        self._lock = threading.Lock()
+        # Fingerprints of live input objects, by id
+        self._fingerprints = {}
+        # Chunked states of resumable calls, by call and data fingerprint
+        self._states = {}
+
+    def _fingerprint(self, data):
+        """
+        Fingerprint of the data, reused for the same object
+        when inputs are assumed immutable.
+        """
+
+        if not self.assume_immutable:
+            return fingerprint(data)
+
+        entry = self._fingerprints.get(id(data))
+        if entry is not None and entry[0]() is data:
+            return entry[1]
+
+        value = fingerprint(data)
+        try:
+            ref = weakref.ref(data, lambda _, key=id(data): self._fingerprints.pop(key, None))
+        except TypeError:
+            return value
+        self._fingerprints[id(data)] = (ref, value)
+
+        return value
+
+    def _call(self, func, data, args=(), kwargs=None):
+        """
+        Name and bound parameters of a call. Parameters are bound to
+        the function signature, so positional, keyword and default
+        values of the same call are equal.
+        """
+
+        kwargs = kwargs or {}
+        try:
+            bound = inspect.signature(func).bind(data, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(list(bound.arguments.items())[1:])
+            text = repr(list(params.items()))
+        except (TypeError, ValueError):
+            params = None
+            text = repr([args, sorted(kwargs.items())])
+        name = getattr(func, '__module__', '') + '.' + getattr(func, '__qualname__', repr(func))
+
+        return name + text, params
+
+    def key(self, func, data, args=(), kwargs=None):
+        """
+        Key of a call, from the function, the data fingerprint and the parameters.
+        Parameters are bound to the function signature, so positional,
+        keyword and default values of the same call give the same key.
+        """
+
+        call, _ = self._call(func, data, args, kwargs)
+
+        return self._digest(call, self._fingerprint(data))
+
+    @staticmethod
+    def _digest(call, data_fingerprint):
+        return hashlib.blake2b((call + data_fingerprint).encode(), digest_size=16).hexdigest()
+
+    def _disk_file(self, key):
+        return os.path.join(self.path, key + '.pkl')
+
+    def _store(self, key, result):
+        """
+        Put a result in the memory tier, evicting old results if needed.
+        """
+
+        size = _nbytes(result)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+        self.entries[key] = (result, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.nbytes -= old_size
+            self.evictions += 1
+
+    def _resumable(self, func, params, data):
+        """
+        New chunked state for a call, None if it can not be resumed.
+        """
+
+        if not self.resume or params is None or func not in _RESUMABLE:
+            return None
+        if params.get('full_output', False) or not isinstance(data, (pd.DataFrame, pd.Series)):
+            return None
+        # Chunked versions compute in float64 only
+        if params.get('dtype', 'float64') not in ('float64', np.float64):
+            return None
+        if ti._is_panel(data):
+            return None
+
+        return _RESUMABLE[func](params)
+
+    def _resume(self, call, state, data, data_fingerprint, key):
+        """
+        Result of a resumable call. If a cached input is a prefix of the
+        data, its state is copied and only the new rows are computed,
+        otherwise the whole data goes through the new state.
+        """
+
+        rows = data.shape[0]
+        with self._lock:
+            saved = sorted(self._states.get(call, {}).values(), key=lambda item: -item[0])
+
+        result = None
+        for prefix_rows, prefix_fingerprint, prefix_state, prefix_key in saved:
+            if prefix_rows >= rows:
+                continue
+            with self._lock:
+                prefix = self.entries.get(prefix_key)
+            # The result of the prefix is needed to join the new rows
+            if prefix is None or fingerprint(data.iloc[:prefix_rows]) != prefix_fingerprint:
+                continue
+            state = copy.deepcopy(prefix_state)
+            tail = state.update(data.iloc[prefix_rows:])
+            result = pd.concat([prefix[0], tail]).set_axis(data.index)
+            with self._lock:
+                self.resumes += 1
+            break
+
+        if result is None:
+            result = state.update(data)
+
+        with self._lock:
+            states = self._states.setdefault(call, OrderedDict())
+            states[data_fingerprint] = (rows, data_fingerprint, state, key)
+            while len(states) > _RESUME_STATES:
+                states.popitem(last=False)
+
+        return result
+
+    def get(self, func, data, *args, **kwargs):
+        """
+        Result of func(data, *args, **kwargs), computed only on a miss.
+        Cached results are shared between calls, do not modify them in place.
+        Parameters
+        ----------
+        func: callable
+            Indicator, e.g. technical.RSI
+        data: pd.DataFrame/pd.Series
+            Input data
+        Returns
+        ----------
+        object
+            Same result as the function call
+        """
+
+        call, params = self._call(func, data, args, kwargs)
+        data_fingerprint = self._fingerprint(data)
+        key = self._digest(call, data_fingerprint)
+
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+
+        if self.path is not None and os.path.isfile(self._disk_file(key)):
+            with open(self._disk_file(key), 'rb') as file:
+                result = pickle.load(file)
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, result)
+            return result
+
+        state = self._resumable(func, params, data)
+        if state is None:
+            result = func(data, *args, **kwargs)
+        else:
+            result = self._resume(call, state, data, data_fingerprint, key)
+
+        if self.path is not None:
+            # Written to a temporary file first so readers never see half a file
+            tmp = self._disk_file(key) + '.' + str(os.getpid()) + '.tmp'
+            with open(tmp, 'wb') as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._disk_file(key))
+
+        with self._lock:
+            self.misses += 1
+            self._store(key, result)
+
+        return result
+
+    def wrap(self, func):
+        """
+        Memoized version of an indicator.
+        Parameters
+        ----------
+        func: callable
+            Indicator, e.g. technical.RSI
+        Returns
+        ----------
+        callable
+            Same signature as func, results go through this cache
+        """
+
+        @functools.wraps(func)
+        def wrapper(data, *args, **kwargs):
+            return self.get(func, data, *args, **kwargs)
+
+        wrapper.cache = self
+
+        return wrapper
+
+    def stats(self):
+        """
+        Counters of the cache.
+        Returns
+        ----------
+        dict
+            With keys hits, disk_hits, misses, resumes, evictions, entries and nbytes
+        """
+
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'resumes': self.resumes,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'nbytes': self.nbytes,
+            }
+
+    def clear(self, disk=False):
+        """
+        Remove every result from memory, and from disk if disk is True.
+        Counters are reset too.
+        """
+
+        with self._lock:
+            self.entries.clear()
+            self._states.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = self.resumes = 0
+
+        if disk and self.path is not None:
+            for name in os.listdir(self.path):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.path, name))
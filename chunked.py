@@ -0,0 +1,538 @@
+"""
+Implements chunked versions of the technical indicators,
+for data that does not fit in memory. Input is read in blocks
+and only the state needed for continuity is carried from one
+block to the next, so results match a full in-memory run.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import backend
+import technical as ti
+import streaming
+
+def read_chunks(source, chunksize=100_000):
+    """
+    Read data in blocks of rows.
+    Parameters
+    ----------
+    source: str/pd.DataFrame/iterable
+        Path of a csv file, a DataFrame or an iterable of DataFrames
+        (e.g. a generator reading from a database)
+    chunksize: int
+        Number of rows of each block, ignored for an iterable
+    Returns
+    ----------
+    iterator
+        DataFrames with consecutive rows of the data
+    """
+
+    if not isinstance(chunksize, int) or chunksize < 1:
+        raise ValueError('Chunk size must be a positive integer.')
+
+    if isinstance(source, (str, os.PathLike)):
+        return iter(pd.read_csv(source, chunksize=chunksize))
+    if isinstance(source, (pd.DataFrame, pd.Series)):
+        return (source.iloc[i:i+chunksize] for i in range(0, source.shape[0], chunksize))
+    if hasattr(source, '__iter__'):
+        return iter(source)
+
+    raise TypeError('Source is not a csv path, a pandas DataFrame or an iterable.')
+
+def run_chunked(source, indicator, chunksize=100_000):
+    """
+    Compute an indicator block by block.
+    Parameters
+    ----------
+    source: str/pd.DataFrame/iterable
+        Data read with read_chunks
+    indicator: object
+        Chunked indicator, e.g. ATRChunks(14)
+    chunksize: int
+        Number of rows of each block
+    Returns
+    ----------
+    iterator
+        Results for each block, pd.concat of all of them
+        is equal to the in-memory result
+    """
+
+    for chunk in read_chunks(source, chunksize):
+        yield indicator.update(chunk)
+
+def performance_chunked(source, rf_rate, frequency='Y', only_business=True, chunksize=100_000):
+    """
+    Calculate the performance indicators block by block,
+    carrying returns moments and the running peak.
+    Parameters
+    ----------
+    source: str/pd.DataFrame/iterable
+        Close prices, or data with a close column, read with read_chunks
+    rf_rate: float
+        Risk free rate.
+    frequency: string/float
+        D, W, M or Y for daily, weekly, monthly or yearly prices,
+        1m, 5m, 15m, 30m or 1h for intraday bars, or periods in a year
+    only_business: bool
+        When using daily or intraday data count only business days.
+    chunksize: int
+        Number of rows of each block
+    Returns
+    ----------
+    dict
+        With keys cagr, volatility, sharpe, max_dd and calmar
+    """
+
+    tracker = streaming.PerformanceTracker(frequency, only_business)
+    for chunk in read_chunks(source, chunksize):
+        tracker.update(pd.Series(_close(chunk), copy=False))
+
+    return tracker.report(rf_rate)
+
+def _close(chunk):
+    """
+    Close prices of a series or dataframe as a float array.
+    """
+
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    if isinstance(chunk, pd.DataFrame):
+        # Select them
+        cols = [col for col in chunk.columns if col in possible_cols]
+        # Check if there's only one close column
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        return ti._column(chunk, cols[0])
+
+    elif isinstance(chunk, pd.Series):
+        return chunk.to_numpy(dtype=float)
+
+    raise TypeError('Input data is not a pandas Series or DataFrame.')
+
+def _ohlc(chunk):
+    """
+    High, low and close prices of a dataframe as float arrays.
+    """
+
+    if not isinstance(chunk, pd.DataFrame):
+        raise TypeError('Input data is not a pandas DataFrame.')
+    if not set(['High', 'Low', 'Close']).issubset(chunk.columns):
+        raise IndexError('Missing necessary columns (High, Low or Close).')
+
+    return ti._column(chunk, 'High'), ti._column(chunk, 'Low'), ti._column(chunk, 'Close')
+
+class _Previous:
+    """
+    Last value of a series, put in front of the next block so
+    differences to the previous row continue across blocks.
+    """
+
+    def __init__(self):
+        self.last = np.nan
+
+    def extend(self, values):
+        """
+        Values with the last value of the previous block in front.
+        """
+
+        extended = np.empty(values.shape[0] + 1)
+        extended[0] = self.last
+        extended[1:] = values
+        if values.shape[0] > 0:
+            self.last = values[-1]
+
+        return extended
+
+class _Rolling:
+    """
+    Rolling mean over consecutive blocks, the last
+    ma - 1 values are put in front of the next block.
+    """
+
+    def __init__(self, ma):
+        self.ma = ma
+        self.tail = np.empty(0)
+
+    def update(self, values):
+        extended = np.concatenate([self.tail, values])
+        result = ti._rolling(extended, self.ma).mean()
+        self.tail = extended[max(0, extended.shape[0] - self.ma + 1):]
+
+        return result.to_numpy()[extended.shape[0] - values.shape[0]:]
+
+class _Recursion:
+    """
+    y[i] = alpha * y[i-1] + beta * x[i] over consecutive blocks.
+    Values are kept until the seed, at global position start,
+    can be computed from them, after that only y[i-1] is carried.
+    """
+
+    def __init__(self, alpha, beta, start, seed):
+        self.alpha = alpha
+        self.beta = beta
+        self.start = start
+        # Function of the values up to start, returns the seed
+        self.seed = seed
+        self.pending = np.empty(0)
+        self.last = None
+
+    def update(self, values):
+        n = values.shape[0]
+        if n == 0:
+            return np.empty(0)
+
+        if self.last is None:
+            self.pending = np.concatenate([self.pending, values])
+            if self.pending.shape[0] <= self.start:
+                return np.full(n, np.nan)
+            seed = self.seed(self.pending[:self.start+1])
+            out = backend.linear_recurrence(self.pending, self.alpha, self.beta, self.start, seed)
+            self.pending = None
+        else:
+            seed = self.alpha * self.last + self.beta * values[0]
+            out = backend.linear_recurrence(values, self.alpha, self.beta, 0, seed)
+
+        self.last = out[-1]
+
+        return out[-n:]
+
+class _EWMState:
+    """
+    Exponentially weighted mean over consecutive blocks, same
+    rules as pandas ewm(span).mean(). The weighted sum and the
+    sum of weights are carried, values are centered on the first
+    observation so the sums keep their precision.
+    """
+
+    def __init__(self, span):
+        self.decay = 1 - 2 / (span + 1)
+        self.center = None
+        self.num = 0.0
+        self.den = 0.0
+
+    def update(self, values):
+        if values.shape[0] == 0:
+            return np.empty(0)
+
+        valid = ~np.isnan(values)
+        if self.center is None and valid.any():
+            self.center = values[valid.argmax()]
+        center = 0.0 if self.center is None else self.center
+
+        num = np.where(valid, values - center, 0.0)
+        den = valid.astype(float)
+        backend.linear_recurrence(num, self.decay, 1.0, 0, self.decay * self.num + num[0], out=num)
+        backend.linear_recurrence(den, self.decay, 1.0, 0, self.decay * self.den + den[0], out=den)
+        self.num, self.den = num[-1], den[-1]
+
+        # No observation yet gives 0 / 0, which is NaN
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = np.divide(num, den, out=num)
+        out += center
+
+        return out
+
+def _check_period(ma):
+    if not isinstance(ma, int):
+        raise TypeError('ma parameter is not integer type.')
+
+class ATRChunks:
+    """
+    Average true range (ATR) computed block by block.
+    Matches technical.ATR for the same rows.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.prev_close = _Previous()
+        self.rolling = _Rolling(ma)
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.DataFrame
+            Must have the following columns: High, Low, Close.
+        Returns
+        ----------
+        pd.DataFrame
+            With columns atr and tr for the rows of the block
+        """
+
+        high, low, close = _ohlc(chunk)
+        prev_close = self.prev_close.extend(close)[:-1]
+
+        tr = np.abs(high - low)
+        with np.errstate(invalid='ignore'):
+            tr = np.fmax(tr, np.abs(high - prev_close))
+            tr = np.fmax(tr, np.abs(low - prev_close))
+        atr = self.rolling.update(tr)
+
+        return pd.DataFrame({'atr': atr, 'tr': tr}, index=chunk.index, copy=False)
+
+class ADXChunks:
+    """
+    Average directional index (ADX) computed block by block.
+    Matches technical.ADX for the same rows.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.rows = 0
+        self.prev_high = _Previous()
+        self.prev_low = _Previous()
+        self.prev_close = _Previous()
+        # Wilder smoothing, seeded with the rolling sum at index ma
+        total = lambda values: values[-ma:].sum()
+        self.roll_tr = _Recursion(1 - 1 / ma, 1, ma, total)
+        self.roll_dmp = _Recursion(1 - 1 / ma, 1, ma, total)
+        self.roll_dmn = _Recursion(1 - 1 / ma, 1, ma, total)
+        # Smoothed dx, first value is the mean of dx
+        self.adx = _Recursion((ma - 1) / ma, 1 / ma, 2*ma - 1, lambda values: values[-ma:].mean())
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.DataFrame
+            Must have the following columns: High, Low, Close.
+        Returns
+        ----------
+        pd.DataFrame
+            With columns adx and dx for the rows of the block
+        """
+
+        high, low, close = _ohlc(chunk)
+        prev_close = self.prev_close.extend(close)[:-1]
+
+        # Compute true range
+        tr = np.abs(high - low)
+        with np.errstate(invalid='ignore'):
+            tr = np.fmax(tr, np.abs(high - prev_close))
+            tr = np.fmax(tr, np.abs(low - prev_close))
+        # Compute directional momentum, only positive values
+        dm_pos = np.maximum(np.diff(self.prev_high.extend(high)), 0)
+        dm_neg = np.maximum(-np.diff(self.prev_low.extend(low)), 0)
+        if self.rows == 0 and chunk.shape[0] > 0:
+            dm_pos[0] = dm_neg[0] = np.nan
+        self.rows += chunk.shape[0]
+
+        roll_tr = self.roll_tr.update(tr)
+        roll_dmp = self.roll_dmp.update(dm_pos)
+        roll_dmn = self.roll_dmn.update(dm_neg)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Compute directional indicator
+            di_pos = 100 * roll_dmp / roll_tr
+            di_neg = 100 * roll_dmn / roll_tr
+            # Compute dx and smooth it for adx
+            dx = 100 * np.abs(di_pos - di_neg) / (di_pos + di_neg)
+        adx = self.adx.update(dx)
+
+        return pd.DataFrame({'adx': adx, 'dx': dx}, index=chunk.index, copy=False)
+
+class RSIChunks:
+    """
+    RSI indicator computed block by block.
+    Matches technical.RSI for the same rows.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.rows = 0
+        self.prev_close = _Previous()
+        self.roll_gain = _Rolling(ma)
+        self.roll_loss = _Rolling(ma)
+        # Recursive rule over the rolling means, seeded at index ma
+        last = lambda values: values[-1]
+        self.av_gain = _Recursion((ma - 1) / ma, 1 / ma, ma, last)
+        self.av_loss = _Recursion((ma - 1) / ma, 1 / ma, ma, last)
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.Series/pd.DataFrame
+            Close prices, or a dataframe with a close column
+        Returns
+        ----------
+        pd.Series
+            With rsi values for the rows of the block
+        """
+
+        close = _close(chunk)
+
+        # Compute gains and losses, negative values are substituted for zero
+        change = np.diff(self.prev_close.extend(close))
+        gain = np.maximum(change, 0)
+        loss = np.maximum(-change, 0)
+        if self.rows == 0 and chunk.shape[0] > 0:
+            gain[0] = loss[0] = np.nan
+        self.rows += chunk.shape[0]
+
+        av_gain = self.av_gain.update(self.roll_gain.update(gain))
+        av_loss = self.av_loss.update(self.roll_loss.update(loss))
+
+        # Compute indicator
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + (av_gain / av_loss)))
+
+        return pd.Series(rsi, index=chunk.index, name='rsi', copy=False)
+
+class MACDChunks:
+    """
+    Moving average convergence divergence (MACD)
+    computed block by block. Matches technical.MACD
+    for the same rows.
+    Parameters
+    ----------
+    slow: int
+        How many observations the slow line will look back
+    fast: int
+        How many obversations the fast line will look back
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, slow, fast, ma):
+        for parameter in [slow, fast, ma]:
+            if not isinstance(parameter, int):
+                raise TypeError('One or more parameters are not integer type.')
+        if slow <= fast:
+            raise ValueError('Slow line must have a value bigger than fast line')
+        self.slow = _EWMState(slow)
+        self.fast = _EWMState(fast)
+        self.signal = _EWMState(ma)
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.Series/pd.DataFrame
+            Close prices, or a dataframe with a close column
+        Returns
+        ----------
+        pd.DataFrame
+            With columns macd_line and macd_signal for the rows of the block
+        """
+
+        close = _close(chunk)
+        macd_line = np.abs(self.slow.update(close) - self.fast.update(close))
+        macd_signal = self.signal.update(macd_line)
+
+        return pd.DataFrame({'macd_line': macd_line, 'macd_signal': macd_signal},
+                            index=chunk.index, copy=False)
+
+class BollingerChunks:
+    """
+    Bollinger bands computed block by block.
+    Matches technical.bollband for the same rows.
+    Parameters
+    ----------
+    ma: int
+        Moving average parameter
+    mult: int/float
+        Bands are mult standard deviations away from the moving average
+    """
+
+    def __init__(self, ma, mult=2):
+        _check_period(ma)
+        ti._check_mult(mult)
+        self.ma = ma
+        self.mult = mult
+        # The first deviation of a block needs 2 * (ma - 1) previous closes
+        self.tail = np.empty(0)
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.Series/pd.DataFrame
+            Close prices, or a dataframe with a close column
+        Returns
+        ----------
+        pd.DataFrame
+            With columns bollband_up and bollband_low for the rows of the block
+        """
+
+        close = _close(chunk)
+        extended = np.concatenate([self.tail, close])
+        ma, std = backend.rolling_mean_std(extended, self.ma)
+        self.tail = extended[max(0, extended.shape[0] - 2 * (self.ma - 1)):]
+
+        start = extended.shape[0] - close.shape[0]
+        ma, std = ma[start:], std[start:] * self.mult
+
+        return pd.DataFrame({'bollband_up': ma + std, 'bollband_low': ma - std},
+                            index=chunk.index, copy=False)
+
+class OBVChunks:
+    """
+    On balance volume (OBV) computed block by block.
+    Matches technical.OBV for the same rows.
+    """
+
+    def __init__(self):
+        self.prev_close = _Previous()
+        self.obv = 0
+
+    def update(self, chunk):
+        """
+        Add a block of rows.
+        Parameters
+        ----------
+        chunk: pd.DataFrame
+            Must have the following columns: Close and Volume.
+        Returns
+        ----------
+        pd.DataFrame
+            With column obv for the rows of the block
+        """
+
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError('Input data is not a pandas DataFrame.')
+        if not set(['Close', 'Volume']).issubset(chunk.columns):
+            raise IndexError('Missing necessary columns (Close or Volume).')
+
+        close = self.prev_close.extend(ti._column(chunk, 'Close'))
+        volume = chunk['Volume'].to_numpy()
+
+        # 1 for positive returns, -1 for negative and 0 otherwise
+        with np.errstate(divide='ignore', invalid='ignore'):
+            directional = np.sign(close[1:] / close[:-1] - 1)
+        directional[np.isnan(directional)] = 0
+
+        steps = directional.astype(np.int64) * volume
+        # Missing volumes stay missing without breaking the running sum
+        obv = np.nancumsum(steps) + self.obv
+        if obv.dtype.kind == 'f':
+            obv[np.isnan(steps)] = np.nan
+        self.obv += np.nansum(steps)
+
+        return pd.DataFrame({'obv': obv}, index=chunk.index, copy=False)
@@ -0,0 +1,244 @@
+"""
+Implements expanding window (point in time) versions of the
+performance indicators. The value at each row is the indicator
+of all prices up to that row, the same result as calling
+performance.py on that prefix, computed in a single pass with
+cumulative statistics.
+"""
+
+import numpy as np
+import pandas as pd
+
+import rolling
+
+def _cum_returns(series):
+    """
+    Cumulative returns, computed as performance.py does.
+    """
+
+    return (1 + series.pct_change()).cumprod()
+
+def _cagr(series, periods):
+    """
+    Expanding CAGR, NaN for the first row which has no return.
+    """
+
+    years = np.arange(series.shape[0], dtype=float) / periods
+    if series.ndim > 1:
+        years = years[:, None]
+    # First row has no period, its exponent is never used
+    years[0] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _cum_returns(series).to_numpy() ** (1 / years) - 1
+
+def _volatility(series, periods):
+    """
+    Expanding volatility, running variance of returns.
+    """
+
+    return series.pct_change().expanding().std().to_numpy() * np.sqrt(periods)
+
+def _max_dd(series):
+    """
+    Expanding max drawdown from the running peak of cumulative returns.
+    """
+
+    cum_ret = _cum_returns(series)
+    cum_max = cum_ret.cummax()
+
+    return ((cum_max - cum_ret) / cum_max).cummax().to_numpy()
+
+def CAGR(data, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate cummulative annual growth rate (CAGR) as of each row.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        CAGR of the prices up to each row, NaN for the first row.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = rolling._prices(data, matrix)
+
+    # Handles parameter input
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    periods = rolling._periods(frequency, only_business, data)
+
+    return rolling._output(_cagr(series, periods), series, 'cagr')
+
+def volatility(data, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate volatility (standard deviation annualized)
+    of returns as of each row.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible
+        to input a dataframe, must contain a close column.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Volatility of the prices up to each row, NaN for the first two rows.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = rolling._prices(data, matrix)
+
+    # Handles parameter input
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    periods = rolling._periods(frequency, only_business, data)
+
+    return rolling._output(_volatility(series, periods), series, 'volatility')
+
+def sharpe(data, rf_rate, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate sharpe ratio as of each row.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible
+        to input a dataframe, must contain a close column.
+    rf_rate: float
+        Risk free rate.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Sharpe ratio of the prices up to each row, NaN for the first
+        two rows and while volatility is zero.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = rolling._prices(data, matrix)
+
+    # Handles parameter input
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    rolling._check_rate(rf_rate)
+    periods = rolling._periods(frequency, only_business, data)
+
+    vol = _volatility(series, periods)
+    # Zero volatility has no sharpe ratio
+    vol[vol == 0] = np.nan
+    sharpe_ratio = _cagr(series, periods)
+    sharpe_ratio -= rf_rate
+    sharpe_ratio /= vol
+
+    return rolling._output(sharpe_ratio, series, 'sharpe')
+
+def max_dd(data, matrix=False):
+    """
+    Calculate maximum drawdown as of each row.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Max drawdown of the prices up to each row, NaN for the first row.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = rolling._prices(data, matrix)
+
+    # Handles parameter input
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+
+    return rolling._output(_max_dd(series), series, 'max_dd')
+
+def calmar(data, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate calmar ratio as of each row.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Calmar ratio of the prices up to each row, NaN for the first row.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = rolling._prices(data, matrix)
+
+    # Handles parameter input
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    periods = rolling._periods(frequency, only_business, data)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar_ratio = _cagr(series, periods) / _max_dd(series)
+
+    return rolling._output(calmar_ratio, series, 'calmar')
@@ -0,0 +1,298 @@
+"""
+Implements optional instrumentation of the technical and
+performance functions. When enabled, every call records its
+wall time split by stage (columns, validation, compute, output),
+the number of rows processed and, optionally, the peak memory
+allocated. Disabled, a call only checks a flag.
+"""
+
+import time
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Checked by every instrumented call, kept as a plain global so
+# the disabled path is a single lookup
+_enabled = False
+# Peak memory is traced only when asked, tracemalloc is slow
+_memory = False
+_started_tracing = False
+# Totals by function name
+_totals = {}
+_hooks = []
+_lock = threading.Lock()
+# Stack of active calls of each thread
+_local = threading.local()
+
+class _Call:
+    """
+    Timings of one active call.
+    """
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self.stages = {}
+        self.stage = None
+        self.start = self.mark = time.perf_counter()
+        self.base = self.peak = 0
+        if _memory and tracemalloc.is_tracing():
+            self.base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+    def switch(self, stage):
+        now = time.perf_counter()
+        if self.stage is not None:
+            self.stages[self.stage] = self.stages.get(self.stage, 0.0) + now - self.mark
+        self.stage = stage
+        self.mark = now
+
+    def traced_peak(self):
+        """
+        Peak memory since the last reset, relative to the start of the call.
+        """
+
+        if not (_memory and tracemalloc.is_tracing()):
+            return 0
+        return max(0, tracemalloc.get_traced_memory()[1] - self.base)
+
+def _rows(args):
+    """
+    Number of rows of the first argument, None if it has no length.
+    """
+
+    if not args:
+        return None
+    shape = getattr(args[0], 'shape', None)
+    if shape:
+        return int(shape[0])
+    return None
+
+def _calls():
+    calls = getattr(_local, 'calls', None)
+    if calls is None:
+        calls = _local.calls = []
+    return calls
+
+def _finish(call, error):
+    """
+    Close a call, add it to the totals and pass its record to the hooks.
+    """
+
+    call.switch(None)
+    seconds = time.perf_counter() - call.start
+    peak = max(call.peak, call.traced_peak())
+
+    record = {
+        'function': call.name,
+        'seconds': seconds,
+        'rows': call.rows,
+        'peak_bytes': peak if _memory else None,
+        'stages': call.stages,
+        'error': error,
+    }
+
+    with _lock:
+        total = _totals.setdefault(call.name, {'calls': 0, 'errors': 0, 'seconds': 0.0, 'rows': 0,
+                                               'peak_bytes': 0, 'stages': {}})
+        total['calls'] += 1
+        total['errors'] += int(error)
+        total['seconds'] += seconds
+        total['rows'] += call.rows or 0
+        total['peak_bytes'] = max(total['peak_bytes'], peak)
+        for stage, value in call.stages.items():
+            total['stages'][stage] = total['stages'].get(stage, 0.0) + value
+        hooks = list(_hooks)
+
+    for hook in hooks:
+        hook(record)
+
+    return peak
+
+def instrumented(func):
+    """
+    Decorator recording the calls of a function while instrumentation is enabled.
+    """
+
+    name = func.__module__ + '.' + func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        calls = _calls()
+        if calls and _memory:
+            # Peak of the caller so far, tracemalloc has a single peak
+            parent = calls[-1]
+            parent.peak = max(parent.peak, parent.traced_peak())
+        call = _Call(name, _rows(args))
+        calls.append(call)
+        error = True
+        try:
+            result = func(*args, **kwargs)
+            error = False
+        finally:
+            calls.pop()
+            peak = _finish(call, error)
+            if calls and _memory:
+                parent = calls[-1]
+                parent.peak = max(parent.peak, call.base - parent.base + peak)
+
+        return result
+
+    return wrapper
+
+def stage(name):
+    """
+    Start a new stage of the active call, e.g. stage('compute').
+    Time until the next stage, or the end of the call, counts for it.
+    """
+
+    if not _enabled:
+        return
+    calls = getattr(_local, 'calls', None)
+    if calls:
+        calls[-1].switch(name)
+
+def enable(memory=False):
+    """
+    Start recording calls.
+    Parameters
+    ----------
+    memory: bool
+        Record peak memory allocated by each call with tracemalloc.
+        Makes the calls noticeably slower.
+    """
+
+    global _enabled, _memory, _started_tracing
+
+    if not isinstance(memory, bool):
+        raise TypeError('Value for memory must be a boolean.')
+
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+    elif not memory and _started_tracing:
+        # Tracing started by someone else is left running
+        tracemalloc.stop()
+        _started_tracing = False
+    _memory = memory
+    _enabled = True
+
+def disable():
+    """
+    Stop recording calls, recorded totals are kept.
+    """
+
+    global _enabled, _memory, _started_tracing
+
+    _enabled = False
+    _memory = False
+    if _started_tracing:
+        tracemalloc.stop()
+        _started_tracing = False
+
+def is_enabled():
+    return _enabled
+
+@contextmanager
+def recording(memory=False):
+    """
+    Record calls inside a with block.
+    Parameters
+    ----------
+    memory: bool
+        Record peak memory allocated by each call
+    Returns
+    ----------
+    context manager
+        Yields nothing, read results with report() or prometheus()
+    """
+
+    previous = (_enabled, _memory)
+    enable(memory)
+    try:
+        yield
+    finally:
+        disable()
+        if previous[0]:
+            enable(previous[1])
+
+def add_hook(hook):
+    """
+    Call hook(record) after every recorded call. A record is a dict
+    with keys function, seconds, rows, peak_bytes, stages and error.
+    """
+
+    if not callable(hook):
+        raise TypeError('Hook is not callable.')
+    with _lock:
+        _hooks.append(hook)
+
+def remove_hook(hook):
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+def reset():
+    """
+    Clear recorded totals.
+    """
+
+    with _lock:
+        _totals.clear()
+
+def report():
+    """
+    Recorded totals.
+    Returns
+    ----------
+    dict
+        By function name (e.g. technical.ADX), a dict with keys calls,
+        errors, seconds, rows, peak_bytes (largest call) and stages
+        (seconds by stage)
+    """
+
+    with _lock:
+        return {name: dict(total, stages=dict(total['stages'])) for name, total in _totals.items()}
+
+def prometheus(prefix='finance_toolkit'):
+    """
+    Recorded totals in the Prometheus text exposition format.
+    Parameters
+    ----------
+    prefix: str
+        Prefix of the metric names
+    Returns
+    ----------
+    str
+        Counters of calls, errors, seconds, seconds by stage and rows,
+        and a gauge with the largest peak memory of a call
+    """
+
+    totals = report()
+    metrics = [
+        ('calls_total', 'counter', 'Calls of each function', 'calls'),
+        ('errors_total', 'counter', 'Calls that raised an exception', 'errors'),
+        ('seconds_total', 'counter', 'Wall time spent in each function', 'seconds'),
+        ('rows_total', 'counter', 'Rows of input data processed', 'rows'),
+        ('peak_bytes', 'gauge', 'Largest peak memory allocated by a call', 'peak_bytes'),
+    ]
+
+    lines = []
+    for metric, kind, description, field in metrics:
+        lines.append(f'# HELP {prefix}_{metric} {description}')
+        lines.append(f'# TYPE {prefix}_{metric} {kind}')
+        for name, total in sorted(totals.items()):
+            lines.append(f'{prefix}_{metric}{{function="{name}"}} {total[field]}')
+        if field == 'seconds':
+            lines.append(f'# HELP {prefix}_stage_seconds_total Wall time spent in each stage')
+            lines.append(f'# TYPE {prefix}_stage_seconds_total counter')
+            for name, total in sorted(totals.items()):
+                for stage_name, value in sorted(total['stages'].items()):
+                    lines.append(f'{prefix}_stage_seconds_total'
+                                 f'{{function="{name}",stage="{stage_name}"}} {value}')
+
+    return '\n'.join(lines) + '\n'
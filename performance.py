@@ -6,7 +6,133 @@ indicators used in investments.
 import numpy as np
 import pandas as pd
 
-def CAGR(data, frequency='Y', only_business=True):
+import instrument
+
+def _matrix_prices(data, dtype=float):
+    """
+    Close prices for matrix mode, one column for each asset.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Either close prices with one column for each asset or a
+        panel with MultiIndex columns (symbol, field), in which case
+        the close field of each symbol is used.
+    dtype: str
+        Float type of the prices
+    Returns
+    ----------
+    pd.DataFrame
+        Close prices with assets as columns
+    """
+
+    if data.columns.nlevels == 2:
+        # All possibles names for close column
+        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+        fields = data.columns.get_level_values(1).unique()
+        cols = [col for col in fields if col in possible_cols]
+        # Check if there's only one close field
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        data = data.xs(cols[0], axis=1, level=1)
+
+    # Single 2-D block, so every operation runs once for all assets
+    return pd.DataFrame(data.to_numpy(dtype=dtype), index=data.index, columns=data.columns)
+
+# Length of the trading session of intraday frequencies, in hours
+SESSION_HOURS = 6.5
+# Minutes of each bar of intraday frequencies
+_INTRADAY = {'1m': 1, '5m': 5, '15m': 15, '30m': 30, '1h': 60}
+# Timestamps read to infer the frequency
+_INFER_ROWS = 10_000
+
+def _timestamps(data):
+    """
+    First timestamps of data, from a DatetimeIndex or a time column.
+    """
+
+    if isinstance(data, (pd.Series, pd.DataFrame)) and isinstance(data.index, pd.DatetimeIndex):
+        return data.index[:_INFER_ROWS]
+
+    if isinstance(data, pd.DataFrame):
+        # All possibles names for time column
+        possible_cols = ['Datetime', 'datetime', 'Date', 'date']
+        cols = [col for col in data.columns if col in possible_cols]
+        if len(cols) > 0:
+            # Only the rows used are parsed
+            return pd.DatetimeIndex(pd.to_datetime(data[cols[0]].iloc[:_INFER_ROWS]))
+
+    raise ValueError('Data frequency can only be inferred from a DatetimeIndex or a time column.')
+
+def _infer_periods(data, days):
+    """
+    Number of periods in a year from the median step between
+    timestamps. Steps shorter than a day are intraday bars of a
+    SESSION_HOURS session, longer steps are the nearest of daily,
+    weekly, monthly and yearly.
+    """
+
+    times = _timestamps(data)
+    if len(times) < 2:
+        raise ValueError('Not enough timestamps to infer data frequency.')
+    # Median step in minutes, whatever the resolution of the timestamps
+    step = (times[1:] - times[:-1]).median() / pd.Timedelta(minutes=1)
+    if not step > 0:
+        raise ValueError('Timestamps must be increasing to infer data frequency.')
+
+    day = 24 * 60
+    if step < day:
+        return SESSION_HOURS * 60 / step * days
+
+    # Nearest standard frequency, in log scale
+    candidates = [(day, days), (7 * day, 52), (365.25 / 12 * day, 12), (365.25 * day, 1)]
+    return min(candidates, key=lambda item: abs(np.log(step / item[0])))[1]
+
+def _periods(frequency, only_business, data=None):
+    """
+    Number of periods in a year.
+    Parameters
+    ----------
+    frequency: string/float
+        D, W, M, Y, an intraday frequency (1m, 5m, 15m, 30m, 1h),
+        infer or a number of periods in a year
+    only_business: bool
+        When using daily or intraday data count only business days
+    data: pd.Series/pd.DataFrame
+        Input data, its timestamps are read to infer the frequency
+    Returns
+    ----------
+    float
+        Periods in a year
+    """
+
+    # Handles parameter input
+    numeric = isinstance(frequency, (int, float, np.number)) and not isinstance(frequency, bool)
+    if not (numeric or frequency in ('D', 'W', 'M', 'Y', 'infer') + tuple(_INTRADAY)):
+        raise ValueError('Invalid option for data frequency.')
+    if numeric and not frequency > 0:
+        raise ValueError('Number of periods in a year must be positive.')
+    if not isinstance(only_business, bool):
+        raise TypeError('Value for only_business must be a boolean.')
+
+    if numeric:
+        return frequency
+
+    # Trading days in a year
+    days = 252 if only_business else 365
+    if frequency == 'infer':
+        return _infer_periods(data, days)
+    if frequency in _INTRADAY:
+        return SESSION_HOURS * 60 / _INTRADAY[frequency] * days
+
+    # Map frequency strings to values
+    freq_dict = {'D': days, 'W': 52, 'M': 12, 'Y': 1}
+
+    return freq_dict[frequency]
+
+@instrument.instrumented
+def CAGR(data, frequency='Y', only_business=True, matrix=False, dtype='float64'):
     """ 
     Calculate cummulative annual growth rate (CAGR) for a given series.
     Parameters
@@ -14,21 +140,37 @@ def CAGR(data, frequency='Y', only_business=True):
     data: pd.Series/pd.DataFrame
         Series contaning close prices for an asset. Also possible to input a dataframe,
         must contain a close column.
-    frequency: string
+    frequency: string/float
         D for daily prices
         W for weekly prices
         M for monthly prices
         Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
     only_business: bool
-        When using daily data count only business days.
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
     Returns
     ----------
-    float
-        CAGR indicator
+    float/pd.Series
+        CAGR indicator, one value for each asset in matrix mode
     """
 
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # All possibles names for close column
         possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
         # Select them
@@ -38,42 +180,35 @@ def CAGR(data, frequency='Y', only_business=True):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        # Select data as series, it is only read so no copy is made
+        series = data[cols[0]].astype(dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.astype(dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
-    if not frequency in ('D', 'W', 'M', 'Y'): 
-        raise ValueError('Invalid option for data frequency.')
-    if not isinstance(only_business, bool):
-        raise TypeError('Value for only_business must be a boolean.')
+    instrument.stage('validation')
+    periods = _periods(frequency, only_business, data)
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
 
-    # Map frequency strings to values
-    if only_business:
-        freq_dict = {'D': 252, 'W': 52, 'M': 12, 'Y': 1}
-    else:
-        freq_dict = {'D': 365, 'W': 52, 'M': 12, 'Y': 1}
-    
+    instrument.stage('compute')
     # Factor used to calculate CAGR
-    n = (series.shape[0] - 1) / freq_dict[frequency]
+    n = (series.shape[0] - 1) / periods
     
-    # Store temporary values
-    tmp_df = pd.DataFrame()
-
-    # Calculate indicator
-    tmp_df['returns'] = series.pct_change()
-    tmp_df['cum_returns'] = (1 + tmp_df['returns']).cumprod()
+    # Calculate indicator, column wise for matrix mode
+    returns = series.pct_change()
+    cum_returns = (1 + returns).cumprod()
     
-    CAGR = ((tmp_df['cum_returns'].iloc[-1]) ** (1 / n)) - 1
+    CAGR = ((cum_returns.iloc[-1]) ** (1 / n)) - 1
 
     return CAGR
 
-def volatility(data, frequency='Y', only_business=True):
+@instrument.instrumented
+def volatility(data, frequency='Y', only_business=True, matrix=False, dtype='float64'):
     """ 
     Calculate volatility (standard deviation annualized)
     for returns on a given asset.
@@ -82,21 +217,37 @@ def volatility(data, frequency='Y', only_business=True):
     data: pd.Series/pd.DataFrame
         Series contaning close prices for an asset. Also possible
         to input a dataframe, must contain a close column.
-    frequency: string
+    frequency: string/float
         D for daily prices
         W for weekly prices
         M for monthly prices
         Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
     only_business: bool
-        When using daily data count only business days.
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
     Returns
     ----------
-    float
-        volatility
+    float/pd.Series
+        volatility, one value for each asset in matrix mode
     """
     
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # All possibles names for close column
         possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
         # Select them
@@ -106,39 +257,33 @@ def volatility(data, frequency='Y', only_business=True):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        # Select data as series, it is only read so no copy is made
+        series = data[cols[0]].astype(dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.astype(dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
-    if not frequency in ('D', 'W', 'M', 'Y'): 
-        raise ValueError('Invalid option for data frequency.')
-    if not isinstance(only_business, bool):
-        raise TypeError('Value for only_business must be a boolean.')
-
-    # Map frequency strings to values
-    if only_business:
-        freq_dict = {'D': 252, 'W': 52, 'M': 12, 'Y': 1}
-    else:
-        freq_dict = {'D': 365, 'W': 52, 'M': 12, 'Y': 1}
+    instrument.stage('validation')
+    periods = _periods(frequency, only_business, data)
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
 
+    instrument.stage('compute')
     # Annualization factor
-    n_sqrt = np.sqrt(freq_dict[frequency])
+    n_sqrt = np.sqrt(periods, dtype=dtype)
 
-    # Store temporary values
-    tmp_df = pd.DataFrame()
-    
-    tmp_df['returns'] = series.pct_change()
-    volatility = tmp_df['returns'].std() * n_sqrt
+    # Column wise for matrix mode
+    returns = series.pct_change()
+    volatility = returns.std() * n_sqrt
     
     return volatility
 
-def sharpe(data, rf_rate, frequency='Y', only_business=True):
+@instrument.instrumented
+def sharpe(data, rf_rate, frequency='Y', only_business=True, matrix=False, dtype='float64'):
     """ 
     Calculate sharpe ratio.
     Parameters
@@ -148,19 +293,38 @@ def sharpe(data, rf_rate, frequency='Y', only_business=True):
         to input a dataframe, must contain a close column.
     rf_rate: float
         Risk free rate.
-    frequency: string
+    frequency: string/float
         D for daily prices
         W for weekly prices
         M for monthly prices
         Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
     Returns
     ----------
-    float
-        sharpe ratio
+    float/pd.Series
+        sharpe ratio, one value for each asset in matrix mode.
+        Assets with zero volatility are NaN in matrix mode.
     """
     
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # All possibles names for close column
         possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
         # Select them
@@ -170,30 +334,34 @@ def sharpe(data, rf_rate, frequency='Y', only_business=True):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        # Select data as series, it is only read so no copy is made
+        series = data[cols[0]].astype(dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.astype(dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
-    if not frequency in ('D', 'W', 'M', 'Y'): 
-        raise ValueError('Invalid option for data frequency.')
-    if not isinstance(only_business, bool):
-        raise TypeError('Value for only_business must be a boolean.')
+    instrument.stage('validation')
+    periods = _periods(frequency, only_business, data)
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
     if not isinstance(rf_rate, float):
         raise TypeError('rf_rate parameter is not float type.')
     if rf_rate > 1 or rf_rate < 0:
         raise ValueError('rf_rate must positive and equal or less than 1.')
 
-    cagr = CAGR(series, frequency, only_business)
-    vol = volatility(series, frequency, only_business)
+    instrument.stage('compute')
+    matrix = isinstance(series, pd.DataFrame)
+    cagr = CAGR(series, periods, only_business, matrix, dtype)
+    vol = volatility(series, periods, only_business, matrix, dtype)
 
     # Handles division by zero
-    if vol == 0:
+    if matrix:
+        vol = vol.mask(vol == 0)
+    elif vol == 0:
         raise ZeroDivisionError('Volatility cannot be equal to zero.')
 
     sharpe_ratio = (cagr - rf_rate) / vol
@@ -275,7 +443,8 @@ def sharpe(data, rf_rate, frequency='Y', only_business=True):
     
 #     return sortino_ratio
 
-def max_dd(data):
+@instrument.instrumented
+def max_dd(data, matrix=False, dtype='float64'):
     """ 
     Calculate maximum drawdown.
     Parameters
@@ -283,14 +452,27 @@ def max_dd(data):
     data: pd.Series/pd.DataFrame
         Series contaning close prices for an asset. Also possible to input a dataframe,
         must contain a close column.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
     Returns
     ----------
-    float
-        max drawdown
+    float/pd.Series
+        max drawdown, one value for each asset in matrix mode
     """
 
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # All possibles names for close column
         possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
         # Select them
@@ -300,30 +482,34 @@ def max_dd(data):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        # Select data as series, it is only read so no copy is made
+        series = data[cols[0]].astype(dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.astype(dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
-    # Store values
-    tmp_df = pd.DataFrame()
-    
-    # Calculate drawdown
-    tmp_df['returns'] = series.pct_change()
-    tmp_df['cum_ret'] = (1 + tmp_df['returns']).cumprod()
-    tmp_df['cum_max'] = tmp_df['cum_ret'].cummax()
-    tmp_df['drawdown'] = tmp_df['cum_max'] - tmp_df['cum_ret']
-    tmp_df['dd_pct'] = tmp_df['drawdown'] / tmp_df['cum_max']
+    # Handles parameter input
+    instrument.stage('validation')
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+
+    instrument.stage('compute')
+    # Calculate drawdown, column wise for matrix mode
+    returns = series.pct_change()
+    cum_ret = (1 + returns).cumprod()
+    cum_max = cum_ret.cummax()
+    drawdown = cum_max - cum_ret
+    dd_pct = drawdown / cum_max
     
-    max_drawdown = tmp_df['dd_pct'].max()
+    max_drawdown = dd_pct.max()
     
     return max_drawdown
 
-def calmar(data, frequency='Y', only_business=True):
+@instrument.instrumented
+def calmar(data, frequency='Y', only_business=True, matrix=False, dtype='float64'):
     """ 
     Calculate calmar ratio.
     Parameters
@@ -331,21 +517,37 @@ def calmar(data, frequency='Y', only_business=True):
     data: pd.Series/pd.DataFrame
         Series contaning close prices for an asset. Also possible to input a dataframe,
         must contain a close column.
-    frequency: string
+    frequency: string/float
         D for daily prices
         W for weekly prices
         M for monthly prices
         Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
     only_business: bool
-        When using daily data count only business days.
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
     Returns
     ----------
-    float
-        calmar ratio
+    float/pd.Series
+        calmar ratio, one value for each asset in matrix mode
     """
     
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # All possibles names for close column
         possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
         # Select them
@@ -355,21 +557,123 @@ def calmar(data, frequency='Y', only_business=True):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        # Select data as series, it is only read so no copy is made
+        series = data[cols[0]].astype(dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.astype(dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
-    if not frequency in ('D', 'W', 'M', 'Y'): 
-        raise ValueError('Invalid option for data frequency.')
-    if not isinstance(only_business, bool):
-        raise TypeError('Value for only_business must be a boolean.')
+    instrument.stage('validation')
+    periods = _periods(frequency, only_business, data)
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+
+    instrument.stage('compute')
+    matrix = isinstance(series, pd.DataFrame)
+    calmar_ratio = CAGR(series, periods, only_business, matrix, dtype) / \
+        max_dd(series, matrix, dtype)
+    
+    return calmar_ratio
 
-    calmar_ratio = CAGR(series, frequency, only_business) / max_dd(series)
+@instrument.instrumented
+def performance_report(data, rf_rate, frequency='Y', only_business=True, matrix=False, dtype='float64'):
+    """ 
+    Calculate CAGR, volatility, sharpe ratio, max drawdown and
+    calmar ratio at once. Returns, cumulative returns and their
+    running max are computed only once and shared by all indicators.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible
+        to input a dataframe, must contain a close column.
+    rf_rate: float
+        Risk free rate.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    dtype: str
+        float64 or float32. Prices and returns use this type.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Indicators cagr, volatility, sharpe, max_dd and calmar.
+        In matrix mode, a DataFrame with one row for each asset.
+        Sharpe ratio is NaN when volatility is equal to zero.
+    """
     
-    return calmar_ratio
\ No newline at end of file
+    # Handles dtype input, prices are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
+    # Handles input data
+    instrument.stage('columns')
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        series = _matrix_prices(data, dtype)
+
+    elif isinstance(data, pd.DataFrame):
+        # All possibles names for close column
+        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+        # Select them
+        cols = [col for col in data.columns if col in possible_cols]
+        # Check if there's only one close column
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        series = data[cols[0]].astype(dtype)
+
+    elif isinstance(data, pd.Series):
+        series = data.astype(dtype)
+    
+    else:
+        raise TypeError('Input data is not a pandas Series or DataFrame.')
+
+    # Handles parameter input
+    instrument.stage('validation')
+    periods = _periods(frequency, only_business, data)
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    if not isinstance(rf_rate, float):
+        raise TypeError('rf_rate parameter is not float type.')
+    if rf_rate > 1 or rf_rate < 0:
+        raise ValueError('rf_rate must positive and equal or less than 1.')
+
+    instrument.stage('compute')
+    # Shared by all indicators
+    returns = series.pct_change()
+    cum_ret = (1 + returns).cumprod()
+    cum_max = cum_ret.cummax()
+
+    report = {}
+
+    n = (series.shape[0] - 1) / periods
+    report['cagr'] = ((cum_ret.iloc[-1]) ** (1 / n)) - 1
+    report['volatility'] = returns.std() * np.sqrt(periods, dtype=dtype)
+    # Zero volatility has no sharpe ratio
+    vol = report['volatility']
+    if isinstance(series, pd.DataFrame):
+        vol = vol.mask(vol == 0)
+    elif vol == 0:
+        vol = np.nan
+    report['sharpe'] = (report['cagr'] - rf_rate) / vol
+    report['max_dd'] = ((cum_max - cum_ret) / cum_max).max()
+    report['calmar'] = report['cagr'] / report['max_dd']
+
+    if isinstance(series, pd.DataFrame):
+        return pd.DataFrame(report)
+
+    return pd.Series(report)
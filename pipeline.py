@@ -0,0 +1,471 @@
+"""
+Implements indicator pipelines. A list of indicator specs is
+turned into a graph of the intermediate series they need (true
+range, close differences, returns, moving averages...), and each
+series shared by several indicators is computed only once.
+"""
+
+import inspect
+
+import numpy as np
+import pandas as pd
+
+import backend
+import instrument
+import technical as ti
+import performance as pi
+import rolling
+import universe
+
+def _dtype(dtype):
+    """
+    Name of a float type option.
+    """
+
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
+    return np.dtype(dtype).name
+
+def _price_field(data, dtype):
+    """
+    Node of the close prices of a series or dataframe.
+    """
+
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    if isinstance(data, pd.DataFrame):
+        # Select them
+        cols = [col for col in data.columns if col in possible_cols]
+        # Check if there's only one close column
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        return ('field', cols[0], dtype)
+
+    elif isinstance(data, pd.Series):
+        return ('field', None, dtype)
+
+    raise TypeError('Input data is not a pandas Series or DataFrame.')
+
+def _fields(data, names, dtype):
+    """
+    Nodes of columns that must be present in a dataframe.
+    """
+
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError('Input data is not a pandas DataFrame.')
+    if not set(names).issubset(data.columns):
+        raise IndexError('Missing necessary columns (' + ', '.join(names[:-1]) +
+                         ' or ' + names[-1] + ').')
+
+    return [('field', name, dtype) for name in names]
+
+def _read(data, key):
+    """
+    Value of an input node, a column of data read as technical.py does.
+    """
+
+    _, name, dtype = key
+    if name is None:
+        return data.to_numpy(dtype=dtype)
+    if name == 'Volume':
+        # Keeps volume type, integer volume gives integer obv
+        volume = data['Volume'].to_numpy()
+        if volume.dtype.kind == 'f':
+            volume = volume.astype(dtype, copy=False)
+        return volume
+
+    return ti._column(data, name, dtype)
+
+def _part(diff, sign):
+    """
+    Positive part of a difference times sign, the gains (sign 1)
+    or losses (sign -1) of RSI and the directional movements of ADX.
+    The first row is NaN.
+    """
+
+    part = np.negative(diff) if sign < 0 else diff.copy()
+    np.maximum(part, 0, out=part)
+    part[0] = np.nan
+
+    return part
+
+def _returns(close):
+    """
+    Returns of close prices, the first row is NaN.
+    """
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.empty(close.shape, dtype=close.dtype)
+        returns[0] = np.nan
+        np.divide(close[1:], close[:-1], out=returns[1:])
+        returns -= 1
+
+    return returns
+
+# Functions of the intermediate nodes. A node key is its name followed
+# by its arguments, where tuples are the keys of other nodes.
+_NODES = {
+    'tr': ti._true_range,
+    'diff': ti._diff,
+    'gain': lambda diff: _part(diff, 1),
+    'loss': lambda diff: _part(diff, -1),
+    'wilder': lambda values, ma: ti._wilder(values, ma, ma),
+    'mean': lambda values, ma: ti._rolling(values, ma).mean().to_numpy(dtype=values.dtype),
+    'bands': backend.rolling_mean_std,
+    'macd': lambda values, slow, fast, ma: backend.macd(values, 2 / (slow + 1), 2 / (fast + 1),
+                                                       2 / (ma + 1)),
+    'returns': _returns,
+    'cum_ret': lambda returns: (1 + pd.Series(returns, copy=False)).cumprod(),
+    'cum_max': lambda cum_ret: cum_ret.cummax(),
+    'drawdown': lambda cum_ret, cum_max: ((cum_max - cum_ret) / cum_max).max(),
+    'ret_std': lambda returns: pd.Series(returns, copy=False).std(),
+}
+
+def _check_ma(ma):
+    if not isinstance(ma, int):
+        raise TypeError('ma parameter is not integer type.')
+
+def _cagr(cum_ret, periods):
+    """
+    CAGR from cumulative returns, as performance.CAGR.
+    """
+
+    n = (cum_ret.shape[0] - 1) / periods
+
+    return ((cum_ret.iloc[-1]) ** (1 / n)) - 1
+
+def _volatility(std, periods, dtype):
+    return std * np.sqrt(periods, dtype=dtype)
+
+def _ADX(data, params):
+    high, low, close = _fields(data, ['High', 'Low', 'Close'], params['dtype'])
+    ma = params['ma']
+    _check_ma(ma)
+    deps = [('wilder', ('tr', high, low, close), ma),
+            ('wilder', ('gain', ('diff', high)), ma),
+            ('wilder', ('loss', ('diff', low)), ma)]
+
+    def build(roll_tr, roll_dmp, roll_dmn):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Compute directional indicator
+            di_pos = np.divide(roll_dmp, roll_tr)
+            di_pos *= 100
+            di_neg = np.divide(roll_dmn, roll_tr)
+            di_neg *= 100
+            # Compute dx and smooth it for adx, first value is the mean of dx
+            di_sum = np.add(di_pos, di_neg)
+            dx = np.subtract(di_pos, di_neg, out=di_pos)
+            np.abs(dx, out=dx)
+            np.divide(dx, di_sum, out=dx)
+            dx *= 100
+        adx = ti._wilder(dx, ma, 2*ma - 1, average=True)
+        return pd.DataFrame({'adx': adx, 'dx': dx}, index=data.index, copy=False)
+
+    return deps, build
+
+def _ATR(data, params):
+    high, low, close = _fields(data, ['High', 'Low', 'Close'], params['dtype'])
+    ma = params['ma']
+    _check_ma(ma)
+    tr = ('tr', high, low, close)
+
+    def build(tr, atr):
+        return pd.DataFrame({'atr': atr, 'tr': tr}, index=data.index, copy=False)
+
+    return [tr, ('mean', tr, ma)], build
+
+def _bollband(data, params):
+    close = _price_field(data, params['dtype'])
+    ma = params['ma']
+    _check_ma(ma)
+    ti._check_mult(params['mult'])
+
+    def build(bands):
+        mean, std = bands
+        std = params['mult'] * std
+        return pd.DataFrame({'bollband_up': mean + std, 'bollband_low': mean - std},
+                            index=data.index, copy=False)
+
+    return [('bands', close, ma)], build
+
+def _MACD(data, params):
+    close = _price_field(data, params['dtype'])
+    slow, fast, ma = params['slow'], params['fast'], params['ma']
+    for parameter in [slow, fast, ma]:
+        if not isinstance(parameter, int):
+            raise TypeError('One or more parameters are not integer type.')
+    if slow <= fast:
+        raise ValueError('Slow line must have a value bigger than fast line')
+
+    def build(lines):
+        macd_line, macd_signal = lines
+        return pd.DataFrame({'macd_line': macd_line, 'macd_signal': macd_signal},
+                            index=data.index, copy=False)
+
+    return [('macd', close, slow, fast, ma)], build
+
+def _RSI(data, params):
+    close = _price_field(data, params['dtype'])
+    ma = params['ma']
+    _check_ma(ma)
+    diff = ('diff', close)
+
+    def build(roll_gain, roll_loss):
+        av_gain = ti._rsi_average(roll_gain, ma, ma)
+        av_loss = ti._rsi_average(roll_loss, ma, ma)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.divide(av_gain, av_loss, out=av_gain)
+            rsi += 1
+            np.divide(100, rsi, out=rsi)
+            np.subtract(100, rsi, out=rsi)
+        return pd.Series(rsi, index=data.index, name='rsi', copy=False)
+
+    return [('mean', ('gain', diff), ma), ('mean', ('loss', diff), ma)], build
+
+def _OBV(data, params):
+    close, volume = _fields(data, ['Close', 'Volume'], params['dtype'])
+
+    def build(returns, volume):
+        # 1 for positive returns, -1 for negative and 0 otherwise
+        directional = np.sign(returns)
+        directional[np.isnan(directional)] = 0
+        directional = directional.astype(np.int64)
+        # Integer directional must not upcast float32 volume to float64
+        obv = np.multiply(directional, volume, dtype=np.result_type(volume.dtype, np.int8))
+        # Missing volumes stay missing without breaking the running sum
+        missing = np.isnan(obv) if obv.dtype.kind == 'f' else None
+        obv = np.nancumsum(obv, axis=0, out=obv) if missing is not None \
+            else np.cumsum(obv, axis=0, out=obv)
+        if missing is not None:
+            obv[missing] = np.nan
+        return pd.DataFrame({'obv': obv}, index=data.index, copy=False)
+
+    return [('returns', close), volume], build
+
+def _performance(data, params):
+    """
+    Nodes shared by the performance indicators, and the checked parameters.
+    """
+
+    close = _price_field(data, params['dtype'])
+    if not isinstance(params['matrix'], bool):
+        raise TypeError('Value for matrix must be a boolean.')
+    periods = None
+    if 'frequency' in params:
+        periods = pi._periods(params['frequency'], params['only_business'], data)
+    if 'rf_rate' in params:
+        rolling._check_rate(params['rf_rate'])
+
+    returns = ('returns', close)
+    cum_ret = ('cum_ret', returns)
+    cum_max = ('cum_max', cum_ret)
+
+    return returns, cum_ret, ('drawdown', cum_ret, cum_max), ('ret_std', returns), periods
+
+def _CAGR(data, params):
+    _, cum_ret, _, _, periods = _performance(data, params)
+
+    return [cum_ret], lambda cum_ret: _cagr(cum_ret, periods)
+
+def _volatility_spec(data, params):
+    _, _, _, std, periods = _performance(data, params)
+
+    return [std], lambda std: _volatility(std, periods, params['dtype'])
+
+def _sharpe(data, params):
+    _, cum_ret, _, std, periods = _performance(data, params)
+
+    def build(cum_ret, std):
+        vol = _volatility(std, periods, params['dtype'])
+        # Handles division by zero
+        if vol == 0:
+            raise ZeroDivisionError('Volatility cannot be equal to zero.')
+        return (_cagr(cum_ret, periods) - params['rf_rate']) / vol
+
+    return [cum_ret, std], build
+
+def _max_dd(data, params):
+    _, _, drawdown, _, _ = _performance(data, params)
+
+    return [drawdown], lambda drawdown: drawdown
+
+def _calmar(data, params):
+    _, cum_ret, drawdown, _, periods = _performance(data, params)
+
+    return [cum_ret, drawdown], lambda cum_ret, drawdown: _cagr(cum_ret, periods) / drawdown
+
+def _performance_report(data, params):
+    _, cum_ret, drawdown, std, periods = _performance(data, params)
+
+    def build(cum_ret, drawdown, std):
+        report = {}
+        report['cagr'] = _cagr(cum_ret, periods)
+        report['volatility'] = _volatility(std, periods, params['dtype'])
+        # Zero volatility has no sharpe ratio
+        vol = np.nan if report['volatility'] == 0 else report['volatility']
+        report['sharpe'] = (report['cagr'] - params['rf_rate']) / vol
+        report['max_dd'] = drawdown
+        report['calmar'] = report['cagr'] / report['max_dd']
+        return pd.Series(report)
+
+    return [cum_ret, drawdown, std], build
+
+# Indicators computed from the graph, by the function that builds
+# their dependencies and their result from the bound parameters
+_SPECS = {
+    ti.ADX: _ADX,
+    ti.ATR: _ATR,
+    ti.bollband: _bollband,
+    ti.MACD: _MACD,
+    ti.RSI: _RSI,
+    ti.OBV: _OBV,
+    pi.CAGR: _CAGR,
+    pi.volatility: _volatility_spec,
+    pi.sharpe: _sharpe,
+    pi.max_dd: _max_dd,
+    pi.calmar: _calmar,
+    pi.performance_report: _performance_report,
+}
+
+def _graph(data, specs):
+    """
+    Dependency graph of a list of specs.
+    Returns
+    ----------
+    tuple
+        Dict of (dependencies, function) by node key, in an order where
+        dependencies come first, and the output node key of each spec
+    """
+
+    graph = {}
+
+    def add(key, deps, func):
+        for dep in deps:
+            if dep not in graph:
+                if dep[0] == 'field':
+                    add(dep, [], lambda dep=dep: _read(data, dep))
+                else:
+                    args = [arg for arg in dep[1:] if isinstance(arg, tuple)]
+                    add(dep, args, _node(dep))
+        graph[key] = (deps, func)
+
+    outputs = []
+    for i, (func, params, _) in enumerate(specs):
+        key = ('output', i)
+        bound = inspect.signature(func).bind(data, **params)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])
+        # Panels, matrix mode and full output are left to the indicator itself
+        if func not in _SPECS or ti._is_panel(data) or arguments.get('full_output') \
+                or arguments.get('matrix') is True:
+            add(key, [], lambda func=func, params=params: func(data, **params))
+        else:
+            if 'dtype' in arguments:
+                arguments['dtype'] = _dtype(arguments['dtype'])
+            deps, build = _SPECS[func](data, arguments)
+            add(key, deps, build)
+        outputs.append(key)
+
+    return graph, outputs
+
+def _node(key):
+    """
+    Function of an intermediate node, called with the values of
+    the nodes in its key, and the other arguments of its key.
+    """
+
+    func = _NODES[key[0]]
+    args = key[1:]
+
+    def compute(*values):
+        values = iter(values)
+        return func(*[next(values) if isinstance(arg, tuple) else arg for arg in args])
+
+    return compute
+
+def _names(specs):
+    """
+    Result name of each spec, the function name when it is not given.
+    """
+
+    names = [func.__name__ if name is None else name for func, _, name in specs]
+    if len(set(names)) != len(names):
+        raise ValueError('Duplicated indicator names, give a name to each spec.')
+
+    return names
+
+def plan_pipeline(data, specs):
+    """
+    Intermediate series a pipeline computes for some data, for
+    inspection. Each one is computed once, whatever the number of
+    indicators that need it.
+    Parameters
+    ----------
+    data: pd.DataFrame/pd.Series
+        Input data
+    specs: list
+        Same specs as run_pipeline
+    Returns
+    ----------
+    list
+        Node keys in order of computation, e.g. ('tr', high, low, close)
+        where high, low and close are keys of input columns
+    """
+
+    specs = universe._read_specs(specs)
+    _names(specs)
+    graph, _ = _graph(data, specs)
+
+    return [key for key in graph if key[0] != 'output']
+
+@instrument.instrumented
+def run_pipeline(data, specs):
+    """
+    Compute a list of indicators on the same data, sharing the
+    intermediate series they have in common: true range (ADX and
+    ATR), close differences (RSI), returns (OBV and the performance
+    indicators), moving averages and MACD lines with the same
+    parameters. Results are equal to calling each function, up to
+    rounding. Panels, matrix mode, full output and other functions
+    are computed by calling the function itself.
+    Parameters
+    ----------
+    data: pd.DataFrame/pd.Series
+        Input data of the indicators
+    specs: list
+        (func, params) or (func, params, name) tuples, e.g.
+        (technical.RSI, {'ma': 14}). Names default to the function
+        name and must be unique.
+    Returns
+    ----------
+    dict
+        Result of each spec by name, in the order of specs.
+        Results may share memory, do not modify them in place.
+    """
+
+    instrument.stage('validation')
+    specs = universe._read_specs(specs)
+    names = _names(specs)
+    graph, outputs = _graph(data, specs)
+
+    instrument.stage('compute')
+    # Number of nodes still to compute that use each node
+    users = {key: 0 for key in graph}
+    for deps, _ in graph.values():
+        for dep in deps:
+            users[dep] += 1
+
+    values = {}
+    for key, (deps, func) in graph.items():
+        values[key] = func(*[values[dep] for dep in deps])
+        # Intermediate series are released once their last user is computed
+        for dep in deps:
+            users[dep] -= 1
+            if users[dep] == 0:
+                del values[dep]
+
+    return {name: values[key] for name, key in zip(names, outputs)}
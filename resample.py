@@ -0,0 +1,262 @@
+"""
+Implements OHLCV resampling to many timeframes at once. Base
+bars are sorted once and each timeframe is aggregated from the
+largest lower timeframe whose bins nest in its own, so a daily
+series is built from hourly bars instead of the whole base data.
+"""
+
+import numpy as np
+import pandas as pd
+
+import technical as ti
+import pipeline
+
+def _times(data):
+    """
+    Timestamps of data, from a DatetimeIndex or a time column.
+    """
+
+    if isinstance(data.index, pd.DatetimeIndex):
+        return data.index
+
+    cols = [col for col in data.columns if col in ti._TIME_COLS]
+    if len(cols) == 0:
+        raise IndexError('No time column. Use a DatetimeIndex or a Datetime column.')
+
+    return pd.DatetimeIndex(pd.to_datetime(data[cols[0]]), name=cols[0])
+
+def _widths(timeframes):
+    """
+    Width of each timeframe in nanoseconds, e.g. 5m, 15min, 1h or 1D.
+    """
+
+    timeframes = list(timeframes)
+    if len(timeframes) == 0:
+        raise ValueError('No timeframes to resample.')
+
+    widths = {}
+    for timeframe in timeframes:
+        if not isinstance(timeframe, str):
+            raise TypeError('Timeframes must be strings, e.g. 5m or 1h.')
+        try:
+            width = pd.Timedelta(timeframe).value
+        except ValueError:
+            raise ValueError('Invalid timeframe ' + timeframe + '.') from None
+        if width <= 0:
+            raise ValueError('Timeframes must be positive.')
+        widths[timeframe] = width
+
+    return widths
+
+def _first(values, starts, ends):
+    """
+    First valid value of each group of rows, NaN for groups without one.
+    """
+
+    if not np.isnan(values).any():
+        return values[starts]
+
+    # Position of the next valid row, looking back from the end
+    rows = np.where(np.isnan(values), values.shape[0], np.arange(values.shape[0]))
+    rows = np.minimum.accumulate(rows[::-1])[::-1]
+    first = rows[starts]
+    inside = first < ends
+    out = np.full(starts.shape, np.nan, dtype=values.dtype)
+    out[inside] = values[first[inside]]
+
+    return out
+
+def _last(values, starts, ends):
+    """
+    Last valid value of each group of rows, NaN for groups without one.
+    """
+
+    if not np.isnan(values).any():
+        return values[ends - 1]
+
+    # Position of the previous valid row
+    rows = np.where(np.isnan(values), -1, np.arange(values.shape[0]))
+    rows = np.maximum.accumulate(rows)
+    last = rows[ends - 1]
+    inside = last >= starts
+    out = np.full(starts.shape, np.nan, dtype=values.dtype)
+    out[inside] = values[last[inside]]
+
+    return out
+
+def _aggregate(bars, keys):
+    """
+    Aggregate consecutive bars with equal bin keys.
+    Parameters
+    ----------
+    bars: dict
+        Arrays of sorted bars: time (bin starts, as integers), the
+        optional wall clock time of the first bar and the open, high,
+        low, close and volume fields present
+    keys: np.ndarray
+        Bin start of each bar in the new timeframe, non decreasing
+    Returns
+    ----------
+    dict
+        Arrays with one value for each bin
+    """
+
+    n = keys.shape[0]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if n else \
+        np.zeros(0, dtype=np.int64)
+    ends = np.append(starts[1:], n)
+
+    out = {'time': keys[starts]}
+    if 'wall' in bars:
+        out['wall'] = bars['wall'][starts]
+    if 'Open' in bars:
+        out['Open'] = _first(bars['Open'], starts, ends)
+    if n:
+        # fmax and fmin skip missing values, as pandas max and min
+        out['High'] = np.fmax.reduceat(bars['High'], starts)
+        out['Low'] = np.fmin.reduceat(bars['Low'], starts)
+    else:
+        out['High'], out['Low'] = bars['High'][:0], bars['Low'][:0]
+    out['Close'] = _last(bars['Close'], starts, ends)
+    if 'Volume' in bars:
+        volume = bars['Volume']
+        if volume.dtype.kind == 'f':
+            # Missing volumes count as zero, as pandas sum
+            volume = np.where(np.isnan(volume), 0, volume)
+        out['Volume'] = np.add.reduceat(volume, starts) if n else volume[:0]
+
+    return out
+
+def resample_ohlcv(data, timeframes):
+    """
+    Resample OHLCV bars to many timeframes in one pass: open is the
+    first value of each bin, high the max, low the min, close the last
+    and volume the sum. Bins start at multiples of the timeframe from
+    midnight of the first day, as pandas resample, and bins without
+    bars are left out. With time zone aware timestamps, timeframes
+    shorter than a day are binned on elapsed time, so the repeated
+    hour of a daylight saving change gets its own bins, and timeframes
+    of whole days start at local midnight. Each timeframe is built
+    from the largest lower timeframe whose bins nest in its own.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Bars with High, Low and Close columns, Open and Volume are
+        optional. Timestamps are read from a DatetimeIndex or a
+        Datetime/Date column and do not need to be sorted.
+    timeframes: list
+        Timeframes as pandas Timedelta strings, e.g. 5m, 15m, 1h, 1D
+    Returns
+    ----------
+    dict
+        DataFrame of bars for each timeframe, indexed by bin start,
+        ready for technical.ADX, ATR, RSI and the other indicators
+    """
+
+    # Handles input data
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError('Input data is not a pandas DataFrame.')
+    if not set(['High', 'Low', 'Close']).issubset(data.columns):
+        raise IndexError('Missing necessary columns (High, Low or Close).')
+    times = _times(data)
+
+    # Handles parameter input
+    widths = _widths(timeframes)
+
+    # Intraday bins follow elapsed time (UTC) and daily bins the wall clock.
+    # Times are kept in the resolution of the input, converting them is a full pass.
+    # It is read from the dtype, DatetimeIndex.unit needs pandas 2.
+    tz = times.tz
+    utc = times.asi8
+    resolution = np.datetime_data(times.values.dtype)[0]
+    unit = pd.Timedelta(1, unit=resolution).value
+    if any(width % unit for width in widths.values()):
+        raise ValueError('Timeframes must be multiples of the timestamp resolution.')
+    widths = {timeframe: width // unit for timeframe, width in widths.items()}
+
+    # Sorted once, every timeframe keeps the order
+    order = None if (np.diff(utc) >= 0).all() else np.argsort(utc, kind='stable')
+    base = {'time': utc if order is None else utc[order]}
+    if tz is not None:
+        wall = times.tz_localize(None).asi8
+        base['wall'] = wall if order is None else wall[order]
+    for name in ['Open', 'High', 'Low', 'Close', 'Volume']:
+        if name in data.columns:
+            values = data[name].to_numpy()
+            if values.dtype.kind != 'f' and name != 'Volume':
+                values = values.astype(float)
+            base[name] = values if order is None else values[order]
+
+    day = pd.Timedelta(days=1).value // unit
+
+    def daily(width):
+        # Whole days of time zone aware bars start at local midnight
+        return tz is not None and width > 0 and width % day == 0
+
+    if base['time'].shape[0]:
+        first = 0 if order is None else order[0]
+        midnight = base.get('wall', base['time'])[0] // day * day
+        origin = midnight if tz is None else times[first].normalize().value // unit
+        # Changes of the UTC offset, an intraday bin stays inside a local day
+        # only when they are multiples of its width
+        offsets = np.unique(base['wall'] - base['time']) if tz is not None else np.zeros(1, dtype=np.int64)
+        shifts = offsets - offsets[0]
+    else:
+        midnight = origin = 0
+        shifts = np.zeros(1, dtype=np.int64)
+
+    # Computed timeframes by width, the base bars have width 0
+    levels = {0: base}
+    results = {}
+    for timeframe, width in sorted(widths.items(), key=lambda item: item[1]):
+        if width not in levels:
+            # Largest lower timeframe with nested bins
+            if daily(width):
+                source = max(w for w in levels if w == 0 or
+                             (width % w == 0 and (daily(w) or 'wall' in levels[w])))
+                bars = levels[source]
+                clock = bars['time'] if daily(source) else bars['wall']
+                keys = midnight + (clock - midnight) // width * width
+                levels[width] = _aggregate({name: values for name, values in bars.items()
+                                            if name != 'wall'}, keys)
+            else:
+                source = max(w for w in levels if w == 0 or (width % w == 0 and not daily(w)))
+                bars = levels[source]
+                keys = origin + (bars['time'] - origin) // width * width
+                levels[width] = _aggregate(bars, keys)
+                if (shifts % width).any():
+                    levels[width].pop('wall', None)
+        bars = levels[width]
+
+        index = pd.DatetimeIndex(bars['time'].view('datetime64[' + resolution + ']'), name=times.name)
+        if daily(width):
+            index = index.tz_localize(tz, ambiguous=True, nonexistent='shift_forward')
+        elif tz is not None:
+            index = index.tz_localize('UTC').tz_convert(tz)
+        results[timeframe] = pd.DataFrame({name: values for name, values in bars.items()
+                                           if name not in ('time', 'wall')}, index=index, copy=False)
+
+    # In the order of the timeframes given
+    return {timeframe: results[timeframe] for timeframe in widths}
+
+def run_timeframes(data, timeframes, specs):
+    """
+    Resample bars to many timeframes and compute the same
+    indicators on each one with pipeline.run_pipeline.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Bars, as in resample_ohlcv
+    timeframes: list
+        Timeframes, as in resample_ohlcv
+    specs: list
+        Indicator specs, as in pipeline.run_pipeline
+    Returns
+    ----------
+    dict
+        For each timeframe, the dict of results by indicator name
+    """
+
+    bars = resample_ohlcv(data, timeframes)
+
+    return {timeframe: pipeline.run_pipeline(df, specs) for timeframe, df in bars.items()}
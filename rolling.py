@@ -0,0 +1,352 @@
+"""
+Implements rolling window versions of the performance
+indicators. Each value is the indicator of the last window
+prices, the same result as calling performance.py on that
+slice, but computed for every window at once in O(n log w).
+"""
+
+import numpy as np
+import pandas as pd
+
+import performance as pi
+
+def _prices(data, matrix):
+    """
+    Close prices of a series or dataframe, a DataFrame with one
+    column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    if isinstance(data, pd.DataFrame) and (matrix or data.columns.nlevels == 2):
+        return pi._matrix_prices(data)
+
+    elif isinstance(data, pd.DataFrame):
+        # All possibles names for close column
+        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+        # Select them
+        cols = [col for col in data.columns if col in possible_cols]
+        # Check if there's only one close column
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        return data[cols[0]].astype(float)
+
+    elif isinstance(data, pd.Series):
+        return data.astype(float)
+
+    raise TypeError('Input data is not a pandas Series or DataFrame.')
+
+def _periods(frequency, only_business, data=None):
+    """
+    Number of periods in a year, as in performance.py.
+    """
+
+    return pi._periods(frequency, only_business, data)
+
+def _check_window(window, matrix):
+    if not isinstance(window, int):
+        raise TypeError('window parameter is not integer type.')
+    if window < 2:
+        raise ValueError('Window must have at least two prices.')
+    if not isinstance(matrix, bool):
+        raise TypeError('Value for matrix must be a boolean.')
+
+def _check_rate(rf_rate):
+    if not isinstance(rf_rate, float):
+        raise TypeError('rf_rate parameter is not float type.')
+    if rf_rate > 1 or rf_rate < 0:
+        raise ValueError('rf_rate must positive and equal or less than 1.')
+
+def _output(values, prices, name):
+    """
+    Series named after the indicator, or a DataFrame with
+    one column for each asset in matrix mode.
+    """
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(values, index=prices.index, columns=prices.columns, copy=False)
+
+    return pd.Series(values, index=prices.index, name=name, copy=False)
+
+def _cagr(prices, window, periods):
+    """
+    Rolling CAGR as an array, last price over first price of each window.
+    """
+
+    out = np.full(prices.shape, np.nan)
+    if window <= prices.shape[0]:
+        ratio = prices[window-1:] / prices[:prices.shape[0]-window+1]
+        with np.errstate(invalid='ignore'):
+            out[window-1:] = ratio ** (periods / (window - 1)) - 1
+
+    return out
+
+def _volatility(prices, window, periods):
+    """
+    Rolling volatility as an array, from the window - 1 returns of each window.
+    """
+
+    returns = prices.pct_change()
+    # pandas rolling variance keeps running sums, O(n) for any window
+    std = returns.rolling(window - 1).std().to_numpy()
+
+    return std * np.sqrt(periods)
+
+def _min_ratio(values, window):
+    """
+    Smallest values[k] / values[j] with j <= k inside each window,
+    along the first axis. Windows are split in blocks of 2^b rows,
+    one for each bit of window, and the (max, min, ratio) of blocks
+    are built by doubling, so all windows cost O(n log w).
+    Returns
+    ----------
+    np.ndarray
+        One value for each window, for the windows ending at rows window - 1 and after
+    """
+
+    n = values.shape[0]
+    count = n - window + 1
+    # Block statistics by start row, blocks of one row
+    high, low = values, values
+    ratio = np.ones(values.shape)
+
+    acc = None
+    offset = 0
+    size = 1
+    remaining = window
+    while True:
+        if remaining & 1:
+            block = (high[offset:offset+count], low[offset:offset+count],
+                     ratio[offset:offset+count])
+            if acc is None:
+                acc = block
+            else:
+                # Pairs inside each part, and first part peak to second part low
+                acc = (np.maximum(acc[0], block[0]), np.minimum(acc[1], block[1]),
+                       np.fmin(np.minimum(acc[2], block[2]), block[1] / acc[0]))
+            offset += size
+        remaining >>= 1
+        if remaining == 0:
+            break
+        # Blocks twice as long from two consecutive blocks
+        m = high.shape[0] - size
+        ratio = np.minimum(np.minimum(ratio[:m], ratio[size:size+m]), low[size:size+m] / high[:m])
+        high = np.maximum(high[:m], high[size:size+m])
+        low = np.minimum(low[:m], low[size:size+m])
+        size *= 2
+
+    return acc[2]
+
+def _max_dd(prices, window):
+    """
+    Rolling max drawdown as an array. As performance.max_dd,
+    drawdowns are measured from the second price of each window.
+    """
+
+    out = np.full(prices.shape, np.nan)
+    if window <= prices.shape[0]:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[window-1:] = 1 - _min_ratio(prices[1:], window - 1)
+
+    return out
+
+def CAGR(data, window, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate rolling cummulative annual growth rate (CAGR).
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    window: int
+        Number of prices in each window, e.g. 252 for a year of daily prices
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        CAGR of the window ending at each row, NaN for the first window - 1 rows.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = _prices(data, matrix)
+
+    # Handles parameter input
+    _check_window(window, matrix)
+    periods = _periods(frequency, only_business, data)
+
+    return _output(_cagr(series.to_numpy(), window, periods), series, 'cagr')
+
+def volatility(data, window, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate rolling volatility (standard deviation annualized)
+    for returns on a given asset.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible
+        to input a dataframe, must contain a close column.
+    window: int
+        Number of prices in each window, e.g. 252 for a year of daily prices
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Volatility of the window ending at each row, NaN for the first window - 1 rows.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = _prices(data, matrix)
+
+    # Handles parameter input
+    _check_window(window, matrix)
+    periods = _periods(frequency, only_business, data)
+
+    return _output(_volatility(series, window, periods), series, 'volatility')
+
+def sharpe(data, window, rf_rate, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate rolling sharpe ratio.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible
+        to input a dataframe, must contain a close column.
+    window: int
+        Number of prices in each window, e.g. 252 for a year of daily prices
+    rf_rate: float
+        Risk free rate.
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Sharpe ratio of the window ending at each row, NaN for the first
+        window - 1 rows and for windows with zero volatility.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = _prices(data, matrix)
+
+    # Handles parameter input
+    _check_window(window, matrix)
+    _check_rate(rf_rate)
+    periods = _periods(frequency, only_business, data)
+
+    vol = _volatility(series, window, periods)
+    # Zero volatility has no sharpe ratio
+    vol[vol == 0] = np.nan
+    sharpe_ratio = _cagr(series.to_numpy(), window, periods)
+    sharpe_ratio -= rf_rate
+    sharpe_ratio /= vol
+
+    return _output(sharpe_ratio, series, 'sharpe')
+
+def max_dd(data, window, matrix=False):
+    """
+    Calculate rolling maximum drawdown.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    window: int
+        Number of prices in each window, e.g. 252 for a year of daily prices
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Max drawdown of the window ending at each row, NaN for the first window - 1 rows.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = _prices(data, matrix)
+
+    # Handles parameter input
+    _check_window(window, matrix)
+
+    return _output(_max_dd(series.to_numpy(), window), series, 'max_dd')
+
+def calmar(data, window, frequency='Y', only_business=True, matrix=False):
+    """
+    Calculate rolling calmar ratio.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series contaning close prices for an asset. Also possible to input a dataframe,
+        must contain a close column.
+    window: int
+        Number of prices in each window, e.g. 252 for a year of daily prices
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a SESSION_HOURS session
+        infer to read it from a DatetimeIndex or a time column
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    matrix: bool
+        Each column of data is an asset. Panels with MultiIndex
+        columns (symbol, field) are always computed this way.
+    Returns
+    ----------
+    pd.Series/pd.DataFrame
+        Calmar ratio of the window ending at each row, NaN for the first window - 1 rows.
+        One column for each asset in matrix mode.
+    """
+
+    # Handles input data
+    series = _prices(data, matrix)
+
+    # Handles parameter input
+    _check_window(window, matrix)
+    periods = _periods(frequency, only_business, data)
+
+    values = series.to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar_ratio = _cagr(values, window, periods) / _max_dd(values, window)
+
+    return _output(calmar_ratio, series, 'calmar')
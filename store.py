@@ -0,0 +1,121 @@
+"""
+Implements a small columnar store for OHLC data on disk.
+A store is a directory with one .npy file per column, an
+index.npy file with the timestamps and a meta.json file with
+column names. Loading maps the files in memory, so opening a
+store costs almost nothing and only touched pages are read.
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+import technical as ti
+
+# File with the store description
+_META_FILE = 'meta.json'
+_INDEX_FILE = 'index.npy'
+
+def to_store(data, path):
+    """
+    Write OHLC data as a columnar store.
+    Parameters
+    ----------
+    data: pd.DataFrame/str
+        DataFrame or path of a csv file. A Datetime or Date
+        column, if any, becomes the timestamp index, otherwise
+        the DataFrame index is used. Non numeric columns are skipped.
+    path: str
+        Directory of the store, created if needed
+    Returns
+    ----------
+    str
+        Path of the store
+    """
+
+    # Handles input data
+    if isinstance(data, (str, os.PathLike)):
+        data = pd.read_csv(data)
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError('Input data is not a pandas DataFrame or a csv path.')
+
+    time_cols = [col for col in data.columns if col in ti._TIME_COLS]
+    if time_cols:
+        data = data.set_index(time_cols[0])
+
+    # Timestamps are kept as int64 nanoseconds since epoch in UTC
+    index = data.index
+    tz = None
+    if not pd.api.types.is_numeric_dtype(index.dtype):
+        index = pd.DatetimeIndex(pd.to_datetime(index))
+        tz = None if index.tz is None else str(index.tz)
+        if tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        values = index.to_numpy().astype('datetime64[ns]').view(np.int64)
+        kind = 'datetime'
+    else:
+        values = index.to_numpy()
+        kind = 'values'
+
+    columns = [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col])]
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, _INDEX_FILE), values)
+    # Files are named by position, column names may not be valid file names
+    for i, col in enumerate(columns):
+        np.save(os.path.join(path, f'col{i}.npy'), data[col].to_numpy())
+
+    meta = {
+        'columns': [str(col) for col in columns],
+        'index': {'name': data.index.name, 'kind': kind, 'tz': tz},
+        'rows': int(data.shape[0]),
+    }
+    with open(os.path.join(path, _META_FILE), 'w') as file:
+        json.dump(meta, file)
+
+    return path
+
+def load_store(path, columns=None):
+    """
+    Open a columnar store without reading it.
+    Parameters
+    ----------
+    path: str
+        Directory of the store
+    columns: list
+        Columns to load, defaults to all of them
+    Returns
+    ----------
+    pd.DataFrame
+        Columns backed by read-only np.memmap arrays, the
+        indicators read them without making copies
+    """
+
+    meta_path = os.path.join(path, _META_FILE)
+    if not os.path.isfile(meta_path):
+        raise ValueError('Path is not a columnar store.')
+    with open(meta_path) as file:
+        meta = json.load(file)
+
+    if columns is None:
+        columns = meta['columns']
+    elif not set(columns).issubset(meta['columns']):
+        raise IndexError('Missing necessary columns (' + ', '.join(map(str, columns)) + ').')
+
+    # Plain ndarray views, the memory map stays as their base
+    arrays = {col: np.asarray(np.load(os.path.join(path, f'col{meta["columns"].index(col)}.npy'),
+                                      mmap_mode='r'))
+              for col in columns}
+
+    index = np.load(os.path.join(path, _INDEX_FILE), mmap_mode='r')
+    if meta['index']['kind'] == 'datetime':
+        index = pd.DatetimeIndex(index.view('datetime64[ns]'), name=meta['index']['name'])
+        if meta['index']['tz'] is not None:
+            index = index.tz_localize('UTC').tz_convert(meta['index']['tz'])
+    else:
+        index = pd.Index(index, name=meta['index']['name'])
+
+    # One block per column, so columns are not copied into a 2-D block
+    return pd.DataFrame(arrays, index=index, copy=False)
@@ -0,0 +1,651 @@
+"""
+Implements incremental versions of the technical
+indicators, updated one bar at a time, and an online
+tracker for the performance indicators.
+"""
+
+import math
+import numbers
+from collections import deque
+
+import numpy as np
+
+import performance as pi
+import technical as ti
+
+# All possibles names for close column
+_CLOSE_COLS = ['Close', 'close', 'Adj Close', 'adj close']
+
+def _close(bar):
+    """
+    Close price of a bar, which can be a number or a mapping
+    (dict, pd.Series) with a close or adjusted close key.
+    """
+
+    if isinstance(bar, numbers.Real):
+        return float(bar)
+
+    try:
+        cols = [col for col in bar.keys() if col in _CLOSE_COLS]
+    except AttributeError:
+        raise TypeError('Bar is not a number or a mapping with a close price.')
+
+    # Check if there's only one close column
+    if len(cols) > 1:
+        raise KeyError('Ambiguous number of possible close prices column.')
+    elif len(cols) == 0:
+        raise IndexError('No close column. Pass desired value as a number.')
+
+    return float(bar[cols[0]])
+
+def _fields(bar, names):
+    """
+    Values of the given keys of a bar as floats.
+    """
+
+    try:
+        if not set(names).issubset(bar.keys()):
+            raise IndexError('Missing necessary columns (' + ', '.join(names) + ').')
+    except AttributeError:
+        raise TypeError('Bar is not a mapping (dict, pd.Series).')
+
+    return [float(bar[name]) for name in names]
+
+def _ratio(num, den):
+    """
+    Division with pandas semantics, x / 0 is inf and 0 / 0 is NaN.
+    """
+
+    if den == 0:
+        if num == 0 or math.isnan(num):
+            return math.nan
+        return math.copysign(math.inf, num)
+
+    return num / den
+
+def _check_period(ma):
+    if not isinstance(ma, int):
+        raise TypeError('ma parameter is not integer type.')
+    if ma < 1:
+        raise ValueError('ma parameter must be positive.')
+
+class _RollingWindow:
+    """
+    Last n values with their running mean and variance.
+    Variance is kept with Welford updates when values enter and
+    leave the window. Any NaN inside the window makes the
+    statistics NaN, as pandas rolling does.
+    Updates are taken from a pivot near the values and every n
+    values the statistics are summed again from the window, so
+    rounding does not add up at large price levels.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.values = deque()
+        self.nans = 0
+        self.count = 0
+        self.pushes = 0
+        self.pivot = 0.0
+        self.mean_ = 0.0
+        self.m2 = 0.0
+
+    def _add(self, x):
+        x -= self.pivot
+        self.count += 1
+        delta = x - self.mean_
+        self.mean_ += delta / self.count
+        self.m2 += delta * (x - self.mean_)
+
+    def _remove(self, x):
+        x -= self.pivot
+        self.count -= 1
+        if self.count == 0:
+            self.mean_ = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean_
+        self.mean_ -= delta / self.count
+        self.m2 -= delta * (x - self.mean_)
+
+    def _resync(self):
+        # Two pass statistics of the window, from the last value
+        self.pivot = self.values[-1]
+        self.mean_ = math.fsum(x - self.pivot for x in self.values) / self.n
+        self.m2 = math.fsum((x - self.pivot - self.mean_) ** 2 for x in self.values)
+
+    def push(self, x):
+        if len(self.values) == self.n:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nans -= 1
+            else:
+                self._remove(old)
+
+        self.values.append(x)
+        if math.isnan(x):
+            self.nans += 1
+        else:
+            self._add(x)
+
+        self.pushes += 1
+        if self.pushes % self.n == 0 and self.full:
+            self._resync()
+
+    @property
+    def full(self):
+        return len(self.values) == self.n and self.nans == 0
+
+    def mean(self):
+        return self.pivot + self.mean_ if self.full else math.nan
+
+    def std(self):
+        if not self.full or self.n < 2:
+            return math.nan
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1))
+
+class _EWM:
+    """
+    Exponentially weighted mean with pandas adjust=True semantics,
+    y = sum(w^i * x[t-i]) / sum(w^i), with w = 1 - 2 / (span + 1).
+    NaN values only decay the weights, as with ignore_na=False.
+    """
+
+    def __init__(self, span):
+        self.decay = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+
+    def push(self, x):
+        self.num *= self.decay
+        self.den *= self.decay
+        if not math.isnan(x):
+            self.num += x
+            self.den += 1.0
+        return self.value()
+
+    def value(self):
+        return self.num / self.den if self.den > 0 else math.nan
+
+class ATRStream:
+    """
+    Average true range (ATR) updated one bar at a time.
+    Matches technical.ATR for the same bars.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.prev_close = math.nan
+        self.window = _RollingWindow(ma)
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: dict/pd.Series
+            Must have the following keys: High, Low, Close.
+        Returns
+        ----------
+        dict
+            With keys atr and tr
+        """
+
+        high, low, close = _fields(bar, ['High', 'Low', 'Close'])
+        # True range skips ranges against a missing close, as max(axis=1)
+        ranges = [abs(high - low), abs(high - self.prev_close), abs(low - self.prev_close)]
+        ranges = [r for r in ranges if not math.isnan(r)]
+        tr = max(ranges) if ranges else math.nan
+        self.prev_close = close
+
+        self.window.push(tr)
+
+        return {'atr': self.window.mean(), 'tr': tr}
+
+class ADXStream:
+    """
+    Average directional index (ADX) updated one bar at a time.
+    Matches technical.ADX for the same bars.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.count = 0
+        self.prev = None
+        # Rolling sums, accumulated until index ma and smoothed after it
+        self.roll_tr = 0.0
+        self.roll_dmp = 0.0
+        self.roll_dmn = 0.0
+        # Sum of dx until index 2*ma-1 and adx after it
+        self.adx = 0.0
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: dict/pd.Series
+            Must have the following keys: High, Low, Close.
+        Returns
+        ----------
+        dict
+            With keys adx and dx
+        """
+
+        high, low, close = _fields(bar, ['High', 'Low', 'Close'])
+        i = self.count
+        self.count += 1
+
+        if self.prev is None:
+            self.prev = (high, low, close)
+            return {'adx': math.nan, 'dx': math.nan}
+
+        prev_high, prev_low, prev_close = self.prev
+        self.prev = (high, low, close)
+
+        tr = max(abs(high - low), abs(high - prev_close), abs(low - prev_close))
+        dm_pos = max(high - prev_high, 0.0)
+        dm_neg = max(prev_low - low, 0.0)
+
+        ma = self.ma
+        if i <= ma:
+            # First value is the sum of the last ma observations
+            self.roll_tr += tr
+            self.roll_dmp += dm_pos
+            self.roll_dmn += dm_neg
+            if i < ma:
+                return {'adx': math.nan, 'dx': math.nan}
+        else:
+            self.roll_tr = self.roll_tr - (self.roll_tr / ma) + tr
+            self.roll_dmp = self.roll_dmp - (self.roll_dmp / ma) + dm_pos
+            self.roll_dmn = self.roll_dmn - (self.roll_dmn / ma) + dm_neg
+
+        di_pos = 100 * _ratio(self.roll_dmp, self.roll_tr)
+        di_neg = 100 * _ratio(self.roll_dmn, self.roll_tr)
+        dx = _ratio(abs(di_pos - di_neg), di_pos + di_neg) * 100
+
+        if i < 2*ma - 1:
+            self.adx += dx
+            return {'adx': math.nan, 'dx': dx}
+        elif i == 2*ma - 1:
+            # First value is the mean of dx
+            self.adx = (self.adx + dx) / ma
+        else:
+            self.adx = (self.adx * (ma - 1) + dx) / ma
+
+        return {'adx': self.adx, 'dx': dx}
+
+class RSIStream:
+    """
+    RSI indicator updated one bar at a time.
+    Matches technical.RSI for the same bars.
+    Parameters
+    ----------
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, ma):
+        _check_period(ma)
+        self.ma = ma
+        self.count = 0
+        self.prev_close = math.nan
+        self.gains = _RollingWindow(ma)
+        self.losses = _RollingWindow(ma)
+        self.av_gain = math.nan
+        self.av_loss = math.nan
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: float/dict/pd.Series
+            Close price or a mapping with a close column
+            (Close, close, Adj Close or adj close).
+        Returns
+        ----------
+        dict
+            With key rsi
+        """
+
+        close = _close(bar)
+        i = self.count
+        self.count += 1
+
+        diff = close - self.prev_close
+        self.prev_close = close
+        self.gains.push(max(diff, 0.0) if not math.isnan(diff) else diff)
+        self.losses.push(max(-diff, 0.0) if not math.isnan(diff) else diff)
+
+        ma = self.ma
+        if i < ma:
+            return {'rsi': math.nan}
+        elif i == ma:
+            # Seeded with the rolling mean at index ma
+            self.av_gain = self.gains.mean()
+            self.av_loss = self.losses.mean()
+        else:
+            # The recursive rule is applied over the rolling means
+            self.av_gain = (self.av_gain * (ma - 1) + self.gains.mean()) / ma
+            self.av_loss = (self.av_loss * (ma - 1) + self.losses.mean()) / ma
+
+        rsi = 100 - _ratio(100, 1 + _ratio(self.av_gain, self.av_loss))
+
+        return {'rsi': rsi}
+
+class MACDStream:
+    """
+    Moving average convergence divergence (MACD)
+    updated one bar at a time.
+    Matches technical.MACD for the same bars.
+    Parameters
+    ----------
+    slow: int
+        How many observations the slow line will look back
+    fast: int
+        How many obversations the fast line will look back
+    ma: int
+        How many obversations will be used to calculate moving average
+    """
+
+    def __init__(self, slow, fast, ma):
+        for parameter in [slow, fast, ma]:
+            if not isinstance(parameter, int):
+                raise TypeError('One or more parameters are not integer type.')
+        if slow <= fast:
+            raise ValueError('Slow line must have a value bigger than fast line')
+
+        self.slow = _EWM(slow)
+        self.fast = _EWM(fast)
+        self.signal = _EWM(ma)
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: float/dict/pd.Series
+            Close price or a mapping with a close column
+            (Close, close, Adj Close or adj close).
+        Returns
+        ----------
+        dict
+            With keys macd_line and macd_signal
+        """
+
+        close = _close(bar)
+        macd_line = abs(self.slow.push(close) - self.fast.push(close))
+        macd_signal = self.signal.push(macd_line)
+
+        return {'macd_line': macd_line, 'macd_signal': macd_signal}
+
+class BollingerStream:
+    """
+    Bollinger bands updated one bar at a time.
+    Matches technical.bollband for the same bars.
+    Parameters
+    ----------
+    ma: int
+        Moving average parameter
+    mult: int/float
+        Bands are mult standard deviations away from the moving average
+    """
+
+    def __init__(self, ma, mult=2):
+        _check_period(ma)
+        ti._check_mult(mult)
+        self.mult = mult
+        self.closes = _RollingWindow(ma)
+        self.averages = _RollingWindow(ma)
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: float/dict/pd.Series
+            Close price or a mapping with a close column
+            (Close, close, Adj Close or adj close).
+        Returns
+        ----------
+        dict
+            With keys bollband_up and bollband_low
+        """
+
+        self.closes.push(_close(bar))
+        ma = self.closes.mean()
+        self.averages.push(ma)
+        std = self.mult * self.averages.std()
+
+        return {'bollband_up': ma + std, 'bollband_low': ma - std}
+
+class OBVStream:
+    """
+    On balance volume (OBV) updated one bar at a time.
+    Matches technical.OBV for the same bars.
+    """
+
+    def __init__(self):
+        self.prev_close = math.nan
+        self.obv = 0.0
+
+    def update(self, bar):
+        """
+        Add a new bar.
+        Parameters
+        ----------
+        bar: dict/pd.Series
+            Must have the following keys: Close and Volume.
+        Returns
+        ----------
+        dict
+            With key obv
+        """
+
+        close, volume = _fields(bar, ['Close', 'Volume'])
+        returns = _ratio(close, self.prev_close) - 1
+        self.prev_close = close
+
+        # Missing volumes stay missing without breaking the running sum
+        if math.isnan(volume):
+            return {'obv': math.nan}
+
+        # 1 for positive returns, -1 for negative and 0 otherwise
+        if returns > 0:
+            self.obv += volume
+        elif returns < 0:
+            self.obv -= volume
+
+        return {'obv': self.obv}
+
+class PerformanceTracker:
+    """
+    Online CAGR, volatility, sharpe ratio, max drawdown and calmar
+    ratio for a price series received one price or one chunk at a time.
+    Only running statistics are kept: first and last price, count,
+    Welford mean and variance of returns, running peak and drawdowns.
+    Matches performance.py for the same prices.
+    Parameters
+    ----------
+    frequency: string/float
+        D for daily prices
+        W for weekly prices
+        M for monthly prices
+        Y for yearly prices
+        1m, 5m, 15m, 30m or 1h for intraday bars of a performance.SESSION_HOURS session
+        A number is used as the periods in a year.
+    only_business: bool
+        When using daily or intraday data count only business days.
+    """
+
+    def __init__(self, frequency='Y', only_business=True):
+        # Handles parameter input
+        if frequency == 'infer':
+            raise ValueError('Data frequency can not be inferred from streamed prices.')
+        self.periods = pi._periods(frequency, only_business)
+
+        self.count = 0
+        self.first = math.nan
+        self.last = math.nan
+        # Welford statistics of returns
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Drawdowns are measured from the second price on,
+        # as performance.max_dd does
+        self.peak = math.nan
+        self.drawdown = math.nan
+        self.max_drawdown = math.nan
+
+    def update(self, prices):
+        """
+        Add new prices.
+        Parameters
+        ----------
+        prices: float/array-like/pd.Series
+            A single price or a chunk of prices in time order.
+        """
+
+        if isinstance(prices, numbers.Real):
+            self._update_one(float(prices))
+        else:
+            self._update_chunk(np.asarray(prices, dtype=float).ravel())
+
+    def _update_one(self, price):
+        if self.count == 0:
+            self.first = price
+        else:
+            ret = price / self.last - 1
+            n = self.count
+            delta = ret - self.mean
+            self.mean += delta / n
+            self.m2 += delta * (ret - self.mean)
+
+            if math.isnan(self.peak) or price > self.peak:
+                self.peak = price
+            self.drawdown = (self.peak - price) / self.peak
+            if math.isnan(self.max_drawdown) or self.drawdown > self.max_drawdown:
+                self.max_drawdown = self.drawdown
+
+        self.last = price
+        self.count += 1
+
+    def _update_chunk(self, prices):
+        if prices.shape[0] == 0:
+            return
+        if self.count == 0:
+            self._update_one(prices[0])
+            prices = prices[1:]
+            if prices.shape[0] == 0:
+                return
+
+        # Merge Welford statistics of the chunk returns
+        returns = prices / np.concatenate(([self.last], prices[:-1])) - 1
+        n_a = self.count - 1
+        n_b = returns.shape[0]
+        mean_b = returns.mean()
+        m2_b = ((returns - mean_b) ** 2).sum()
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / (n_a + n_b)
+        self.m2 += m2_b + delta ** 2 * n_a * n_b / (n_a + n_b)
+
+        # Running peak carried from previous chunks
+        peaks = np.maximum.accumulate(prices)
+        if not math.isnan(self.peak):
+            peaks = np.maximum(peaks, self.peak)
+        drawdowns = (peaks - prices) / peaks
+        self.peak = float(peaks[-1])
+        self.drawdown = float(drawdowns[-1])
+        self.max_drawdown = float(np.fmax(drawdowns.max(), self.max_drawdown))
+
+        self.last = float(prices[-1])
+        self.count += prices.shape[0]
+
+    def cagr(self):
+        """
+        Cummulative annual growth rate (CAGR) of prices seen so far.
+        """
+
+        if self.count < 2:
+            return math.nan
+
+        n = (self.count - 1) / self.periods
+
+        return (self.last / self.first) ** (1 / n) - 1
+
+    def volatility(self):
+        """
+        Volatility (standard deviation annualized) of returns seen so far.
+        """
+
+        if self.count < 3:
+            return math.nan
+
+        return math.sqrt(self.m2 / (self.count - 2)) * math.sqrt(self.periods)
+
+    def sharpe(self, rf_rate):
+        """
+        Sharpe ratio of prices seen so far.
+        Parameters
+        ----------
+        rf_rate: float
+            Risk free rate.
+        """
+
+        if not isinstance(rf_rate, float):
+            raise TypeError('rf_rate parameter is not float type.')
+        if rf_rate > 1 or rf_rate < 0:
+            raise ValueError('rf_rate must positive and equal or less than 1.')
+
+        vol = self.volatility()
+        # Handles division by zero
+        if vol == 0:
+            raise ZeroDivisionError('Volatility cannot be equal to zero.')
+
+        return (self.cagr() - rf_rate) / vol
+
+    def max_dd(self):
+        """
+        Maximum drawdown of prices seen so far.
+        """
+
+        return self.max_drawdown
+
+    def calmar(self):
+        """
+        Calmar ratio of prices seen so far.
+        """
+
+        return _ratio(self.cagr(), self.max_dd())
+
+    def report(self, rf_rate):
+        """
+        All indicators at once, as performance.performance_report.
+        Sharpe ratio is NaN when volatility is equal to zero.
+        Parameters
+        ----------
+        rf_rate: float
+            Risk free rate.
+        Returns
+        ----------
+        dict
+            With keys cagr, volatility, sharpe, max_dd and calmar
+        """
+
+        try:
+            sharpe = self.sharpe(rf_rate)
+        except ZeroDivisionError:
+            sharpe = math.nan
+
+        return {'cagr': self.cagr(), 'volatility': self.volatility(), 'sharpe': sharpe,
+                'max_dd': self.max_dd(), 'calmar': self.calmar()}
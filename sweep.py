@@ -0,0 +1,317 @@
+"""
+Implements parameter sweeps of the technical indicators.
+Each function computes an indicator for many parameter values
+at once, sharing the work that does not depend on them.
+"""
+
+import numpy as np
+import pandas as pd
+
+import backend
+import technical as ti
+
+def _close(data):
+    """
+    Close prices of a series or dataframe as a float array.
+    """
+
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    if isinstance(data, pd.DataFrame):
+        # Select them
+        cols = [col for col in data.columns if col in possible_cols]
+        # Check if there's only one close column
+        if len(cols) > 1:
+            raise KeyError('Ambiguous number of possible close prices column.')
+        elif len(cols) == 0:
+            raise IndexError('No close column. Pass desired column as a pd.Series.')
+        return ti._column(data, cols[0])
+
+    elif isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)
+
+    raise TypeError('Input data is not a pandas Series or DataFrame.')
+
+def _windows(mas):
+    """
+    Check a list of window sizes.
+    """
+
+    mas = list(mas)
+    if len(mas) == 0:
+        raise ValueError('No parameter values to sweep.')
+    for ma in mas:
+        if not isinstance(ma, int):
+            raise TypeError('One or more parameters are not integer type.')
+        if ma < 1:
+            raise ValueError('Window sizes must be positive.')
+
+    return mas
+
+def _rolling_means(values, mas):
+    """
+    Rolling means of a 1-D array for many window sizes, taken
+    from a single cumulative sum. A window with a missing
+    value is NaN, the same as pandas rolling(ma).mean().
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D array with input values
+    mas: list
+        Window sizes
+    Returns
+    ----------
+    np.ndarray
+        2-D array (observations x window sizes)
+    """
+
+    n = values.shape[0]
+    missing = np.isnan(values)
+    # Values are centered on their mean, so the cumulative sum
+    # stays small and differences keep their precision
+    center = values[~missing].mean() if (~missing).any() else 0.0
+    cumsum = np.zeros(n + 1)
+    np.cumsum(np.where(missing, 0.0, values - center), out=cumsum[1:])
+    counts = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(missing, out=counts[1:])
+
+    out = _buffer(n, len(mas))
+    out[...] = np.nan
+    for j, ma in enumerate(mas):
+        if ma > n:
+            continue
+        col = out[ma-1:, j]
+        np.subtract(cumsum[ma:], cumsum[:-ma], out=col)
+        col /= ma
+        col += center
+        col[counts[ma:] != counts[:-ma]] = np.nan
+
+    return out
+
+def _buffer(rows, count):
+    """
+    Empty 2-D array (rows x count) in column major order,
+    so each parameter value has a contiguous column.
+    """
+
+    return np.empty((count, rows)).T
+
+def _output(values, index, params, fields=None):
+    """
+    DataFrame with one column for each parameter value.
+    Parameters
+    ----------
+    values: np.ndarray
+        2-D array (observations x parameter values), for many
+        series their blocks are next to each other
+    index: pd.Index
+        Index of the input data
+    params: pd.Index
+        Parameter values, one for each column of a block
+    fields: list
+        Names of the series, None for a single series
+    Returns
+    ----------
+    pd.DataFrame
+        Columns are the parameter values for a single series,
+        (series, parameter values) for many
+    """
+
+    if fields is not None:
+        params = pd.MultiIndex.from_tuples([(name,) + (key if isinstance(key, tuple) else (key,))
+                                            for name in fields for key in params],
+                                           names=[None] + list(params.names))
+
+    return pd.DataFrame(values, index=index, columns=params, copy=False)
+
+def ATR(data, mas):
+    """
+    Calculate average true range (ATR) for many window sizes.
+    The true range is computed once and every rolling mean
+    comes from the same cumulative sum.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        DataFrame containing OHLC data. Columns must have the
+        following labels: High, Low, Close. Open column is not mandatory.
+    mas: list
+        Window sizes, e.g. range(2, 201)
+    Returns
+    ----------
+    pd.DataFrame
+        atr values with one column for each window size
+    """
+
+    # Handles input data
+    if isinstance(data, pd.DataFrame):
+        if not set(['High', 'Low', 'Close']).issubset(data.columns):
+            raise IndexError('Missing necessary columns (High, Low or Close).')
+        high = ti._column(data, 'High')
+        low = ti._column(data, 'Low')
+        close = ti._column(data, 'Close')
+
+    else:
+        raise TypeError('Input data is not a pandas DataFrame.')
+
+    # Handles parameter input
+    mas = _windows(mas)
+
+    tr = ti._true_range(high, low, close)
+    atr = _rolling_means(tr, mas)
+
+    return _output(atr, data.index, pd.Index(mas, name='ma'))
+
+def RSI(data, mas):
+    """
+    Calculate RSI indicator for many window sizes.
+    Gains and losses are computed once and their rolling
+    means come from the same cumulative sums.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series or dataframe to calculate RSI.
+        If df is passed, it must have a close or
+        adjusted close column with the following labels:
+           - Close
+           - close
+           - Adj Close
+           - adj close
+    mas: list
+        Window sizes, e.g. range(2, 201)
+    Returns
+    ----------
+    pd.DataFrame
+        rsi values with one column for each window size
+    """
+
+    # Handles input data
+    series = _close(data)
+
+    # Handles parameter input
+    mas = _windows(mas)
+
+    # Compute gains and losses, negative values are substituted for zero
+    gain = ti._diff(series)
+    loss = np.negative(gain)
+    np.maximum(gain, 0, out=gain)
+    np.maximum(loss, 0, out=loss)
+    gain[0] = loss[0] = np.nan
+
+    av_gain = _rolling_means(gain, mas)
+    av_loss = _rolling_means(loss, mas)
+    # Same recursive rule as technical.RSI, one window size at a time
+    for j, ma in enumerate(mas):
+        ti._rsi_average(av_gain[:, j], ma, ma, out=av_gain[:, j])
+        ti._rsi_average(av_loss[:, j], ma, ma, out=av_loss[:, j])
+
+    # Compute indicator
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.divide(av_gain, av_loss, out=av_gain)
+        rsi += 1
+        np.divide(100, rsi, out=rsi)
+        np.subtract(100, rsi, out=rsi)
+
+    return _output(rsi, data.index, pd.Index(mas, name='ma'))
+
+def bollband(data, mas, mult=2):
+    '''
+    Calculate bollinger bands for many window sizes.
+    Each window size takes one pass of backend.rolling_mean_std.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series or dataframe to calculate bands.
+        If df is passed, it must have a close or
+        adjusted close column with the following labels:
+           - Close
+           - close
+           - Adj Close
+           - adj close
+    mas: list
+        Window sizes, e.g. range(2, 201)
+    mult: int/float
+        Bands are mult standard deviations away from the moving average
+    Returns
+    ----------
+    pd.DataFrame
+        With columns (bollband_up, ma) and (bollband_low, ma)
+    '''
+
+    # Handles input data
+    series = _close(data)
+
+    # Handles parameter input
+    mas = _windows(mas)
+    ti._check_mult(mult)
+
+    bands = _buffer(series.shape[0], 2 * len(mas))
+    up, low = bands[:, :len(mas)], bands[:, len(mas):]
+    for j, ma in enumerate(mas):
+        # Same compensated pass as technical.bollband
+        ma_values, std = backend.rolling_mean_std(series, ma)
+        std = mult * std
+        np.add(ma_values, std, out=up[:, j])
+        np.subtract(ma_values, std, out=low[:, j])
+
+    return _output(bands, data.index, pd.Index(mas, name='ma'), ['bollband_up', 'bollband_low'])
+
+def MACD(data, grid):
+    """
+    Calculate moving average convergence divergence (MACD)
+    for many (slow, fast, ma) parameter sets. Each distinct
+    span is smoothed once and shared by every set using it.
+    Parameters
+    ----------
+    data: pd.Series/pd.DataFrame
+        Series or dataframe to calculate MACD.
+        If df is passed, it must have a close or
+        adjusted close column with the following labels:
+           - Close
+           - close
+           - Adj Close
+           - adj close
+    grid: list
+        (slow, fast, ma) tuples, e.g. itertools.product(slows, fasts, mas)
+    Returns
+    ----------
+    pd.DataFrame
+        With columns (macd_line, slow, fast, ma) and (macd_signal, slow, fast, ma)
+    """
+
+    # Handles input data
+    series = _close(data)
+
+    # Handles parameters inputs
+    grid = [tuple(params) for params in grid]
+    if len(grid) == 0:
+        raise ValueError('No parameter values to sweep.')
+    for params in grid:
+        if len(params) != 3:
+            raise ValueError('Parameter sets must be (slow, fast, ma) tuples.')
+        for parameter in params:
+            if not isinstance(parameter, int):
+                raise TypeError('One or more parameters are not integer type.')
+        if params[0] <= params[1]:
+            raise ValueError('Slow line must have a value bigger than fast line')
+
+    # Smoothed series and lines shared between parameter sets
+    ewm = {}
+    lines = {}
+    result = _buffer(series.shape[0], 2 * len(grid))
+    line, signal = result[:, :len(grid)], result[:, len(grid):]
+    for j, (slow, fast, ma) in enumerate(grid):
+        for span in [slow, fast]:
+            if span not in ewm:
+                ewm[span] = backend.ewm_mean(series, 2 / (span + 1))
+        if (slow, fast) in lines:
+            line[:, j] = line[:, lines[(slow, fast)]]
+        else:
+            np.subtract(ewm[slow], ewm[fast], out=line[:, j])
+            np.abs(line[:, j], out=line[:, j])
+            lines[(slow, fast)] = j
+        backend.ewm_mean(line[:, j], 2 / (ma + 1), out=signal[:, j])
+
+    params = pd.MultiIndex.from_tuples(grid, names=['slow', 'fast', 'ma'])
+
+    return _output(result, data.index, params, ['macd_line', 'macd_signal'])
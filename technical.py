@@ -3,9 +3,342 @@ Implements a series of technical
 indicators used in finance and trading.
 """
 
+import numpy as np
 import pandas as pd
 
-def ADX(data, ma, full_output=False):
+import backend
+import instrument
+
+def _empty(shape, out=None, dtype=float):
+    """
+    Array full of NaN, written in out when it is given.
+    """
+
+    if out is None:
+        return np.full(shape, np.nan, dtype=dtype)
+
+    out[...] = np.nan
+    return out
+
+def _shift_rows(values, shift, out=None):
+    """
+    Move each column of a 2-D array up by its own number of rows.
+    Negative shifts move the column down. Rows left empty are NaN.
+    Parameters
+    ----------
+    values: np.ndarray
+        2-D (observations x series) array
+    shift: np.ndarray
+        Number of rows for each column
+    out: np.ndarray
+        Array where the result is written
+    Returns
+    ----------
+    np.ndarray
+        Array with the same shape as values
+    """
+
+    n = values.shape[0]
+    rows = np.arange(n)[:, None] + shift
+    cols = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    inside = (rows >= 0) & (rows < n)
+    moved = values[rows[inside], cols[inside]]
+    out = _empty(values.shape, out, values.dtype)
+    out[inside] = moved
+
+    return out
+
+def _wilder(values, ma, start, average=False, out=None):
+    """
+    Wilder smoothing (RMA) along the first axis.
+    The seed, at position start, is the sum of the last ma observations.
+    After it the series follows y[i] = y[i-1] - y[i-1] / ma + x[i].
+    With average=True the seed is the mean of the last ma observations
+    and the series follows y[i] = (y[i-1] * (ma - 1) + x[i]) / ma.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with input values
+    ma: int
+        Smoothing period
+    start: int/np.ndarray
+        Position of the first smoothed value, all positions before it are NaN.
+        For 2-D input it can be given for each column.
+    average: bool
+        Smooth averages instead of sums
+    out: np.ndarray
+        Array where the result is written, can be values itself
+    Returns
+    ----------
+    np.ndarray
+        Array with the same shape as values
+    """
+
+    values = backend._float(values)
+
+    start = np.asarray(start)
+    if start.ndim > 0 and (start != start.min()).any():
+        # Align columns so all of them start at the same row
+        first = int(start.min())
+        aligned = _shift_rows(values, start - first)
+        aligned = _wilder(aligned, ma, first, average, out=aligned)
+        return _shift_rows(aligned, first - start, out=out)
+
+    start = int(start.min())
+    if start >= values.shape[0]:
+        return _empty(values.shape, out, values.dtype)
+
+    seed = values[start-ma+1:start+1].sum(axis=0)
+    if average:
+        return backend.linear_recurrence(values, (ma - 1) / ma, 1 / ma, start, seed / ma, out=out)
+    return backend.linear_recurrence(values, 1 - 1 / ma, 1, start, seed, out=out)
+
+def _rsi_average(values, ma, start, out=None):
+    """
+    Recursive average used by RSI along the first axis.
+    The seed is the value at position start, after it the series follows
+    y[i] = (y[i-1] * (ma - 1) + x[i]) / ma. Positions before start are NaN.
+    Parameters
+    ----------
+    values: np.ndarray
+        1-D or 2-D (observations x series) array with rolling means
+    ma: int
+        Smoothing period
+    start: int/np.ndarray
+        Position of the seed value. For 2-D input it can be given
+        for each column.
+    out: np.ndarray
+        Array where the result is written, can be values itself
+    Returns
+    ----------
+    np.ndarray
+        Array with the same shape as values
+    """
+
+    values = backend._float(values)
+
+    start = np.asarray(start)
+    if start.ndim > 0 and (start != start.min()).any():
+        # Align columns so all of them start at the same row
+        first = int(start.min())
+        aligned = _shift_rows(values, start - first)
+        aligned = _rsi_average(aligned, ma, first, out=aligned)
+        return _shift_rows(aligned, first - start, out=out)
+
+    start = int(start.min())
+    if start >= values.shape[0]:
+        return _empty(values.shape, out, values.dtype)
+
+    seed = values[start].copy()
+    return backend.linear_recurrence(values, (ma - 1) / ma, 1 / ma, start, seed, out=out)
+
+def _diff(values):
+    """
+    Difference to the previous row along the first axis,
+    the first row is NaN.
+    """
+
+    out = np.empty(values.shape, dtype=values.dtype)
+    out[0] = np.nan
+    np.subtract(values[1:], values[:-1], out=out[1:])
+
+    return out
+
+def _true_range(high, low, close):
+    """
+    True range, the largest of high - low, high - previous close
+    and low - previous close in absolute value. The first row has
+    no previous close, so it is high - low.
+    """
+
+    tr = np.subtract(high, low)
+    np.abs(tr, out=tr)
+    # Ranges against the previous close share one buffer
+    tmp = np.subtract(high[1:], close[:-1])
+    np.abs(tmp, out=tmp)
+    np.fmax(tr[1:], tmp, out=tr[1:])
+    np.subtract(low[1:], close[:-1], out=tmp)
+    np.abs(tmp, out=tmp)
+    np.fmax(tr[1:], tmp, out=tr[1:])
+
+    return tr
+
+def _check_mult(mult):
+    """
+    Check the band multiplier of Bollinger bands.
+    """
+
+    if isinstance(mult, bool) or not isinstance(mult, (int, float)):
+        raise TypeError('mult parameter is not a number.')
+    if mult < 0:
+        raise ValueError('mult must be non negative.')
+
+def _rolling(values, window):
+    """
+    pandas rolling window over an array, without copying it.
+    """
+
+    if values.ndim > 1:
+        return pd.DataFrame(values, copy=False).rolling(window)
+
+    return pd.Series(values, copy=False).rolling(window)
+
+def _column(data, name, dtype=float):
+    """
+    Column of a DataFrame as a float array, a read-only
+    view of the column when it already has the dtype.
+    """
+
+    return data[name].to_numpy(dtype=dtype)
+
+# All possibles names for the key columns of long format data
+_SYMBOL_COLS = ['Symbol', 'symbol', 'Ticker', 'ticker']
+_TIME_COLS = ['Datetime', 'datetime', 'Date', 'date']
+
+def _is_panel(data):
+    """
+    Check if data holds more than one symbol, either as MultiIndex
+    columns (symbol, field) or as long format with a symbol column.
+    """
+
+    if not isinstance(data, pd.DataFrame):
+        return False
+
+    return data.columns.nlevels == 2 or any(col in _SYMBOL_COLS for col in data.columns)
+
+def _to_wide(data):
+    """
+    Convert panel data to wide format.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Panel with MultiIndex columns (symbol, field) or long format
+        data with a symbol column and, optionally, a time column.
+        Without a time column the index is used as time key.
+    Returns
+    ----------
+    tuple
+        DataFrame with MultiIndex columns (symbol, field) and the
+        (symbol, time) key columns, None for wide input
+    """
+
+    if data.columns.nlevels == 2:
+        return data, None
+
+    symbol_col = [col for col in data.columns if col in _SYMBOL_COLS][0]
+    time_cols = [col for col in data.columns if col in _TIME_COLS]
+    time_col = time_cols[0] if time_cols else None
+
+    times = data[time_col] if time_col is not None else data.index.to_series()
+    keys = pd.MultiIndex.from_arrays([times, data[symbol_col]])
+    if keys.has_duplicates:
+        raise ValueError('Duplicated symbol and time pairs in long format data.')
+
+    fields = [col for col in data.columns if col not in (symbol_col, time_col)]
+    wide = data[fields].set_axis(keys, axis=0).unstack(level=1)
+    # Columns grouped by symbol in order of appearance
+    symbols = pd.unique(data[symbol_col])
+    wide = wide.swaplevel(axis=1)[[(sym, field) for sym in symbols for field in fields]]
+
+    return wide, (symbol_col, time_col)
+
+def _panel_field(wide, names, dtype=float):
+    """
+    Select one field for all symbols of a wide panel.
+    Parameters
+    ----------
+    wide: pd.DataFrame
+        Panel with MultiIndex columns (symbol, field)
+    names: list
+        Accepted labels for the field, only one must be present
+    dtype: str
+        Float type of the returned array
+    Returns
+    ----------
+    np.ndarray
+        2-D array (observations x symbols) with field values
+    """
+
+    fields = wide.columns.get_level_values(1).unique()
+    cols = [col for col in fields if col in names]
+    # Check if there's only one column for the field
+    if len(cols) > 1:
+        raise KeyError('Ambiguous number of possible close prices column.')
+    elif len(cols) == 0:
+        raise IndexError('Missing necessary columns (' + ', '.join(names) + ').')
+
+    symbols = wide.columns.get_level_values(0).unique()
+    field = wide.xs(cols[0], axis=1, level=1).reindex(columns=symbols)
+
+    # Single 2-D block, so every operation runs once for all symbols
+    return field.to_numpy(dtype=dtype)
+
+def _panel_start(close):
+    """
+    First valid row of close prices for each symbol, used to
+    align recursive series of symbols with shorter histories.
+    """
+
+    valid = ~np.isnan(close)
+
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), valid.shape[0])
+
+def _panel_output(data, wide, long_key, outputs, columns, full_output):
+    """
+    Assemble indicator results for panel input.
+    Parameters
+    ----------
+    data: pd.DataFrame
+        Panel passed to the indicator
+    wide: pd.DataFrame
+        Panel in wide format
+    long_key: tuple
+        (symbol, time) key columns for long format input, None otherwise
+    outputs: dict
+        2-D arrays (observations x symbols) for each computed series
+    columns: list
+        Series returned when full output is not requested
+    full_output: bool
+        Returns input data and support series used in calculation
+    Returns
+    ----------
+    pd.DataFrame
+        Wide input returns MultiIndex columns (symbol, field).
+        Long input returns one row for each input row with the
+        symbol column and the computed series.
+    """
+
+    names = list(outputs) if full_output else columns
+    symbols = wide.columns.get_level_values(0).unique()
+
+    if long_key is None:
+        # Columns grouped by symbol, same naming as a single symbol output
+        values = np.stack([outputs[name] for name in names], axis=2)
+        df = pd.DataFrame(values.reshape(values.shape[0], -1), index=wide.index,
+                          columns=pd.MultiIndex.from_product([symbols, names]))
+        if full_output:
+            df = pd.concat([data, df], axis=1)
+            order = symbols.get_indexer(df.columns.get_level_values(0))
+            df = df.iloc[:, np.argsort(order, kind='stable')]
+        return df
+
+    symbol_col, time_col = long_key
+    times = data[time_col] if time_col is not None else data.index.to_series()
+    rows = wide.index.get_indexer(times)
+    cols = symbols.get_indexer(data[symbol_col])
+
+    df = pd.DataFrame(index=data.index)
+    df[symbol_col] = data[symbol_col]
+    for name in names:
+        df[name] = outputs[name][rows, cols]
+
+    if full_output:
+        df = pd.concat([data, df.drop(columns=[symbol_col])], axis=1)
+
+    return df
+
+@instrument.instrumented
+def ADX(data, ma, full_output=False, dtype='float64'):
     """ 
     Calculate average directional index (ADX) for a given 
     ohlc dataframe.
@@ -14,99 +347,108 @@ def ADX(data, ma, full_output=False):
     data: pd.DataFrame
         DataFrame containing OHLC data. Columns must have the
         following labels: High, Low, Close. Open column is not mandatory.
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     ma: int
         How many obversations will be used to calculate moving average
     full_output: bool
-        Returns input data and support series used in calculation
+        Returns input data and support series used in calculation.
+        Without it, intermediate buffers are reused and only the
+        output columns are allocated.
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
     Returns
     ----------
     pd.DataFrame
         With columns adx and dx
         For full output, dm_pos, dm_neg, tr, roll_tr, roll_dmp, 
-        roll_dmn, di_pos, di_neg, di_sum, di_diff are shown too
+        roll_dmn, di_pos, di_neg, di_sum, di_diff are shown too.
+        Panel input returns the same columns for each symbol.
     """
     
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if not isinstance(data, pd.DataFrame):
-        raise TypeError('Input data is not a pandas DataFrame.')
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        high = _panel_field(wide, ['High'], dtype)
+        low = _panel_field(wide, ['Low'], dtype)
+        close = _panel_field(wide, ['Close'], dtype)
+    
+    elif isinstance(data, pd.DataFrame):
+        if not set(['High', 'Low', 'Close']).issubset(data.columns):
+            raise IndexError('Missing necessary columns (High, Low or Close).')
+        high = _column(data, 'High', dtype)
+        low = _column(data, 'Low', dtype)
+        close = _column(data, 'Close', dtype)
 
-    if not set(['High', 'Low', 'Close']).issubset(data.columns):
-        raise IndexError('Missing necessary columns (High, Low or Close).')
+    else:
+        raise TypeError('Input data is not a pandas DataFrame.')
 
     # Handles parameter input
+    instrument.stage('validation')
     if not isinstance(ma, int):
         raise TypeError('ma parameter is not integer type.')
 
-    full_df = pd.DataFrame()
+    instrument.stage('compute')
+    # Symbols with shorter histories start later
+    start = _panel_start(close) if close.ndim > 1 else 0
+    # Buffers are overwritten when intermediate series are not returned
+    reuse = lambda buffer: None if full_output else buffer
+
+    full_df = {}
 
     # Compute true range
-    full_df['diff_hl'] = abs(data['High'] - data['Low'])
-    full_df['diff_hc'] = abs(data['High'] - data['Close'].shift(1))
-    full_df['diff_lc'] = abs(data['Low'] - data['Close'].shift(1))
-    full_df['tr'] = full_df[['diff_hl', 'diff_hc', 'diff_lc']].max(axis=1)
-    # Delete diff columns
-    full_df = full_df.drop(['diff_hl', 'diff_hc', 'diff_lc'], axis=1)
-    # Compute directional momentum
-    full_df['dm_pos'] = data['High'] - data['High'].shift(1)
-    full_df['dm_neg'] = data['Low'].shift(1) - data['Low']
-    # Only positive values
-    full_df.loc[full_df['dm_pos'] < 0, 'dm_pos'] = 0
-    full_df.loc[full_df['dm_neg'] < 0, 'dm_neg'] = 0
-    # Take rolling sum
-    full_df['roll_tr'] = full_df['tr'].rolling(ma).sum()
-    full_df['roll_dmp'] = full_df['dm_pos'].rolling(ma).sum()
-    full_df['roll_dmn'] = full_df['dm_neg'].rolling(ma).sum()
-    
-    # Compute new rolling sum
-    roll_tr = [None for i in range(ma)]
-    roll_dmp = [None for i in range(ma)]
-    roll_dmn = [None for i in range(ma)]
-    roll_tr.append(full_df['roll_tr'].iloc[ma])
-    roll_dmp.append(full_df['roll_dmp'].iloc[ma])
-    roll_dmn.append(full_df['roll_dmn'].iloc[ma])
-    # Don't know if there is a vector method to do that
-    for i in range(ma+1, full_df.shape[0]):
-        temp_tr = (roll_tr[-1] - (roll_tr[-1] / ma) + full_df.iloc[i, -6])
-        roll_tr.append(temp_tr)
-        
-        temp_dmp = (roll_dmp[-1] - (roll_dmp[-1] / ma) + full_df.iloc[i, -5])
-        roll_dmp.append(temp_dmp)
-        
-        temp_dmn = (roll_dmn[-1] - (roll_dmn[-1] / ma) + full_df.iloc[i, -4])
-        roll_dmn.append(temp_dmn)
-    # Change series in df    
-    full_df['roll_tr'] = roll_tr
-    full_df['roll_dmp'] = roll_dmp
-    full_df['roll_dmn'] = roll_dmn
-    
-    # Compute directional indicator
-    full_df['di_pos'] = 100 * (full_df['roll_dmp'] / full_df['roll_tr'])
-    full_df['di_neg'] = 100 * (full_df['roll_dmn'] / full_df['roll_tr'])
-    # Compute sum and diff
-    full_df['di_sum'] = full_df['di_pos'] + full_df['di_neg']
-    full_df['di_diff'] = abs(full_df['di_pos'] - full_df['di_neg'])
-    # Compute dx and rolling for adx
-    full_df['dx'] = (full_df['di_diff'] / full_df['di_sum']) * 100
-    full_df['adx'] = full_df['dx'].rolling(ma).mean()
+    full_df['tr'] = _true_range(high, low, close)
+    # Compute directional momentum, only positive values, missing values are kept
+    full_df['dm_pos'] = np.maximum(_diff(high), 0)
+    full_df['dm_neg'] = _diff(low)
+    np.negative(full_df['dm_neg'], out=full_df['dm_neg'])
+    np.maximum(full_df['dm_neg'], 0, out=full_df['dm_neg'])
+    full_df['dm_pos'][0] = full_df['dm_neg'][0] = np.nan
+    # Wilder smoothing, seeded with the rolling sum at index ma
+    for col, name in [('roll_tr', 'tr'), ('roll_dmp', 'dm_pos'), ('roll_dmn', 'dm_neg')]:
+        full_df[col] = _wilder(full_df[name], ma, ma + start, out=reuse(full_df[name]))
     
-    # Same trick as for roll series
-    adx = [None for i in range(2*ma-1)]
-    adx.append(full_df['adx'].iloc[2*ma-1])
-    for i in range((2*ma), full_df.shape[0]):
-        temp = (adx[-1] * (ma - 1) + full_df.iloc[i, -2]) / ma
-        adx.append(temp)        
-    full_df['adx'] = adx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Compute directional indicator
+        full_df['di_pos'] = np.divide(full_df['roll_dmp'], full_df['roll_tr'],
+                                      out=reuse(full_df['roll_dmp']))
+        full_df['di_pos'] *= 100
+        full_df['di_neg'] = np.divide(full_df['roll_dmn'], full_df['roll_tr'],
+                                      out=reuse(full_df['roll_dmn']))
+        full_df['di_neg'] *= 100
+        # Compute sum and diff
+        full_df['di_sum'] = np.add(full_df['di_pos'], full_df['di_neg'],
+                                   out=reuse(full_df['roll_tr']))
+        full_df['di_diff'] = np.subtract(full_df['di_pos'], full_df['di_neg'])
+        np.abs(full_df['di_diff'], out=full_df['di_diff'])
+        # Compute dx and smooth it for adx, first value is the mean of dx
+        full_df['dx'] = np.divide(full_df['di_diff'], full_df['di_sum'],
+                                  out=reuse(full_df['di_diff']))
+        full_df['dx'] *= 100
+    full_df['adx'] = _wilder(full_df['dx'], ma, 2*ma - 1 + start, average=True)
 
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df, ['adx', 'dx'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df[['adx', 'dx']]
+        df = pd.DataFrame({'adx': full_df['adx'], 'dx': full_df['dx']},
+                          index=data.index, copy=False)
     
     return df
 
-def ATR(data, ma, full_output=False):
+@instrument.instrumented
+def ATR(data, ma, full_output=False, dtype='float64'):
     """ 
     Calculate average true range (ATR) for a given ohlc data.
     Parameters
@@ -114,46 +456,80 @@ def ATR(data, ma, full_output=False):
     data: pd.DataFrame
         DataFrame containing OHLC data. Columns must have the
         following labels: High, Low, Close. Open column is not mandatory.
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     ma: int
         How many obversations will be used to calculate moving average
     full_output: bool
         Returns input data and support series used in calculation
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
     Returns
     ----------
     pd.DataFrame
         With columns atr and tr (true range)
-        For full output, dff_hl, dff_hc and dff_lc are shown too
+        For full output, dff_hl, dff_hc and dff_lc are shown too.
+        Panel input returns the same columns for each symbol.
     """
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if not isinstance(data, pd.DataFrame):
-        raise TypeError('Input data is not a pandas DataFrame.')
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        high = _panel_field(wide, ['High'], dtype)
+        low = _panel_field(wide, ['Low'], dtype)
+        close = _panel_field(wide, ['Close'], dtype)
+
+    elif isinstance(data, pd.DataFrame):
+        if not set(['High', 'Low', 'Close']).issubset(data.columns):
+            raise IndexError('Missing necessary columns (High, Low or Close).')
+        high = _column(data, 'High', dtype)
+        low = _column(data, 'Low', dtype)
+        close = _column(data, 'Close', dtype)
 
-    if not set(['High', 'Low', 'Close']).issubset(data.columns):
-        raise IndexError('Missing necessary columns (High, Low or Close).')
+    else:
+        raise TypeError('Input data is not a pandas DataFrame.')
 
     # Handles parameter input
+    instrument.stage('validation')
     if not isinstance(ma, int):
         raise TypeError('ma parameter is not integer type.')
 
-    full_df = pd.DataFrame()
+    instrument.stage('compute')
+    full_df = {}
 
     # Compute ranges
-    full_df['dff_hl'] = abs(data['High'] - data['Low'])
-    full_df['dff_hc'] = abs(data['High'] - data['Close'].shift(1))
-    full_df['dff_lc'] = abs(data['Low'] - data['Close'].shift(1))
-    full_df['tr'] = full_df[['dff_hl', 'dff_hc', 'dff_lc']].max(axis=1)
-    full_df['atr'] = full_df['tr'].rolling(ma).mean()
+    if full_output == True:
+        prev_close = np.roll(close, 1, axis=0)
+        prev_close[0] = np.nan
+        full_df['dff_hl'] = np.abs(high - low)
+        full_df['dff_hc'] = np.abs(high - prev_close)
+        full_df['dff_lc'] = np.abs(low - prev_close)
+        full_df['tr'] = np.fmax(np.fmax(full_df['dff_hl'], full_df['dff_hc']), full_df['dff_lc'])
+    else:
+        full_df['tr'] = _true_range(high, low, close)
+    full_df['atr'] = _rolling(full_df['tr'], ma).mean().to_numpy(dtype=dtype)
     
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df, ['atr', 'tr'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df[['atr', 'tr']]
+        df = pd.DataFrame({'atr': full_df['atr'], 'tr': full_df['tr']},
+                          index=data.index, copy=False)
     
     return df
 
-def bollband(data, ma, full_output=False):
+@instrument.instrumented
+def bollband(data, ma, full_output=False, dtype='float64', mult=2):
     '''
     Calculate bollinger bands for a given series.
     Parameters
@@ -166,19 +542,37 @@ def bollband(data, ma, full_output=False):
            - close
            - Adj Close
            - adj close
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     ma: int
         Moving average parameter
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
+    mult: int/float
+        Bands are mult standard deviations away from the moving average
     Returns
     ----------
     pd.DataFrame
         With columns bollband_up and bollband_low.
-        For full output, ma is shown too
+        For full output, ma is shown too.
+        Panel input returns the same columns for each symbol.
     '''
 
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
-        # All possibles names for close column
-        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        series = _panel_field(wide, possible_cols, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # Select them
         cols = cols = [col for col in data.columns if col in possible_cols]
         # Check if there's only one close column
@@ -186,39 +580,54 @@ def bollband(data, ma, full_output=False):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        series = _column(data, cols[0], dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.to_numpy(dtype=dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
+    instrument.stage('validation')
     if not isinstance(ma, int):
         raise TypeError('ma parameter is not integer type.')
+    _check_mult(mult)
 
-    full_df = pd.DataFrame()
+    instrument.stage('compute')
+    full_df = {}
 
-    full_df['ma'] = series.rolling(ma).mean()
-    full_df['bollband_up'] = full_df['ma'] + 2 * full_df['ma'].rolling(ma).std()
-    full_df['bollband_low'] = full_df['ma'] - 2 * full_df['ma'].rolling(ma).std()
+    # Mean and deviation in one pass, the deviation once for both bands
+    full_df['ma'], std = backend.rolling_mean_std(series, ma)
+    std *= mult
+    full_df['bollband_up'] = full_df['ma'] + std
+    full_df['bollband_low'] = full_df['ma'] - std
 
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df,
+                             ['bollband_up', 'bollband_low'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df[['bollband_up', 'bollband_low']]
+        df = pd.DataFrame({'bollband_up': full_df['bollband_up'],
+                           'bollband_low': full_df['bollband_low']},
+                          index=data.index, copy=False)
     
     return df
 
-def MACD(data, slow, fast, ma, full_output=False):
+@instrument.instrumented
+def MACD(data, slow, fast, ma, full_output=False, dtype='float64'):
     """ 
     Calculate moving average convergence 
     divergence (MACD) for a given time series 
     (usually close prices).
+    With the numba backend the slow, fast and signal means are
+    computed in one pass over the prices. The numpy backend makes
+    one pandas ewm pass for each of them.
     Parameters
     ----------
     data: pd.Series/pd.DataFrame
@@ -229,6 +638,8 @@ def MACD(data, slow, fast, ma, full_output=False):
            - close
            - Adj Close
            - adj close
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     slow: int
         How many observations the slow line will look back
     fast: int
@@ -237,17 +648,31 @@ def MACD(data, slow, fast, ma, full_output=False):
         How many obversations will be used to calculate moving average
     full_output: bool
         Returns input data and support series used in calculation
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
     Returns
     ----------
     pd.DataFrame
         With columns macd_line and macd_signal
-        For full output, slow_ma and fast_ma are shown too
+        For full output, slow_ma and fast_ma are shown too.
+        Panel input returns the same columns for each symbol.
     """
     
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
-        # All possibles names for close column
-        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        series = _panel_field(wide, possible_cols, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # Select them
         cols = cols = [col for col in data.columns if col in possible_cols]
         # Check if there's only one close column
@@ -255,16 +680,16 @@ def MACD(data, slow, fast, ma, full_output=False):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        series = _column(data, cols[0], dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.to_numpy(dtype=dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameters inputs
+    instrument.stage('validation')
     for parameter in [slow, fast, ma]:
         if not isinstance(parameter, int):
             raise TypeError('One or more parameters are not integer type.')
@@ -272,24 +697,33 @@ def MACD(data, slow, fast, ma, full_output=False):
     if slow <= fast:
         raise ValueError('Slow line must have a value bigger than fast line')
 
-    full_df = pd.DataFrame()
+    instrument.stage('compute')
+    full_df = {}
 
-    # Calculate lines
-    full_df['slow_ma'] = series.ewm(span=slow).mean()
-    full_df['fast_ma'] = series.ewm(span=fast).mean()
-    full_df['macd_line'] = abs(full_df['slow_ma'] - full_df['fast_ma'])
-    full_df['macd_signal'] = full_df['macd_line'].ewm(span=ma).mean()
+    # Calculate lines, the means are only kept for full output
+    lines = backend.macd(series, 2 / (slow + 1), 2 / (fast + 1), 2 / (ma + 1), emas=full_output)
+    if full_output:
+        full_df['slow_ma'], full_df['fast_ma'] = lines[:2]
+    full_df['macd_line'], full_df['macd_signal'] = lines[-2:]
     
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df,
+                             ['macd_line', 'macd_signal'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df[['macd_line', 'macd_signal']]
+        df = pd.DataFrame({'macd_line': full_df['macd_line'],
+                           'macd_signal': full_df['macd_signal']},
+                          index=data.index, copy=False)
     
     return df
 
-def RSI(data, ma, full_output=False):
+@instrument.instrumented
+def RSI(data, ma, full_output=False, dtype='float64'):
     """ 
     Calculate RSI indicator for a given series or ohlc data.
     Parameters
@@ -302,22 +736,38 @@ def RSI(data, ma, full_output=False):
            - close
            - Adj Close
            - adj close
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     ma: int
         How many obversations will be used to calculate moving average
     full_output: bool
         Returns input data and support series used in calculation
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
     Returns
     ----------
     pd.Series/pd.DataFrame
         With rsi values
         For full output, df is returned with gain, loss, av_gain
         and av_loss as well.
+        Panel input returns a DataFrame with rsi for each symbol.
     """
 
+    # All possibles names for close column
+    possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if isinstance(data, pd.DataFrame):
-        # All possibles names for close column
-        possible_cols = ['Close', 'close', 'Adj Close', 'adj close']
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        series = _panel_field(wide, possible_cols, dtype)
+
+    elif isinstance(data, pd.DataFrame):
         # Select them
         cols = cols = [col for col in data.columns if col in possible_cols]
         # Check if there's only one close column
@@ -325,62 +775,63 @@ def RSI(data, ma, full_output=False):
             raise KeyError('Ambiguous number of possible close prices column.')
         elif len(cols) == 0:
             raise IndexError('No close column. Pass desired column as a pd.Series.')
-        # Copy data as series
-        series = data[cols[0]].copy()
+        series = _column(data, cols[0], dtype)
 
     elif isinstance(data, pd.Series):
-        series = data.copy()
+        series = data.to_numpy(dtype=dtype)
     
     else:
         raise TypeError('Input data is not a pandas Series or DataFrame.')
 
     # Handles parameter input
+    instrument.stage('validation')
     if not isinstance(ma, int):
         raise TypeError('ma parameter is not integer type.')
+
+    instrument.stage('compute')
+    # Symbols with shorter histories start later
+    start = _panel_start(series) if series.ndim > 1 else 0
     
-    full_df = pd.DataFrame()
-    
-    # Compute gains and losses
-    full_df['gain'] = series - series.shift(1)
-    full_df['loss'] = series.shift(1) - series
-    # For negative values substitute for zero
-    full_df.loc[full_df['gain'] < 0, 'gain'] = 0
-    full_df.loc[full_df['loss'] < 0, 'loss'] = 0
-    # Only needs the first value of the ma series
-    full_df['av_gain'] = full_df['gain'].rolling(ma).mean()
-    full_df['av_loss'] = full_df['loss'].rolling(ma).mean()
-    # all values before index ma must be NaN to preserve original shape
-    av_gain = [None for i in range(ma)]
-    av_loss = [None for i in range(ma)]
-    av_gain.append(full_df['av_gain'].iloc[ma])
-    av_loss.append(full_df['av_loss'].iloc[ma])
-    
-    # The series must be reconstructed recursively
-    for i in range(ma+1, series.shape[0]):
-        # Index -2 for full_df colums is the gain column
-        term_gain = (av_gain[-1] * (ma - 1) + full_df.iloc[i, -2]) / ma
-        av_gain.append(term_gain)
-        # Index -1 for full_df colums is the loss column
-        term_loss = (av_loss[-1] * (ma - 1) + full_df.iloc[i, -1]) / ma
-        av_loss.append(term_loss)
+    full_df = {}
     
-    # Average columns using recursive rule
-    full_df['av_gain'] = av_gain
-    full_df['av_loss'] = av_loss
+    # Compute gains and losses, negative values are substituted for zero and missing values are kept
+    full_df['gain'] = _diff(series)
+    full_df['loss'] = np.negative(full_df['gain'])
+    np.maximum(full_df['gain'], 0, out=full_df['gain'])
+    np.maximum(full_df['loss'], 0, out=full_df['loss'])
+    full_df['gain'][0] = full_df['loss'][0] = np.nan
+    # The recursive rule is applied over the rolling means,
+    # seeded with the rolling mean at index ma. All values
+    # before index ma are NaN to preserve original shape
+    for col, name in [('av_gain', 'gain'), ('av_loss', 'loss')]:
+        roll = _rolling(full_df[name], ma).mean().to_numpy(dtype=dtype)
+        full_df[col] = _rsi_average(roll, ma, ma + start)
+        if not full_output:
+            del full_df[name]
     
     # Compute indicator
-    full_df['rsi'] = 100 - (100 / (1 + (full_df['av_gain'] / full_df['av_loss'])))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.divide(full_df['av_gain'], full_df['av_loss'])
+        rsi += 1
+        np.divide(100, rsi, out=rsi)
+        np.subtract(100, rsi, out=rsi)
+    full_df['rsi'] = rsi
     
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df, ['rsi'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df['rsi']
+        df = pd.Series(full_df['rsi'], index=data.index, name='rsi', copy=False)
     
     return df
 
-def OBV(data, full_output=False):
+@instrument.instrumented
+def OBV(data, full_output=False, dtype='float64'):
     """ 
     Calculate on balance volume (OBV) for a given 
     ohlc+volume dataframe.
@@ -389,39 +840,78 @@ def OBV(data, full_output=False):
     data: pd.DataFrame
         DataFrame containing OHLC+Volume data. Columns must have the
         following labels: Close and Volume.
+        For many symbols at once, use MultiIndex columns (symbol, field)
+        or long format with a Symbol column (and optionally a Datetime column).
     full_output: bool
         Returns input data and support series used in calculation
+    dtype: str
+        float64 or float32. Computation and output use this type,
+        float32 halves memory at about 1e-6 relative precision.
     Returns
     ----------
     pd.DataFrame
         DataFrame with OBV indicator
         For full output, directional and returns are shown too.
+        Panel input returns the same columns for each symbol.
     """
     
+    # Handles dtype input, columns are read with it
+    if not dtype in ('float32', 'float64', np.float32, np.float64):
+        raise ValueError('Invalid option for dtype.')
+
     # Handles input data
-    if not isinstance(data, pd.DataFrame):
-        raise TypeError('Input data is not a pandas DataFrame.')
+    instrument.stage('columns')
+    if _is_panel(data):
+        wide, long_key = _to_wide(data)
+        close = _panel_field(wide, ['Close'], dtype)
+        volume = _panel_field(wide, ['Volume'], dtype)
+
+    elif isinstance(data, pd.DataFrame):
+        if not set(['Close', 'Volume']).issubset(data.columns):
+            raise IndexError('Missing necessary columns (Close or Volume).')
+        close = _column(data, 'Close', dtype)
+        # Keeps volume type, integer volume gives integer obv
+        volume = data['Volume'].to_numpy()
+        if volume.dtype.kind == 'f':
+            volume = volume.astype(dtype, copy=False)
 
-    if not set(['Close', 'Volume']).issubset(data.columns):
-        raise IndexError('Missing necessary columns (Close or Volume).')
+    else:
+        raise TypeError('Input data is not a pandas DataFrame.')
 
-    full_df = pd.DataFrame()
+    instrument.stage('compute')
+    full_df = {}
     
     # Compute OBV
-    full_df['returns'] = data['Close'].pct_change()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        full_df['returns'] = np.empty(close.shape, dtype=close.dtype)
+        full_df['returns'][0] = np.nan
+        np.divide(close[1:], close[:-1], out=full_df['returns'][1:])
+        full_df['returns'] -= 1
+    # 1 for positive returns, -1 for negative and 0 otherwise
+    directional = np.sign(full_df['returns'], out=None if full_output else full_df['returns'])
+    directional[np.isnan(directional)] = 0
+    full_df['directional'] = directional.astype(np.int64)
+    if not full_output:
+        del full_df['returns']
     
-    full_df['directional'] = 0
-    
-    full_df.loc[full_df['returns'] > 0, 'directional'] = 1
-    full_df.loc[full_df['returns'] < 0, 'directional'] = -1
-    
-    full_df['obv'] = (full_df['directional'] * data['Volume']).cumsum()
+    # Integer directional must not upcast float32 volume to float64
+    obv = np.multiply(full_df['directional'], volume, dtype=np.result_type(volume.dtype, np.int8))
+    # Missing volumes stay missing without breaking the running sum
+    missing = np.isnan(obv) if obv.dtype.kind == 'f' else None
+    full_df['obv'] = np.nancumsum(obv, axis=0, out=obv) if missing is not None \
+        else np.cumsum(obv, axis=0, out=obv)
+    if missing is not None:
+        full_df['obv'][missing] = np.nan
 
     # Prepares return df
+    instrument.stage('output')
+    if _is_panel(data):
+        return _panel_output(data, wide, long_key, full_df, ['obv'], full_output)
+
     if full_output == True:
-        df = data.copy()
-        df = pd.concat([df, full_df], axis=1)
+        full_df = pd.DataFrame(full_df, index=data.index, copy=False)
+        df = pd.concat([data, full_df], axis=1)
     else:
-        df = full_df[['obv']]
+        df = pd.DataFrame({'obv': full_df['obv']}, index=data.index, copy=False)
     
-    return df
\ No newline at end of file
+    return df
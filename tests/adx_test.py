@@ -1,5 +1,6 @@
 import os
 import unittest
+import numpy as np
 import pandas as pd
 from context import technical as ti
 
@@ -70,6 +71,15 @@ class ResultsADX(unittest.TestCase):
         results = ti.ADX(self.test_data, self.ma, full_output=True)
         self.assertEqual(ohlc_og_columns+result_columns, results.shape[1])
 
+    def test_result_missing_value(self):
+        '''a missing high must give NaN at its bar and after it, as the former rule'''
+        data = self.test_data.copy()
+        data.loc[30, 'High'] = np.nan
+        results = ti.ADX(data, self.ma)
+        self.assertTrue(results[30:].isna().all().all())
+        self.assertFalse(results['adx'][2*self.ma-1:30].isna().any())
+        self.assertFalse(results['dx'][self.ma:30].isna().any())
+
 # Test input data
 class BadInputADX(unittest.TestCase):
   # Input data
@@ -92,5 +102,46 @@ class BadInputADX(unittest.TestCase):
     '''if df has a missing column than should raise IndexError'''
     self.assertRaises(IndexError, ti.ADX, self.test_data_missing_col, self.ma)
 
+# Test smoothing kernel
+class WilderSmoothing(unittest.TestCase):
+    # Input data
+    values = np.random.default_rng(0).random((500, 3))
+
+    # Input parameter
+    ma = 14
+
+    def recursive(self, values, average):
+        '''reference implementation, one row at a time'''
+        out = np.full(values.shape, np.nan)
+        out[self.ma] = values[1:self.ma+1].sum(axis=0)
+        if average:
+            out[self.ma] /= self.ma
+        for i in range(self.ma+1, values.shape[0]):
+            if average:
+                out[i] = (out[i-1] * (self.ma - 1) + values[i]) / self.ma
+            else:
+                out[i] = out[i-1] - (out[i-1] / self.ma) + values[i]
+        return out
+
+    def test_wilder_sum(self):
+        '''kernel must match the recursive rule for sums'''
+        results = ti._wilder(self.values, self.ma, self.ma)
+        np.testing.assert_allclose(self.recursive(self.values, False), results, rtol=1e-12)
+
+    def test_wilder_average(self):
+        '''kernel must match the recursive rule for averages'''
+        results = ti._wilder(self.values, self.ma, self.ma, average=True)
+        np.testing.assert_allclose(self.recursive(self.values, True), results, rtol=1e-12)
+
+    def test_wilder_one_dimension(self):
+        '''1-D input must give the same result as a single column'''
+        results = ti._wilder(self.values[:, 0], self.ma, self.ma)
+        np.testing.assert_allclose(ti._wilder(self.values, self.ma, self.ma)[:, 0], results)
+
+    def test_wilder_short_input(self):
+        '''input shorter than the seed position must return only NaN'''
+        results = ti._wilder(self.values[:self.ma], self.ma, self.ma)
+        self.assertTrue(np.isnan(results).all())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
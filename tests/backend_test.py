@@ -0,0 +1,211 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import backend
+import adx_test
+import bollinger_band_test
+import macd_test
+import rsi_test
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+has_numba = 'numba' in backend.available_backends()
+
+# Runs a test case with a given backend
+class BackendCase:
+    backend_name = 'numpy'
+
+    def setUp(self):
+        self.previous = backend._backend
+        backend.set_backend(self.backend_name)
+
+    def tearDown(self):
+        backend._backend = self.previous
+
+# Indicator results against fixtures, one class for each backend
+class NumpyResultsADX(BackendCase, adx_test.ResultsADX):
+    backend_name = 'numpy'
+
+class NumpyResultsRSI(BackendCase, rsi_test.ResultsRSI):
+    backend_name = 'numpy'
+
+class NumpyResultsMACD(BackendCase, macd_test.ResultsMACD):
+    backend_name = 'numpy'
+
+class NumpyWilderSmoothing(BackendCase, adx_test.WilderSmoothing):
+    backend_name = 'numpy'
+
+class NumpyResultsBollBand(BackendCase, bollinger_band_test.ResultsBollBand):
+    backend_name = 'numpy'
+
+@unittest.skipUnless(has_numba, 'numba is not installed')
+class NumbaResultsADX(BackendCase, adx_test.ResultsADX):
+    backend_name = 'numba'
+
+@unittest.skipUnless(has_numba, 'numba is not installed')
+class NumbaResultsRSI(BackendCase, rsi_test.ResultsRSI):
+    backend_name = 'numba'
+
+@unittest.skipUnless(has_numba, 'numba is not installed')
+class NumbaResultsMACD(BackendCase, macd_test.ResultsMACD):
+    backend_name = 'numba'
+
+@unittest.skipUnless(has_numba, 'numba is not installed')
+class NumbaWilderSmoothing(BackendCase, adx_test.WilderSmoothing):
+    backend_name = 'numba'
+
+@unittest.skipUnless(has_numba, 'numba is not installed')
+class NumbaResultsBollBand(BackendCase, bollinger_band_test.ResultsBollBand):
+    backend_name = 'numba'
+
+# Kernels must give the same values with every backend
+class ResultsKernels(unittest.TestCase):
+    # Input data, with missing values at the start and in the middle
+    values = np.random.default_rng(0).normal(100, 5, (300, 3))
+    values[:7, 1] = np.nan
+    values[[50, 51, 120], 2] = np.nan
+
+    def run_backends(self, func, *args):
+        '''results of func for every available backend'''
+        results = {}
+        previous = backend._backend
+        for name in backend.available_backends():
+            backend.set_backend(name)
+            try:
+                results[name] = func(*args)
+            finally:
+                backend._backend = previous
+        return results
+
+    def test_ewm_mean_pandas(self):
+        '''ewm mean must be equal to pandas ewm mean'''
+        expected = pd.DataFrame(self.values).ewm(span=12).mean().to_numpy()
+        for name, result in self.run_backends(backend.ewm_mean, self.values, 2 / 13).items():
+            np.testing.assert_allclose(expected, result, rtol=1e-12, err_msg=name)
+
+    def test_ewm_mean_one_dimension(self):
+        '''1-D input must give the same result as a single column'''
+        expected = backend.ewm_mean(self.values, 2 / 13)[:, 1]
+        for name, result in self.run_backends(backend.ewm_mean, self.values[:, 1], 2 / 13).items():
+            np.testing.assert_allclose(expected, result, rtol=1e-12, err_msg=name)
+
+    def test_linear_recurrence(self):
+        '''recurrence must be equal for every backend'''
+        seed = self.values[10]
+        results = self.run_backends(backend.linear_recurrence, self.values[:, [0]], 0.9, 0.1, 10, seed[0])
+        for name, result in results.items():
+            np.testing.assert_allclose(results['numpy'], result, rtol=1e-12, err_msg=name)
+            self.assertTrue(np.isnan(result[:10]).all())
+
+    def test_macd_pandas(self):
+        '''fused macd must be equal to pandas ewm means to the last bit'''
+        frame = pd.DataFrame(self.values)
+        slow, fast = frame.ewm(span=26).mean(), frame.ewm(span=12).mean()
+        line = (slow - fast).abs()
+        expected = [slow, fast, line, line.ewm(span=9).mean()]
+        for name, result in self.run_backends(backend.macd, self.values, 2 / 27, 2 / 13, 2 / 10, True).items():
+            for lines, values in zip(expected, result):
+                np.testing.assert_array_equal(lines.to_numpy(), values, err_msg=name)
+
+    def test_macd_batched(self):
+        '''each column of a 2-D input must give the result of that column alone'''
+        for name, result in self.run_backends(backend.macd, self.values, 2 / 27, 2 / 13, 2 / 10).items():
+            self.assertEqual(2, len(result))
+            for j in range(self.values.shape[1]):
+                line, signal = self.run_backends(backend.macd, self.values[:, j], 2 / 27, 2 / 13, 2 / 10)[name]
+                np.testing.assert_array_equal(line, result[0][:, j], err_msg=name)
+                np.testing.assert_array_equal(signal, result[1][:, j], err_msg=name)
+
+    def test_macd_float32(self):
+        '''float32 input must give float32 output'''
+        for name, result in self.run_backends(backend.macd, self.values.astype(np.float32),
+                                              2 / 27, 2 / 13, 2 / 10, True).items():
+            for values in result:
+                self.assertEqual(np.float32, values.dtype, msg=name)
+
+    def test_rolling_mean_std_pandas(self):
+        '''rolling mean and std of the mean must be equal to pandas rolling'''
+        mean = pd.DataFrame(self.values).rolling(12).mean()
+        std = mean.rolling(12).std()
+        for name, result in self.run_backends(backend.rolling_mean_std, self.values, 12).items():
+            np.testing.assert_allclose(mean.to_numpy(), result[0], rtol=1e-12, err_msg=name)
+            np.testing.assert_allclose(std.to_numpy(), result[1], rtol=1e-9, err_msg=name)
+
+    def test_rolling_mean_std_batched(self):
+        '''each column of a 2-D input must give the result of that column alone'''
+        for name, result in self.run_backends(backend.rolling_mean_std, self.values, 12).items():
+            for j in range(self.values.shape[1]):
+                mean, std = self.run_backends(backend.rolling_mean_std, self.values[:, j], 12)[name]
+                np.testing.assert_allclose(mean, result[0][:, j], rtol=1e-12, err_msg=name)
+                np.testing.assert_allclose(std, result[1][:, j], rtol=1e-9, err_msg=name)
+
+    def test_rolling_mean_std_float32(self):
+        '''float32 input must give float32 output'''
+        for name, result in self.run_backends(backend.rolling_mean_std,
+                                              self.values.astype(np.float32), 12).items():
+            self.assertEqual(np.float32, result[0].dtype, msg=name)
+            self.assertEqual(np.float32, result[1].dtype, msg=name)
+
+# Rolling statistics of large prices against exact two pass values
+class StabilityRollingMeanStd(unittest.TestCase):
+    # Prices around 1e9 with small moves, running sums of squares lose every digit
+    values = 1e9 + np.cumsum(np.random.default_rng(1).normal(0, 0.5, (20000, 2)), axis=0)
+
+    def exact(self, window):
+        '''mean and std of the mean of every window, from the window values'''
+        windows = np.lib.stride_tricks.sliding_window_view
+        mean = np.full(self.values.shape, np.nan)
+        mean[window-1:] = windows(self.values, window, axis=0).mean(axis=-1)
+        std = np.full(self.values.shape, np.nan)
+        std[2*window-2:] = windows(mean[window-1:], window, axis=0).std(axis=-1, ddof=1)
+        return mean, std
+
+    def test_large_prices(self):
+        '''rolling std of large prices must be equal to the two pass std'''
+        for window in [2, 20, 250]:
+            mean, std = self.exact(window)
+            for name in backend.available_backends():
+                previous = backend._backend
+                backend.set_backend(name)
+                try:
+                    result = backend.rolling_mean_std(self.values, window)
+                finally:
+                    backend._backend = previous
+                np.testing.assert_allclose(mean, result[0], rtol=1e-14, err_msg=name)
+                np.testing.assert_allclose(std, result[1], atol=1e-5, err_msg=name)
+
+# Test backend choice
+class BadInputBackend(unittest.TestCase):
+    def test_unknown_backend(self):
+        '''unknown backend name raise ValueError'''
+        self.assertRaises(ValueError, backend.set_backend, 'cuda')
+
+    def test_backend_not_string(self):
+        '''backend name that is not a string raise TypeError'''
+        self.assertRaises(TypeError, backend.set_backend, 1)
+
+    @unittest.skipIf(has_numba, 'numba is installed')
+    def test_numba_missing(self):
+        '''numba backend without numba raise ValueError'''
+        self.assertRaises(ValueError, backend.set_backend, 'numba')
+
+    def test_environment_variable(self):
+        '''environment variable must choose the backend if none was set'''
+        previous, environ = backend._backend, os.environ.get(backend.ENV_VAR)
+        backend.set_backend(None)
+        os.environ[backend.ENV_VAR] = 'auto'
+        try:
+            self.assertEqual(backend.available_backends()[-1], backend.get_backend())
+        finally:
+            if environ is None:
+                del os.environ[backend.ENV_VAR]
+            else:
+                os.environ[backend.ENV_VAR] = environ
+            backend._backend = previous
+
+if __name__ == '__main__':
+    unittest.main()
@@ -76,6 +76,21 @@ class ResultsBollBand(unittest.TestCase):
         results = ti.bollband(self.test_data_df, self.ma, full_output=True)
         self.assertEqual(self.test_data_df.shape[1]+3, results.shape[1])
 
+    def test_result_mult(self):
+        '''bands must be mult standard deviations away from the moving average'''
+        results = ti.bollband(self.test_data, self.ma, full_output=True)
+        wide = ti.bollband(self.test_data, self.ma, full_output=True, mult=3.5)
+        pd.testing.assert_series_equal(results['ma'] + 1.75 * (results['bollband_up'] - results['ma']),
+                                       wide['bollband_up'], check_names=False)
+        pd.testing.assert_series_equal(results['ma'] - 1.75 * (results['ma'] - results['bollband_low']),
+                                       wide['bollband_low'], check_names=False)
+
+    def test_result_mult_zero(self):
+        '''with mult zero both bands must be the moving average once the std is known'''
+        results = ti.bollband(self.test_data, self.ma, full_output=True, mult=0).dropna()
+        pd.testing.assert_series_equal(results['ma'], results['bollband_up'], check_names=False)
+        pd.testing.assert_series_equal(results['ma'], results['bollband_low'], check_names=False)
+
 # Test input data
 class BadInputBollBand(unittest.TestCase):
   # Input data
@@ -95,6 +110,15 @@ class BadInputBollBand(unittest.TestCase):
     '''if data is not an valid type should raise TypeError'''
     self.assertRaises(TypeError, ti.bollband, self.test_data_list, self.ma)
 
+  def test_mult_not_number(self):
+    '''if mult is not a number should raise TypeError'''
+    self.assertRaises(TypeError, ti.bollband, self.test_data, self.ma, mult='2')
+    self.assertRaises(TypeError, ti.bollband, self.test_data, self.ma, mult=True)
+
+  def test_mult_negative(self):
+    '''if mult is negative should raise ValueError'''
+    self.assertRaises(ValueError, ti.bollband, self.test_data, self.ma, mult=-1)
+
   def test_df_no_close_column(self):
     '''if df has not close column than should raise IndexError'''
     self.assertRaises(IndexError, ti.bollband, self.test_data_df_no_close, self.ma)
@@ -0,0 +1,173 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import cache
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test cached results and counters
+class ResultsCache(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+
+    def test_result_equal(self):
+        '''cached results must be equal to the function results'''
+        memo = cache.IndicatorCache()
+        for func, args in [(ti.RSI, (14,)), (ti.ATR, (14,)), (ti.MACD, (26, 12, 9))]:
+            expected = func(self.test_data, *args)
+            for _ in range(2):
+                result = memo.get(func, self.test_data, *args)
+                if isinstance(expected, pd.Series):
+                    pd.testing.assert_series_equal(expected, result)
+                else:
+                    pd.testing.assert_frame_equal(expected, result)
+
+    def test_result_counters(self):
+        '''repeated calls must be hits, new parameters must be misses'''
+        memo = cache.IndicatorCache()
+        rsi = memo.wrap(ti.RSI)
+        rsi(self.test_data, 14)
+        rsi(self.test_data, 14)
+        rsi(self.test_data, ma=14)
+        rsi(self.test_data, 12)
+        stats = memo.stats()
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual('RSI', rsi.__name__)
+
+    def test_result_content_key(self):
+        '''equal data in a new frame must hit, changed data must miss'''
+        memo = cache.IndicatorCache()
+        memo.get(ti.ATR, self.test_data, 14)
+        memo.get(ti.ATR, self.test_data.copy(), 14)
+        changed = self.test_data.copy()
+        changed.loc[10, 'High'] += 1
+        memo.get(ti.ATR, changed, 14)
+        self.assertEqual(1, memo.hits)
+        self.assertEqual(2, memo.misses)
+
+    def test_result_eviction(self):
+        '''least recently used results must be evicted above the size bound'''
+        size = cache._nbytes(ti.ATR(self.test_data, 14))
+        memo = cache.IndicatorCache(max_bytes=2 * size)
+        for ma in [10, 12, 14]:
+            memo.get(ti.ATR, self.test_data, ma)
+        self.assertEqual(1, memo.evictions)
+        self.assertLessEqual(memo.nbytes, 2 * size)
+        memo.get(ti.ATR, self.test_data, 14)
+        memo.get(ti.ATR, self.test_data, 10)
+        self.assertEqual(1, memo.hits)
+        self.assertEqual(4, memo.misses)
+
+    def test_result_disk(self):
+        '''results on disk must be found by a new cache'''
+        path = tempfile.mkdtemp()
+        try:
+            cache.IndicatorCache(path=path).get(ti.RSI, self.test_data, 14)
+            memo = cache.IndicatorCache(path=path)
+            result = memo.get(ti.RSI, self.test_data, 14)
+            pd.testing.assert_series_equal(ti.RSI(self.test_data, 14), result)
+            self.assertEqual(1, memo.disk_hits)
+            self.assertEqual(0, memo.misses)
+            memo.clear(disk=True)
+            self.assertEqual([], os.listdir(path))
+        finally:
+            shutil.rmtree(path)
+
+    def test_result_assume_immutable(self):
+        '''same object must be fingerprinted once when inputs are immutable'''
+        memo = cache.IndicatorCache(assume_immutable=True)
+        data = self.test_data.copy()
+        memo.get(ti.RSI, data, 14)
+        memo.get(ti.RSI, data, 14)
+        memo.get(ti.RSI, data.copy(), 14)
+        self.assertEqual(2, memo.hits)
+        self.assertEqual(1, len(memo._fingerprints))
+
+    def test_fingerprint(self):
+        '''fingerprint must depend on values, columns and index'''
+        base = cache.fingerprint(self.test_data)
+        self.assertEqual(base, cache.fingerprint(self.test_data.copy()))
+        self.assertNotEqual(base, cache.fingerprint(self.test_data.rename(columns={'Open': 'open'})))
+        self.assertNotEqual(base, cache.fingerprint(self.test_data.set_axis(self.test_data.index + 1)))
+
+# Test results extended from saved recursive states
+class ResumeCache(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    # Indicators that can be resumed
+    calls = [(ti.ADX, (14,)), (ti.ATR, (14,)), (ti.RSI, (14,)),
+             (ti.MACD, (26, 12, 9)), (ti.bollband, (20,)), (ti.OBV, ())]
+
+    def test_resume_equal(self):
+        '''resumed results must be equal to a full computation'''
+        memo = cache.IndicatorCache(resume=True)
+        for func, args in self.calls:
+            memo.get(func, self.test_data.iloc[:10], *args)
+            memo.get(func, self.test_data.iloc[:40], *args)
+            result = memo.get(func, self.test_data, *args)
+            expected = func(self.test_data, *args)
+            if isinstance(expected, pd.Series):
+                pd.testing.assert_series_equal(expected, result, rtol=1e-9)
+            else:
+                pd.testing.assert_frame_equal(expected, result, rtol=1e-9)
+        self.assertEqual(2 * len(self.calls), memo.resumes)
+
+    def test_resume_series(self):
+        '''close prices as a series must be resumed'''
+        memo = cache.IndicatorCache(resume=True)
+        close = self.test_data['Close']
+        memo.get(ti.RSI, close.iloc[:50], 14)
+        result = memo.get(ti.RSI, close, 14)
+        pd.testing.assert_series_equal(ti.RSI(close, 14), result, rtol=1e-9)
+        self.assertEqual(1, memo.resumes)
+
+    def test_resume_changed_prefix(self):
+        '''changed leading rows must be computed again'''
+        memo = cache.IndicatorCache(resume=True)
+        memo.get(ti.ADX, self.test_data.iloc[:40], 14)
+        changed = self.test_data.copy()
+        changed.loc[10, 'High'] += 1
+        result = memo.get(ti.ADX, changed, 14)
+        pd.testing.assert_frame_equal(ti.ADX(changed, 14), result, rtol=1e-9)
+        self.assertEqual(0, memo.resumes)
+
+    def test_resume_full_output(self):
+        '''full output calls must not be resumed'''
+        memo = cache.IndicatorCache(resume=True)
+        memo.get(ti.ATR, self.test_data.iloc[:40], 14, full_output=True)
+        result = memo.get(ti.ATR, self.test_data, 14, full_output=True)
+        pd.testing.assert_frame_equal(ti.ATR(self.test_data, 14, full_output=True), result)
+        self.assertEqual(0, memo.resumes)
+
+    def test_resume_off(self):
+        '''without resume results must come from the function'''
+        memo = cache.IndicatorCache()
+        memo.get(ti.RSI, self.test_data.iloc[:40], 14)
+        memo.get(ti.RSI, self.test_data, 14)
+        self.assertEqual(0, memo.resumes)
+        self.assertEqual(2, memo.misses)
+
+# Test inputs
+class BadInputCache(unittest.TestCase):
+    def test_bad_size(self):
+        '''negative size raise ValueError'''
+        self.assertRaises(ValueError, cache.IndicatorCache, -1)
+
+    def test_bad_assume_immutable(self):
+        '''assume_immutable that is not a boolean raise TypeError'''
+        self.assertRaises(TypeError, cache.IndicatorCache, assume_immutable='Yes')
+
+    def test_bad_resume(self):
+        '''resume that is not a boolean raise TypeError'''
+        self.assertRaises(TypeError, cache.IndicatorCache, resume=1)
+
+if __name__ == '__main__':
+    unittest.main()
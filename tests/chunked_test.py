@@ -0,0 +1,115 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import chunked
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test chunked results against in-memory results
+class ResultsChunked(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    test_series = pd.read_csv('test_data/correct_series.csv')['Close']
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    # Indicators, chunked versions and input parameters
+    indicators = [
+        (ti.ADX, chunked.ADXChunks, (12,)),
+        (ti.ATR, chunked.ATRChunks, (12,)),
+        (ti.bollband, chunked.BollingerChunks, (12,)),
+        (ti.MACD, chunked.MACDChunks, (26, 12, 9)),
+        (ti.RSI, chunked.RSIChunks, (12,)),
+        (ti.OBV, chunked.OBVChunks, ()),
+    ]
+
+    # Block sizes, smaller and bigger than the warm up
+    chunksizes = [1, 7, 25, 1000]
+
+    def test_result_chunked(self):
+        '''concatenated blocks must be equal to the in-memory result'''
+        for func, chunks, args in self.indicators:
+            expected = func(self.test_data, *args)
+            for chunksize in self.chunksizes:
+                result = pd.concat(chunked.run_chunked(self.test_data, chunks(*args), chunksize))
+                self.assertEqual(list(pd.DataFrame(expected).columns), list(pd.DataFrame(result).columns))
+                np.testing.assert_allclose(pd.DataFrame(expected).to_numpy(dtype=float),
+                                           pd.DataFrame(result).to_numpy(dtype=float),
+                                           rtol=1e-9, atol=1e-12,
+                                           err_msg=func.__name__ + ' ' + str(chunksize))
+
+    def test_result_bollband_mult(self):
+        '''bollinger blocks must match the in-memory result for any multiplier'''
+        expected = ti.bollband(self.test_data, 12, mult=1.5)
+        for chunksize in self.chunksizes:
+            result = pd.concat(chunked.run_chunked(self.test_data, chunked.BollingerChunks(12, 1.5), chunksize))
+            pd.testing.assert_frame_equal(expected, result, check_exact=False)
+
+    def test_result_series(self):
+        '''close price indicators must accept blocks of a series'''
+        expected = ti.RSI(self.test_series, 12)
+        result = pd.concat(chunked.run_chunked(self.test_series, chunked.RSIChunks(12), 10))
+        np.testing.assert_allclose(expected, result, rtol=1e-9)
+
+    def test_result_csv(self):
+        '''blocks read from a csv file must give the in-memory result'''
+        expected = ti.ATR(pd.read_csv('test_data/correct_ohlc.csv'), 12)
+        result = pd.concat(chunked.run_chunked('test_data/correct_ohlc.csv', chunked.ATRChunks(12), 16))
+        pd.testing.assert_frame_equal(expected, result, check_exact=False)
+
+    def test_result_missing_values(self):
+        '''missing values must be handled as in the in-memory result'''
+        data = self.test_data.copy()
+        data.loc[[30, 31, 60], ['High', 'Low', 'Close', 'Volume']] = np.nan
+        for func, chunks, args in self.indicators:
+            expected = pd.DataFrame(func(data, *args)).to_numpy(dtype=float)
+            result = pd.concat(chunked.run_chunked(data, chunks(*args), 9))
+            np.testing.assert_allclose(expected, pd.DataFrame(result).to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-12, err_msg=func.__name__)
+
+    def test_result_performance(self):
+        '''chunked performance must be equal to the in-memory metrics'''
+        result = chunked.performance_chunked(self.test_daily, 0.05, 'D', chunksize=50)
+        self.assertAlmostEqual(pi.CAGR(self.test_daily, 'D'), result['cagr'])
+        self.assertAlmostEqual(pi.volatility(self.test_daily, 'D'), result['volatility'])
+        self.assertAlmostEqual(pi.sharpe(self.test_daily, 0.05, 'D'), result['sharpe'])
+        self.assertAlmostEqual(pi.max_dd(self.test_daily), result['max_dd'])
+
+    def test_result_obv_int(self):
+        '''integer volume must give integer obv'''
+        data = self.test_data.assign(Volume=self.test_data['Volume'].astype(int))
+        result = pd.concat(chunked.run_chunked(data, chunked.OBVChunks(), 10))
+        self.assertEqual(ti.OBV(data)['obv'].dtype, result['obv'].dtype)
+
+# Test inputs
+class BadInputChunked(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+
+    def test_chunksize(self):
+        '''non positive chunk size raise ValueError'''
+        self.assertRaises(ValueError, chunked.read_chunks, self.test_data, 0)
+
+    def test_source(self):
+        '''source that is not a path, DataFrame or iterable raise TypeError'''
+        self.assertRaises(TypeError, chunked.read_chunks, 12)
+
+    def test_parameter_not_int(self):
+        '''ma parameter that is not integer raise TypeError'''
+        self.assertRaises(TypeError, chunked.ATRChunks, 11.59)
+
+    def test_missing_column(self):
+        '''block with a missing column raise IndexError'''
+        self.assertRaises(IndexError, chunked.ADXChunks(12).update, self.test_data.drop(columns=['High']))
+
+    def test_more_than_one_close_column(self):
+        '''block with more than one close column raise KeyError'''
+        self.assertRaises(KeyError, chunked.RSIChunks(12).update, self.test_data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,4 +6,16 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../'
 
 # Add functions/scripts
 import technical
-import performance
\ No newline at end of file
+import performance
+import streaming
+import backend
+import sweep
+import universe
+import store
+import chunked
+import cache
+import instrument
+import rolling
+import expanding
+import pipeline
+import resample
\ No newline at end of file
@@ -0,0 +1,136 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+import adx_test
+import atr_test
+import rsi_test
+import macd_test
+import bollinger_band_test
+import obv_test
+import cagr_test
+import volatility_test
+import sharpe_test
+import maxdd_test
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# float32 keeps about 7 significant digits. Results are compared
+# with the float64 fixtures with a relative tolerance of 1e-4.
+# MACD lines are differences of two close averages, so their error
+# follows the price level: an absolute tolerance of 1e-6 times
+# the largest price is used for them.
+RTOL = 1e-4
+PRICE_ATOL = 1e-6
+
+# Test float32 results against the float64 fixtures
+class ResultsFloat32(unittest.TestCase):
+    def assert_close(self, expected, result, atol=0.0):
+        self.assertEqual(np.float32, result.dtype)
+        pd.testing.assert_series_equal(expected.astype(float), result.astype(float),
+                                       check_names=False, rtol=RTOL, atol=atol)
+
+    def test_result_adx(self):
+        '''adx in float32 must match fixtures'''
+        case = adx_test.ResultsADX
+        result = ti.ADX(case.test_data, case.ma, dtype='float32')
+        self.assert_close(case.results_adx, result['adx'])
+        self.assert_close(case.results_dx, result['dx'])
+
+    def test_result_atr(self):
+        '''atr in float32 must match fixtures'''
+        case = atr_test.ResultsATR
+        result = ti.ATR(case.test_data, case.ma, dtype='float32')
+        self.assert_close(case.result_atr, result['atr'])
+        self.assert_close(case.result_tr, result['tr'])
+
+    def test_result_rsi(self):
+        '''rsi in float32 must match fixtures'''
+        case = rsi_test.ResultsRSI
+        result = ti.RSI(case.test_data, case.ma, dtype='float32')
+        self.assert_close(case.results_rsi, result)
+
+    def test_result_macd(self):
+        '''macd in float32 must match fixtures up to the price level tolerance'''
+        case = macd_test.ResultsMACD
+        atol = PRICE_ATOL * case.test_data['Close'].max()
+        result = ti.MACD(case.test_data, case.slow, case.fast, case.ma, dtype='float32')
+        self.assert_close(case.results_line, result['macd_line'], atol)
+        self.assert_close(case.results_signal, result['macd_signal'], atol)
+
+    def test_result_bollband(self):
+        '''bollinger bands in float32 must match fixtures'''
+        case = bollinger_band_test.ResultsBollBand
+        result = ti.bollband(case.test_data, case.ma, dtype='float32')
+        self.assert_close(case.results_up, result['bollband_up'])
+        self.assert_close(case.results_low, result['bollband_low'])
+
+    def test_result_obv(self):
+        '''obv keeps integer volume type, float volume follows dtype'''
+        case = obv_test.ResultsOBV
+        result = ti.OBV(case.test_data, dtype='float32')
+        pd.testing.assert_series_equal(case.results_obv, result['obv'], check_names=False)
+        data = case.test_data.astype({'Volume': float})
+        result = ti.OBV(data, dtype='float32')
+        self.assert_close(case.results_obv, result['obv'])
+
+    def test_result_full_output(self):
+        '''computed columns of full output must be float32'''
+        case = adx_test.ResultsADX
+        result = ti.ADX(case.test_data, case.ma, full_output=True, dtype='float32')
+        for col in ['tr', 'dm_pos', 'roll_tr', 'di_pos', 'dx', 'adx']:
+            self.assertEqual(np.float32, result[col].dtype)
+
+    def test_result_panel(self):
+        '''panel results in float32 must match single symbol results'''
+        data = adx_test.ResultsADX.test_data[['High', 'Low', 'Close']]
+        panel = pd.concat({'A': data, 'B': data * 2}, axis=1)
+        result = ti.RSI(panel, 12, dtype='float32')
+        self.assertEqual(np.float32, result[('A', 'rsi')].dtype)
+        pd.testing.assert_series_equal(ti.RSI(data, 12).astype(float), result[('B', 'rsi')].astype(float),
+                                       check_names=False, rtol=RTOL)
+
+    def test_result_performance(self):
+        '''performance indicators in float32 must match fixtures'''
+        results = [
+            (pi.CAGR(cagr_test.ResultsCAGR.test_daily, 'D', dtype='float32'),
+             cagr_test.ResultsCAGR.results_daily),
+            (pi.volatility(volatility_test.ResultsVol.test_daily, 'D', dtype='float32'),
+             volatility_test.ResultsVol.results_daily),
+            (pi.sharpe(sharpe_test.ResultsSharpe.test_daily, 0.1, 'D', dtype='float32'),
+             sharpe_test.ResultsSharpe.results_daily),
+            (pi.max_dd(maxdd_test.ResultsMaxDrawdown.test_daily, dtype='float32'),
+             maxdd_test.ResultsMaxDrawdown.results_daily),
+        ]
+        for result, expected in results:
+            self.assertEqual(np.float32, result.dtype)
+            self.assertTrue(np.isclose(expected, result, rtol=RTOL, atol=0))
+
+    def test_result_report(self):
+        '''performance report in float32 must match float64 report'''
+        data = cagr_test.ResultsCAGR.test_daily
+        result = pi.performance_report(data, 0.05, 'D', dtype='float32')
+        self.assertEqual(np.float32, result.dtype)
+        pd.testing.assert_series_equal(pi.performance_report(data, 0.05, 'D'), result.astype(float),
+                                       rtol=RTOL)
+
+# Test inputs
+class BadInputDtype(unittest.TestCase):
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+
+    def test_bad_dtype_technical(self):
+        '''dtype other than float32 or float64 raise ValueError'''
+        self.assertRaises(ValueError, ti.ADX, self.test_data, 14, dtype='int64')
+        self.assertRaises(ValueError, ti.OBV, self.test_data, dtype='float16')
+
+    def test_bad_dtype_performance(self):
+        '''dtype other than float32 or float64 raise ValueError'''
+        self.assertRaises(ValueError, pi.CAGR, self.test_data['Close'], dtype=object)
+
+if __name__ == '__main__':
+    unittest.main()
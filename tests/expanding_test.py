@@ -0,0 +1,97 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+from context import expanding
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test expanding results against the scalar functions on each prefix
+class ResultsExpanding(unittest.TestCase):
+    # Input data
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+    test_intraday = pd.read_csv('test_data/correct_series.csv')
+    test_matrix = pd.read_csv('test_data/ohlc_monthly.csv')[['Open', 'High', 'Low', 'Close']]
+
+    # Metrics, input parameters of the expanding and scalar functions
+    metrics = [
+        (expanding.CAGR, pi.CAGR, ('D',)),
+        (expanding.volatility, pi.volatility, ('D',)),
+        (expanding.sharpe, pi.sharpe, (0.05, 'D')),
+        (expanding.max_dd, pi.max_dd, ()),
+        (expanding.calmar, pi.calmar, ('D', False)),
+    ]
+
+    def expected(self, func, series, args):
+        '''scalar function called on every prefix'''
+        values = np.full(series.shape[0], np.nan)
+        for i in range(series.shape[0]):
+            try:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[i] = func(series.iloc[:i+1], *args)
+            except ZeroDivisionError:
+                pass
+        return values
+
+    def test_result_prefixes(self):
+        '''expanding results must match the scalar function on every prefix'''
+        series = self.test_intraday['Close']
+        for func, scalar, args in self.metrics:
+            result = func(self.test_intraday, *args).to_numpy()
+            expected = self.expected(scalar, series, args)
+            if func is expanding.calmar:
+                # Flat prefixes are 0 / 0, the scalar CAGR is a rounding error there
+                flat = expanding.max_dd(self.test_intraday).to_numpy() == 0
+                result, expected = result[~flat], expected[~flat]
+            np.testing.assert_allclose(expected, result, rtol=1e-9, atol=1e-9,
+                                       err_msg=func.__name__)
+
+    def test_result_last(self):
+        '''last value must be the scalar function of the whole series'''
+        for func, scalar, args in self.metrics:
+            self.assertAlmostEqual(scalar(self.test_daily, *args), func(self.test_daily, *args).iloc[-1])
+
+    def test_result_index(self):
+        '''expanding results must be aligned to the input index'''
+        data = self.test_intraday.set_index('Datetime')
+        result = expanding.volatility(data)
+        self.assertIsInstance(result, pd.Series)
+        self.assertEqual('volatility', result.name)
+        pd.testing.assert_index_equal(data.index, result.index)
+        self.assertTrue(result.iloc[:2].isna().all())
+
+    def test_result_matrix(self):
+        '''matrix results must be equal to single asset results for every column'''
+        for func, _, args in self.metrics:
+            results = func(self.test_matrix, *args, matrix=True)
+            self.assertIsInstance(results, pd.DataFrame)
+            for col in self.test_matrix.columns:
+                pd.testing.assert_series_equal(func(self.test_matrix[col], *args), results[col],
+                                               check_names=False)
+
+# Test inputs
+class BadInputExpanding(unittest.TestCase):
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    def test_bad_data(self):
+        '''data that is not pandas raise TypeError'''
+        self.assertRaises(TypeError, expanding.volatility, [1, 2, 3])
+
+    def test_bad_matrix(self):
+        '''matrix that is not a boolean raise TypeError'''
+        self.assertRaises(TypeError, expanding.max_dd, self.test_daily, 1)
+
+    def test_bad_rf_rate(self):
+        '''rf_rate out of range raise ValueError'''
+        self.assertRaises(ValueError, expanding.sharpe, self.test_daily, 1.5)
+
+    def test_bad_frequency(self):
+        '''unknown frequency raise ValueError'''
+        self.assertRaises(ValueError, expanding.calmar, self.test_daily, 'H')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+from context import rolling
+from context import streaming
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test intraday frequencies and frequency inference
+class ResultsFrequency(unittest.TestCase):
+    # Input data, 5 minute bars with a time column and daily closes
+    test_intraday = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    test_monthly = pd.read_csv('test_data/ohlc_monthly.csv').drop(columns=['Adj Close'])
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    def test_result_intraday_periods(self):
+        '''intraday periods must be bars in a session times trading days'''
+        self.assertAlmostEqual(pi.SESSION_HOURS * 60 * 252, pi._periods('1m', True))
+        self.assertAlmostEqual(pi.SESSION_HOURS * 12 * 252, pi._periods('5m', True))
+        self.assertAlmostEqual(pi.SESSION_HOURS * 365, pi._periods('1h', False))
+
+    def test_result_intraday(self):
+        '''intraday frequency must be equal to its number of periods'''
+        periods = pi.SESSION_HOURS * 12 * 252
+        self.assertAlmostEqual(pi.volatility(self.test_intraday, periods),
+                               pi.volatility(self.test_intraday, '5m'))
+        self.assertAlmostEqual(pi.sharpe(self.test_intraday, 0.05, periods),
+                               pi.sharpe(self.test_intraday, 0.05, '5m'))
+
+    def test_result_infer_column(self):
+        '''frequency inferred from a time column'''
+        self.assertEqual(pi._periods('5m', True), pi._periods('infer', True, self.test_intraday))
+        pd.testing.assert_series_equal(pi.performance_report(self.test_intraday, 0.05, '5m'),
+                                       pi.performance_report(self.test_intraday, 0.05, 'infer'))
+
+    def test_result_infer_index(self):
+        '''frequency inferred from a DatetimeIndex'''
+        data = self.test_intraday.set_index(pd.to_datetime(self.test_intraday['Datetime']))
+        self.assertEqual(pi.calmar(data, '5m'), pi.calmar(data, 'infer'))
+        pd.testing.assert_series_equal(rolling.sharpe(data, 10, 0.05, '5m'),
+                                       rolling.sharpe(data, 10, 0.05, 'infer'))
+
+    def test_result_infer_daily(self):
+        '''daily, weekly, monthly and yearly steps must match their codes'''
+        close = self.test_monthly['Close']
+        self.assertEqual(pi.CAGR(self.test_monthly, 'M'), pi.CAGR(self.test_monthly, 'infer'))
+        for freq, code in [('B', 'D'), ('W', 'W'), ('MS', 'M'), ('YS', 'Y')]:
+            series = close.set_axis(pd.date_range('2001-01-01', periods=close.shape[0], freq=freq))
+            for only_business in [True, False]:
+                self.assertEqual(pi._periods(code, only_business),
+                                 pi._periods('infer', only_business, series))
+
+    def test_result_tracker(self):
+        '''tracker must accept intraday frequencies'''
+        tracker = streaming.PerformanceTracker('5m')
+        tracker.update(self.test_intraday['Close'])
+        self.assertAlmostEqual(pi.volatility(self.test_intraday, '5m'), tracker.volatility())
+
+# Test inputs
+class BadInputFrequency(unittest.TestCase):
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    def test_infer_without_timestamps(self):
+        '''infer without a DatetimeIndex or time column raise ValueError'''
+        self.assertRaises(ValueError, pi.CAGR, self.test_daily, 'infer')
+
+    def test_infer_decreasing(self):
+        '''decreasing timestamps raise ValueError'''
+        data = self.test_daily.set_axis(pd.date_range('2001-01-01', periods=self.test_daily.shape[0])[::-1])
+        self.assertRaises(ValueError, pi.volatility, data, 'infer')
+
+    def test_infer_streaming(self):
+        '''tracker can not infer frequency raise ValueError'''
+        self.assertRaises(ValueError, streaming.PerformanceTracker, 'infer')
+
+    def test_negative_periods(self):
+        '''non positive number of periods raise ValueError'''
+        self.assertRaises(ValueError, pi.CAGR, self.test_daily, -12)
+
+    def test_unknown_intraday(self):
+        '''unknown intraday code raise ValueError'''
+        self.assertRaises(ValueError, pi.CAGR, self.test_daily, '7m')
+
+if __name__ == '__main__':
+    unittest.main()
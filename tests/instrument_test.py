@@ -0,0 +1,123 @@
+import os
+import unittest
+import tracemalloc
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import instrument
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test recorded calls
+class ResultsInstrument(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_result_disabled(self):
+        '''nothing must be recorded while disabled'''
+        ti.ADX(self.test_data, 14)
+        self.assertEqual({}, instrument.report())
+
+    def test_result_same_output(self):
+        '''instrumented calls must return the same results'''
+        expected = ti.ADX(self.test_data, 14)
+        with instrument.recording():
+            result = ti.ADX(self.test_data, 14)
+        pd.testing.assert_frame_equal(expected, result)
+
+    def test_result_totals(self):
+        '''calls, rows and stages must be recorded for each function'''
+        with instrument.recording():
+            ti.ADX(self.test_data, 14)
+            ti.ADX(self.test_data, 14, full_output=True)
+            pi.CAGR(self.test_data, 'D')
+        report = instrument.report()
+        self.assertEqual(2, report['technical.ADX']['calls'])
+        self.assertEqual(2 * self.test_data.shape[0], report['technical.ADX']['rows'])
+        self.assertEqual({'columns', 'validation', 'compute', 'output'},
+                         set(report['technical.ADX']['stages']))
+        self.assertLessEqual(sum(report['technical.ADX']['stages'].values()),
+                             report['technical.ADX']['seconds'])
+        self.assertEqual(1, report['performance.CAGR']['calls'])
+        self.assertFalse(instrument.is_enabled())
+
+    def test_result_errors(self):
+        '''calls raising an exception must be counted as errors'''
+        with instrument.recording():
+            self.assertRaises(TypeError, ti.RSI, self.test_data, 14.0)
+        self.assertEqual(1, instrument.report()['technical.RSI']['errors'])
+
+    def test_result_memory(self):
+        '''peak memory must be recorded when asked'''
+        with instrument.recording(memory=True):
+            pi.sharpe(self.test_data, 0.05, 'D')
+        report = instrument.report()
+        self.assertGreater(report['performance.sharpe']['peak_bytes'], 0)
+        self.assertGreaterEqual(report['performance.sharpe']['peak_bytes'],
+                                report['performance.CAGR']['peak_bytes'])
+
+    def test_result_memory_off(self):
+        '''turning memory off must stop the tracing started for it'''
+        try:
+            instrument.enable(memory=True)
+            self.assertTrue(tracemalloc.is_tracing())
+            instrument.enable(memory=False)
+            self.assertFalse(tracemalloc.is_tracing())
+        finally:
+            instrument.disable()
+
+    def test_result_memory_off_foreign_tracing(self):
+        '''tracing started outside the module must keep running'''
+        tracemalloc.start()
+        try:
+            instrument.enable(memory=True)
+            instrument.enable(memory=False)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            instrument.disable()
+            tracemalloc.stop()
+
+    def test_result_hooks(self):
+        '''hooks must receive a record of each call'''
+        records = []
+        instrument.add_hook(records.append)
+        try:
+            with instrument.recording():
+                ti.OBV(self.test_data)
+        finally:
+            instrument.remove_hook(records.append)
+        self.assertEqual(1, len(records))
+        self.assertEqual('technical.OBV', records[0]['function'])
+        self.assertFalse(records[0]['error'])
+
+    def test_result_prometheus(self):
+        '''prometheus text must have one sample for each function and stage'''
+        with instrument.recording():
+            ti.ATR(self.test_data, 14)
+        text = instrument.prometheus()
+        self.assertIn('finance_toolkit_calls_total{function="technical.ATR"} 1', text)
+        self.assertIn('finance_toolkit_stage_seconds_total{function="technical.ATR",stage="compute"}', text)
+        self.assertIn('# TYPE finance_toolkit_peak_bytes gauge', text)
+
+# Test inputs
+class BadInputInstrument(unittest.TestCase):
+    def test_bad_memory(self):
+        '''memory that is not a boolean raise TypeError'''
+        self.assertRaises(TypeError, instrument.enable, 'Yes')
+
+    def test_bad_hook(self):
+        '''hook that is not callable raise TypeError'''
+        self.assertRaises(TypeError, instrument.add_hook, 1)
+
+if __name__ == '__main__':
+    unittest.main()
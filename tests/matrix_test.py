@@ -0,0 +1,73 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test matrix results against single asset results
+class ResultsMatrix(unittest.TestCase):
+    # Input data, one column for each asset
+    test_monthly = pd.read_csv('test_data/ohlc_monthly.csv')
+    test_matrix = test_monthly[['Open', 'High', 'Low', 'Close', 'Adj Close']]
+    test_panel = pd.concat({'AAA': test_monthly.drop(columns=['Adj Close']),
+                            'BBB': test_monthly.drop(columns=['Close', 'Adj Close'])
+                                               .assign(Close=test_monthly['Adj Close'])}, axis=1)
+
+    # Metrics and input parameters
+    metrics = [
+        (pi.CAGR, ('M',)),
+        (pi.volatility, ('M',)),
+        (pi.sharpe, (0.05, 'M')),
+        (pi.max_dd, ()),
+        (pi.calmar, ('M',)),
+    ]
+
+    def test_result_matrix(self):
+        '''matrix result must be equal to single asset result for every column'''
+        for func, args in self.metrics:
+            results = func(self.test_matrix, *args, matrix=True)
+            self.assertIsInstance(results, pd.Series)
+            for col in self.test_matrix.columns:
+                expected = func(self.test_matrix[col], *args)
+                self.assertAlmostEqual(expected, results[col], msg=func.__name__ + ' ' + col)
+
+    def test_result_panel(self):
+        '''panel result must use the close field of every symbol'''
+        for func, args in self.metrics:
+            results = func(self.test_panel, *args)
+            self.assertAlmostEqual(func(self.test_monthly['Close'], *args), results['AAA'])
+            self.assertAlmostEqual(func(self.test_monthly['Adj Close'], *args), results['BBB'])
+
+    def test_result_sharpe_zero_volatility(self):
+        '''assets with zero volatility must have NaN sharpe in matrix mode'''
+        test_constant = self.test_matrix.assign(Const=100.0)
+        results = pi.sharpe(test_constant, 0.05, 'M', matrix=True)
+        self.assertTrue(np.isnan(results['Const']))
+        self.assertAlmostEqual(pi.sharpe(self.test_matrix['Close'], 0.05, 'M'), results['Close'])
+
+# Test inputs
+class BadInputMatrix(unittest.TestCase):
+    # Input data
+    test_monthly = pd.read_csv('test_data/ohlc_monthly.csv')
+    test_more_close = pd.concat({'AAA': test_monthly}, axis=1)
+    test_no_close = pd.concat({'AAA': test_monthly.drop(columns=['Close', 'Adj Close'])}, axis=1)
+
+    def test_matrix_parameter(self):
+        '''invalid value for matrix raise TypeError'''
+        self.assertRaises(TypeError, pi.max_dd, self.test_monthly[['Close']], matrix='Yes')
+
+    def test_panel_more_close(self):
+        '''panel with more than 1 close field raise KeyError'''
+        self.assertRaises(KeyError, pi.CAGR, self.test_more_close)
+
+    def test_panel_no_close(self):
+        '''panel without close field raise IndexError'''
+        self.assertRaises(IndexError, pi.CAGR, self.test_no_close)
+
+if __name__ == '__main__':
+    unittest.main()
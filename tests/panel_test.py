@@ -0,0 +1,103 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test panel results against single symbol results
+class ResultsPanel(unittest.TestCase):
+    # Input data, third symbol has a shorter history
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    ohlc_scaled = ohlc.copy()
+    ohlc_scaled[['Open', 'High', 'Low', 'Close']] *= 1.5
+    symbols = {
+        'AAA': ohlc.set_index('Datetime'),
+        'BBB': ohlc_scaled.set_index('Datetime'),
+        'CCC': ohlc.iloc[20:].set_index('Datetime'),
+    }
+    test_panel = pd.concat(symbols, axis=1)
+    test_long = pd.concat([df.reset_index().assign(Symbol=sym) for sym, df in symbols.items()],
+                          ignore_index=True)
+
+    # Indicators and input parameters
+    indicators = [
+        (ti.ADX, (12,)),
+        (ti.ATR, (12,)),
+        (ti.bollband, (12,)),
+        (ti.MACD, (26, 12, 9)),
+        (ti.RSI, (12,)),
+        (ti.OBV, ()),
+    ]
+
+    def test_result_panel(self):
+        '''panel result must be equal to single symbol result for every symbol'''
+        for func, args in self.indicators:
+            results = func(self.test_panel, *args)
+            for sym, df in self.symbols.items():
+                expected = pd.DataFrame(func(df, *args))
+                result = results[sym].loc[expected.index]
+                np.testing.assert_allclose(expected.to_numpy(dtype=float),
+                                           result.to_numpy(dtype=float), rtol=1e-10,
+                                           err_msg=func.__name__ + ' ' + sym)
+
+    def test_result_panel_columns(self):
+        '''panel result must have the single symbol columns for every symbol'''
+        for func, args in self.indicators:
+            results = func(self.test_panel, *args)
+            expected = pd.DataFrame(func(self.symbols['AAA'], *args))
+            for sym in self.symbols:
+                self.assertEqual(list(expected.columns), list(results[sym].columns))
+
+    def test_result_panel_columns_full(self):
+        '''panel full output must have the single symbol columns for every symbol'''
+        for func, args in self.indicators:
+            results = func(self.test_panel, *args, full_output=True)
+            expected = func(self.symbols['AAA'], *args, full_output=True)
+            for sym in self.symbols:
+                self.assertEqual(list(expected.columns), list(results[sym].columns))
+
+    def test_result_long(self):
+        '''long format result must be equal to panel result row by row'''
+        for func, args in self.indicators:
+            panel = func(self.test_panel, *args)
+            results = func(self.test_long, *args)
+            self.assertEqual(self.test_long.shape[0], results.shape[0])
+            for sym in self.symbols:
+                rows = self.test_long['Symbol'] == sym
+                expected = panel[sym].loc[self.test_long.loc[rows, 'Datetime']]
+                np.testing.assert_allclose(expected.to_numpy(dtype=float),
+                                           results.loc[rows, expected.columns].to_numpy(dtype=float),
+                                           err_msg=func.__name__ + ' ' + sym)
+
+    def test_result_long_full(self):
+        '''long format full output must keep input columns'''
+        results = ti.ADX(self.test_long, 12, full_output=True)
+        self.assertEqual(self.test_long.shape[1] + 12, results.shape[1])
+
+# Test input data
+class BadInputPanel(unittest.TestCase):
+    # Input data
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv')
+    test_panel_missing_col = pd.concat({'AAA': ohlc.drop(columns=['High'])}, axis=1)
+    test_panel_more_close = pd.concat({'AAA': ohlc}, axis=1)
+    test_long_duplicated = pd.concat([ohlc, ohlc]).assign(Symbol='AAA')
+
+    def test_panel_missing_column(self):
+        '''if panel has a missing field than should raise IndexError'''
+        self.assertRaises(IndexError, ti.ADX, self.test_panel_missing_col, 12)
+
+    def test_panel_more_than_one_close_column(self):
+        '''if panel has more than one close field than should raise KeyError'''
+        self.assertRaises(KeyError, ti.RSI, self.test_panel_more_close, 12)
+
+    def test_long_duplicated_rows(self):
+        '''if long data repeats a symbol and time pair than should raise ValueError'''
+        self.assertRaises(ValueError, ti.ATR, self.test_long_duplicated, 12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import pipeline
+from context import backend
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test pipeline results against one call for each indicator
+class ResultsPipeline(unittest.TestCase):
+    # Input data
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close']).set_index('Datetime')
+    series = pd.read_csv('test_data/series_daily.csv')['Close']
+
+    # Typical dashboard, indicators and input parameters
+    specs = [
+        (ti.ADX, {'ma': 14}),
+        (ti.ATR, {'ma': 14}),
+        (ti.ATR, {'ma': 20}, 'atr20'),
+        (ti.RSI, {'ma': 14}),
+        (ti.MACD, {'slow': 26, 'fast': 12, 'ma': 9}),
+        (ti.MACD, {'slow': 40, 'fast': 26, 'ma': 9}, 'macd_long'),
+        (ti.bollband, {'ma': 20}),
+        (ti.bollband, {'ma': 20, 'mult': 1.5}, 'bollband_narrow'),
+        (ti.OBV, {}),
+        (pi.CAGR, {'frequency': 'D'}),
+        (pi.volatility, {'frequency': 'D'}),
+        (pi.sharpe, {'rf_rate': 0.05, 'frequency': 'D'}),
+        (pi.max_dd, {}),
+        (pi.calmar, {'frequency': 'D', 'only_business': False}),
+        (pi.performance_report, {'rf_rate': 0.05, 'frequency': 'D'}),
+    ]
+
+    def check(self, data, specs):
+        '''results must be equal to calling each function'''
+        results = pipeline.run_pipeline(data, specs)
+        self.assertEqual([spec[2] if len(spec) == 3 else spec[0].__name__ for spec in specs],
+                         list(results))
+        for spec, result in zip(specs, results.values()):
+            expected = spec[0](data, **spec[1])
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(expected, result)
+            elif isinstance(expected, pd.Series):
+                pd.testing.assert_series_equal(expected, result)
+            else:
+                self.assertAlmostEqual(expected, result, places=12)
+
+    def test_result_dashboard(self):
+        '''every indicator of a dashboard must match its function'''
+        self.check(self.ohlc, self.specs)
+
+    def test_result_float32(self):
+        '''float32 results must match the functions in float32'''
+        specs = [(spec[0], dict(spec[1], dtype='float32')) + spec[2:] for spec in self.specs]
+        self.check(self.ohlc, specs)
+
+    def test_result_series(self):
+        '''close based indicators must accept a series'''
+        self.check(self.series, [(ti.RSI, {'ma': 5}), (ti.bollband, {'ma': 4}),
+                                 (pi.performance_report, {'rf_rate': 0.05})])
+
+    def test_result_macd_backends(self):
+        '''macd must match the function to the last bit with every backend and dtype'''
+        previous = backend._backend
+        try:
+            for name in backend.available_backends():
+                backend.set_backend(name)
+                for dtype in ['float64', 'float32']:
+                    spec = (ti.MACD, {'slow': 26, 'fast': 12, 'ma': 9, 'dtype': dtype})
+                    result = pipeline.run_pipeline(self.ohlc, [spec])['MACD']
+                    pd.testing.assert_frame_equal(ti.MACD(self.ohlc, 26, 12, 9, dtype=dtype), result,
+                                                  check_exact=True)
+        finally:
+            backend._backend = previous
+
+    def test_result_missing_values(self):
+        '''missing bars must give the results of each function'''
+        data = self.ohlc.copy()
+        data.iloc[30, data.columns.get_loc('High')] = np.nan
+        data.iloc[40, data.columns.get_loc('Close')] = np.nan
+        self.check(data, [(ti.ADX, {'ma': 12}), (ti.RSI, {'ma': 12})])
+
+    def test_result_fallback(self):
+        '''full output and other functions must be called directly'''
+        self.check(self.ohlc, [(ti.ADX, {'ma': 14, 'full_output': True}),
+                               (ti.ADX, {'ma': 14}, 'adx'),
+                               (lambda df, ma: df['Close'].rolling(ma).mean(), {'ma': 5}, 'sma')])
+
+    def test_plan(self):
+        '''every intermediate series must appear once in the plan'''
+        plan = pipeline.plan_pipeline(self.ohlc, self.specs)
+        self.assertEqual(len(plan), len(set(plan)))
+        names = [key[0] for key in plan]
+        self.assertEqual(1, names.count('tr'))
+        self.assertEqual(1, names.count('returns'))
+        # One fused node for each distinct MACD
+        self.assertEqual(2, names.count('macd'))
+
+# Test inputs
+class BadInputPipeline(unittest.TestCase):
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+
+    def test_bad_specs(self):
+        '''specs that are not tuples raise ValueError'''
+        self.assertRaises(ValueError, pipeline.run_pipeline, self.ohlc, [ti.RSI])
+
+    def test_duplicated_names(self):
+        '''two specs with the same name raise ValueError'''
+        self.assertRaises(ValueError, pipeline.run_pipeline, self.ohlc,
+                          [(ti.RSI, {'ma': 14}), (ti.RSI, {'ma': 20})])
+
+    def test_bad_parameter(self):
+        '''non integer window raise TypeError'''
+        self.assertRaises(TypeError, pipeline.run_pipeline, self.ohlc, [(ti.ATR, {'ma': 14.0})])
+
+    def test_unknown_parameter(self):
+        '''parameter not in the function signature raise TypeError'''
+        self.assertRaises(TypeError, pipeline.run_pipeline, self.ohlc, [(ti.ATR, {'window': 14})])
+
+    def test_missing_columns(self):
+        '''missing ohlc columns raise IndexError'''
+        self.assertRaises(IndexError, pipeline.run_pipeline, self.ohlc[['Close']],
+                          [(ti.ADX, {'ma': 14})])
+
+    def test_bad_dtype(self):
+        '''unknown dtype raise ValueError'''
+        self.assertRaises(ValueError, pipeline.run_pipeline, self.ohlc,
+                          [(ti.RSI, {'ma': 14, 'dtype': 'float16'})])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test results against single indicators
+class ResultsReport(unittest.TestCase):
+    # Input data
+    test_yearly = pd.Series(range(100, 201, 20))
+    test_monthly = pd.read_csv('test_data/ohlc_monthly.csv').drop(columns=['Adj Close'])
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+    test_matrix = pd.read_csv('test_data/ohlc_monthly.csv')[['Open', 'High', 'Low', 'Close']]
+
+    # Input parameter
+    rate = 0.05
+
+    def expected(self, data, frequency, only_business=True, matrix=False):
+        '''report built from single indicators'''
+        return {
+            'cagr': pi.CAGR(data, frequency, only_business, matrix),
+            'volatility': pi.volatility(data, frequency, only_business, matrix),
+            'sharpe': pi.sharpe(data, self.rate, frequency, only_business, matrix),
+            'max_dd': pi.max_dd(data, matrix),
+            'calmar': pi.calmar(data, frequency, only_business, matrix),
+        }
+
+    def test_result_yearly(self):
+        '''result for yearly data expected'''
+        result = pi.performance_report(self.test_yearly, self.rate, frequency='Y')
+        for name, value in self.expected(self.test_yearly, 'Y').items():
+            self.assertAlmostEqual(value, result[name], msg=name)
+
+    def test_result_monthly(self):
+        '''result for monthly data expected'''
+        result = pi.performance_report(self.test_monthly, self.rate, frequency='M')
+        for name, value in self.expected(self.test_monthly, 'M').items():
+            self.assertAlmostEqual(value, result[name], msg=name)
+
+    def test_result_daily_all_days(self):
+        '''result for daily with all days option'''
+        result = pi.performance_report(self.test_daily, self.rate, 'D', only_business=False)
+        for name, value in self.expected(self.test_daily, 'D', False).items():
+            self.assertAlmostEqual(value, result[name], msg=name)
+
+    def test_result_matrix(self):
+        '''matrix result must have one row for each asset'''
+        result = pi.performance_report(self.test_matrix, self.rate, 'M', matrix=True)
+        self.assertEqual(list(self.test_matrix.columns), list(result.index))
+        for name, value in self.expected(self.test_matrix, 'M', matrix=True).items():
+            np.testing.assert_allclose(value, result[name], err_msg=name)
+
+    def test_result_zero_volatility(self):
+        '''sharpe ratio must be NaN for constant prices'''
+        result = pi.performance_report(pd.Series(np.ones(10)), self.rate)
+        self.assertTrue(np.isnan(result['sharpe']))
+        self.assertEqual(0, result['max_dd'])
+
+# Test inputs
+class BadInputReport(unittest.TestCase):
+    # Input data
+    test_yearly = pd.Series(range(100, 201, 20))
+    test_yearly_list = range(100, 201, 20)
+    test_more_close = pd.read_csv('test_data/ohlc_monthly.csv')
+
+    def test_input_data_not_df_or_series(self):
+        '''data is not a valid type raise TypeError'''
+        self.assertRaises(TypeError, pi.performance_report, self.test_yearly_list, 0.1)
+
+    def test_input_df_more_close(self):
+        '''input df has more than 1 close column'''
+        self.assertRaises(KeyError, pi.performance_report, self.test_more_close, 0.1)
+
+    def test_frequency_parameter(self):
+        '''invalid string for frequency raise ValueError'''
+        self.assertRaises(ValueError, pi.performance_report, self.test_yearly, 0.1, frequency='mo')
+
+    def test_rf_rate_out_of_range(self):
+        '''rf_rate out of range (0-1) raise ValueError'''
+        self.assertRaises(ValueError, pi.performance_report, self.test_yearly, 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import resample
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# pandas aggregation of each field
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def pandas_resample(data, timeframe):
+    '''pandas resample of one timeframe, empty bins dropped'''
+    return data.resample(pd.Timedelta(timeframe)).agg(AGG).dropna(subset=['Close'])
+
+# Test results against pandas resample
+class ResultsResample(unittest.TestCase):
+    # Input data, 5 minute bars with a time column
+    test_ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    # Three sessions of 1 minute bars
+    rng = np.random.default_rng(42)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + ' 09:30', periods=390, freq='min') for day in ['2021-03-01', '2021-03-02', '2021-03-04']
+    ]), name='Datetime')
+    close = 100 + np.cumsum(rng.normal(0, 0.1, index.shape[0]))
+    test_minutes = pd.DataFrame({'Open': close + rng.normal(0, 0.01, index.shape[0]),
+                                 'High': close + rng.random(index.shape[0]),
+                                 'Low': close - rng.random(index.shape[0]),
+                                 'Close': close,
+                                 'Volume': rng.integers(0, 1000, index.shape[0])}, index=index)
+
+    def test_result_timeframes(self):
+        '''every timeframe must be equal to pandas resample'''
+        timeframes = ['5m', '15m', '1h', '1D', '7m']
+        results = resample.resample_ohlcv(self.test_minutes, timeframes)
+        self.assertEqual(timeframes, list(results))
+        for timeframe in timeframes:
+            pd.testing.assert_frame_equal(pandas_resample(self.test_minutes, timeframe), results[timeframe],
+                                          check_freq=False)
+
+    def test_result_time_column(self):
+        '''timestamps read from a time column keep their time zone'''
+        expected = self.test_ohlc.set_index(pd.to_datetime(self.test_ohlc['Datetime'])).drop(columns=['Datetime'])
+        result = resample.resample_ohlcv(self.test_ohlc, ['15m'])['15m']
+        self.assertEqual(expected.index.tz, result.index.tz)
+        pd.testing.assert_frame_equal(pandas_resample(expected, '15m'), result, check_freq=False)
+
+    def dst_bars(self, day):
+        '''Two days of 5 minute bars in New York from midnight of a daylight saving change'''
+        index = pd.date_range(day + ' 00:00', periods=576, freq='5min', tz='America/New_York', name='Datetime')
+        close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 0.1, index.shape[0]))
+        return pd.DataFrame({'Open': close, 'High': close + 0.5, 'Low': close - 0.5, 'Close': close,
+                             'Volume': np.arange(index.shape[0])}, index=index)
+
+    def check_dst(self, data):
+        '''intraday timeframes equal to pandas, daily ones start at local midnight'''
+        timeframes = ['15m', '1h', '3h', '4h', '1D', '2D']
+        results = resample.resample_ohlcv(data, timeframes)
+        for timeframe in ['15m', '1h', '3h', '4h']:
+            pd.testing.assert_frame_equal(pandas_resample(data, timeframe), results[timeframe], check_freq=False)
+        for timeframe in ['1D', '2D']:
+            expected = data.resample(timeframe).agg(AGG).dropna(subset=['Close'])
+            pd.testing.assert_frame_equal(expected, results[timeframe], check_freq=False)
+
+    def test_result_dst_fall_back(self):
+        '''the repeated hour of a fall back change is kept in its own bins'''
+        data = self.dst_bars('2020-11-01')
+        self.check_dst(data)
+        hours = resample.resample_ohlcv(data, ['1h'])['1h'].index
+        self.assertEqual(2, ((hours.day == 1) & (hours.hour == 1)).sum())
+
+    def test_result_dst_spring_forward(self):
+        '''bins after a spring forward change follow elapsed time'''
+        self.check_dst(self.dst_bars('2020-03-08'))
+
+    def test_result_unsorted(self):
+        '''unsorted bars must give the same result as sorted ones'''
+        shuffled = self.test_minutes.sample(frac=1, random_state=1)
+        results = resample.resample_ohlcv(shuffled, ['5m', '1h'])
+        expected = resample.resample_ohlcv(self.test_minutes, ['5m', '1h'])
+        for timeframe in ['5m', '1h']:
+            pd.testing.assert_frame_equal(expected[timeframe], results[timeframe])
+
+    def test_result_missing(self):
+        '''missing values are skipped, as pandas first, last, max and min'''
+        data = self.test_minutes.astype(float)
+        data.iloc[::7, 0] = np.nan
+        data.iloc[::3, 1] = np.nan
+        data.iloc[::5, 3] = np.nan
+        data.iloc[::4, 4] = np.nan
+        result = resample.resample_ohlcv(data, ['5m'])['5m']
+        expected = data.resample('5min').agg(AGG)
+        pd.testing.assert_frame_equal(expected.loc[result.index], result, check_freq=False)
+
+    def test_result_indicators(self):
+        '''indicators on each timeframe must be equal to calling them on the bars'''
+        specs = [(ti.ADX, {'ma': 5}), (ti.RSI, {'ma': 5})]
+        results = resample.run_timeframes(self.test_minutes, ['5m', '15m'], specs)
+        bars = resample.resample_ohlcv(self.test_minutes, ['5m', '15m'])
+        for timeframe in ['5m', '15m']:
+            pd.testing.assert_frame_equal(ti.ADX(bars[timeframe], 5), results[timeframe]['ADX'])
+            pd.testing.assert_series_equal(ti.RSI(bars[timeframe], 5), results[timeframe]['RSI'])
+
+# Test inputs
+class BadInputResample(unittest.TestCase):
+    test_ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+
+    def test_bad_data(self):
+        '''data that is not a DataFrame raise TypeError'''
+        self.assertRaises(TypeError, resample.resample_ohlcv, self.test_ohlc['Close'], ['5m'])
+
+    def test_missing_columns(self):
+        '''missing ohlc columns raise IndexError'''
+        self.assertRaises(IndexError, resample.resample_ohlcv, self.test_ohlc.drop(columns=['High']), ['5m'])
+
+    def test_no_timestamps(self):
+        '''data without timestamps raise IndexError'''
+        self.assertRaises(IndexError, resample.resample_ohlcv, self.test_ohlc.drop(columns=['Datetime']), ['5m'])
+
+    def test_bad_timeframe(self):
+        '''unknown timeframe raise ValueError'''
+        self.assertRaises(ValueError, resample.resample_ohlcv, self.test_ohlc, ['weekly'])
+
+    def test_no_timeframes(self):
+        '''empty list of timeframes raise ValueError'''
+        self.assertRaises(ValueError, resample.resample_ohlcv, self.test_ohlc, [])
+
+if __name__ == '__main__':
+    unittest.main()
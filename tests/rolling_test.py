@@ -0,0 +1,111 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+from context import rolling
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test rolling results against the scalar functions on each window
+class ResultsRolling(unittest.TestCase):
+    # Input data
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+    test_intraday = pd.read_csv('test_data/correct_series.csv')
+    test_matrix = pd.read_csv('test_data/ohlc_monthly.csv')[['Open', 'High', 'Low', 'Close']]
+
+    # Metrics, input parameters of the rolling and scalar functions
+    metrics = [
+        (rolling.CAGR, pi.CAGR, ('D',), ('D',)),
+        (rolling.volatility, pi.volatility, ('D',), ('D',)),
+        (rolling.sharpe, pi.sharpe, (0.05, 'D'), (0.05, 'D')),
+        (rolling.max_dd, pi.max_dd, (), ()),
+        (rolling.calmar, pi.calmar, ('D', False), ('D', False)),
+    ]
+
+    def expected(self, func, series, window, args):
+        '''scalar function called on every window'''
+        values = np.full(series.shape[0], np.nan)
+        for i in range(window - 1, series.shape[0]):
+            try:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values[i] = func(series.iloc[i-window+1:i+1], *args)
+            except ZeroDivisionError:
+                pass
+        return values
+
+    def test_result_windows(self):
+        '''rolling results must match the scalar function on every window'''
+        series = self.test_intraday['Close']
+        for window in [2, 3, 5, 8, 13, 32]:
+            for func, scalar, args, scalar_args in self.metrics:
+                result = func(self.test_intraday, window, *args).to_numpy()
+                expected = self.expected(scalar, series, window, scalar_args)
+                if func is rolling.calmar:
+                    # Flat windows are 0 / 0, the scalar CAGR is a rounding error there
+                    flat = rolling.max_dd(self.test_intraday, window).to_numpy() == 0
+                    result, expected = result[~flat], expected[~flat]
+                np.testing.assert_allclose(expected, result, rtol=1e-9, atol=1e-9,
+                                           err_msg=func.__name__ + ' ' + str(window))
+
+    def test_result_index(self):
+        '''rolling results must be aligned to the input index'''
+        data = self.test_intraday.set_index('Datetime')
+        result = rolling.max_dd(data, 10)
+        self.assertIsInstance(result, pd.Series)
+        self.assertEqual('max_dd', result.name)
+        pd.testing.assert_index_equal(data.index, result.index)
+        self.assertTrue(result.iloc[:9].isna().all())
+
+    def test_result_matrix(self):
+        '''matrix results must be equal to single asset results for every column'''
+        for func, _, args, _ in self.metrics:
+            results = func(self.test_matrix, 6, *args, matrix=True)
+            self.assertIsInstance(results, pd.DataFrame)
+            for col in self.test_matrix.columns:
+                pd.testing.assert_series_equal(func(self.test_matrix[col], 6, *args), results[col],
+                                               check_names=False)
+
+    def test_result_short(self):
+        '''window longer than data must give only NaN'''
+        result = rolling.max_dd(self.test_daily.iloc[:5], 10)
+        self.assertTrue(result.isna().all())
+
+    def test_result_min_ratio(self):
+        '''smallest later to earlier ratio must match a brute force search'''
+        values = np.array([5., 3., 4., 8., 2., 9., 1., 7.])
+        for window in range(1, values.shape[0] + 1):
+            expected = [min(values[k] / values[j] for j in range(s, s + window)
+                            for k in range(j, s + window))
+                        for s in range(values.shape[0] - window + 1)]
+            np.testing.assert_allclose(expected, rolling._min_ratio(values, window))
+
+# Test inputs
+class BadInputRolling(unittest.TestCase):
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    def test_bad_window_type(self):
+        '''window that is not an integer raise TypeError'''
+        self.assertRaises(TypeError, rolling.CAGR, self.test_daily, 10.0)
+
+    def test_bad_window_size(self):
+        '''window with less than two prices raise ValueError'''
+        self.assertRaises(ValueError, rolling.max_dd, self.test_daily, 1)
+
+    def test_bad_data(self):
+        '''data that is not pandas raise TypeError'''
+        self.assertRaises(TypeError, rolling.volatility, [1, 2, 3], 2)
+
+    def test_bad_rf_rate(self):
+        '''rf_rate out of range raise ValueError'''
+        self.assertRaises(ValueError, rolling.sharpe, self.test_daily, 10, 1.5)
+
+    def test_bad_frequency(self):
+        '''unknown frequency raise ValueError'''
+        self.assertRaises(ValueError, rolling.calmar, self.test_daily, 10, 'H')
+
+if __name__ == '__main__':
+    unittest.main()
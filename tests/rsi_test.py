@@ -1,5 +1,6 @@
 import os
 import unittest
+import numpy as np
 import pandas as pd
 from context import technical as ti
 
@@ -54,6 +55,14 @@ class ResultsRSI(unittest.TestCase):
         results = ti.RSI(self.test_data_df, self.ma, full_output=True)
         self.assertEqual(self.test_data_df.shape[1]+result_columns, results.shape[1])
 
+    def test_result_missing_value(self):
+        '''a missing close must give NaN at its bar and after it, as the former rule'''
+        data = self.test_data.copy()
+        data.loc[30, 'Close'] = np.nan
+        results = ti.RSI(data, self.ma)
+        self.assertTrue(results[30:].isna().all())
+        self.assertFalse(results[self.ma:30].isna().any())
+
 # Test input data
 class BadInputRSI(unittest.TestCase):
   # Input data
@@ -81,5 +90,27 @@ class BadInputRSI(unittest.TestCase):
     '''if df has more than one close column than should raise KeyError'''
     self.assertRaises(KeyError, ti.RSI, self.test_data_df_more_close, self.ma)
 
+# Test recursive average kernel
+class AverageRSI(unittest.TestCase):
+    # Input data
+    values = np.random.default_rng(0).random((500, 3))
+
+    # Input parameter
+    ma = 12
+
+    def test_recursive_average(self):
+        '''kernel must match the recursive rule'''
+        expected = np.full(self.values.shape, np.nan)
+        expected[self.ma] = self.values[self.ma]
+        for i in range(self.ma+1, self.values.shape[0]):
+            expected[i] = (expected[i-1] * (self.ma - 1) + self.values[i]) / self.ma
+        results = ti._rsi_average(self.values, self.ma, self.ma)
+        np.testing.assert_allclose(expected, results, rtol=1e-12)
+
+    def test_short_input(self):
+        '''input without a seed value must return only NaN'''
+        results = ti._rsi_average(self.values[:self.ma], self.ma, self.ma)
+        self.assertTrue(np.isnan(results).all())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import store
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test store results against csv results
+class ResultsStore(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+    test_daily = pd.read_csv('test_data/series_daily.csv')
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_result_round_trip(self):
+        '''loaded store must be equal to the csv data'''
+        store.to_store('test_data/correct_ohlc.csv', self.path)
+        result = store.load_store(self.path)
+        expected = self.test_data.set_index('Datetime')
+        expected.index = pd.to_datetime(expected.index)
+        pd.testing.assert_frame_equal(expected, result, check_index_type=False)
+        self.assertTrue(expected.index.equals(result.index))
+
+    def test_result_no_copy(self):
+        '''indicators must read the memory mapped columns without copying'''
+        store.to_store(self.test_data, self.path)
+        result = store.load_store(self.path)
+        for col in ['High', 'Low', 'Close']:
+            base = result[col].to_numpy()
+            while not isinstance(base, np.memmap) and base.base is not None:
+                base = base.base
+            self.assertIsInstance(base, np.memmap)
+            self.assertTrue(np.shares_memory(ti._column(result, col), result[col].to_numpy()))
+
+    def test_result_indicators(self):
+        '''indicators must give the same results for the store and the csv'''
+        store.to_store(self.test_data, self.path)
+        result = store.load_store(self.path, columns=['High', 'Low', 'Close'])
+        expected = self.test_data[['High', 'Low', 'Close']]
+        for func, args in [(ti.ADX, (12,)), (ti.ATR, (12,)), (ti.RSI, (12,))]:
+            np.testing.assert_allclose(pd.DataFrame(func(expected, *args)).to_numpy(dtype=float),
+                                       pd.DataFrame(func(result, *args)).to_numpy(dtype=float),
+                                       err_msg=func.__name__)
+
+    def test_result_performance(self):
+        '''performance metrics must give the same results for the store and the csv'''
+        store.to_store('test_data/series_daily.csv', self.path)
+        result = store.load_store(self.path, columns=['Close'])
+        for func, args in [(pi.CAGR, ('D',)), (pi.volatility, ('D',)), (pi.sharpe, (0.05, 'D')),
+                           (pi.max_dd, ()), (pi.calmar, ('D',))]:
+            self.assertAlmostEqual(func(self.test_daily[['Close']], *args), func(result, *args),
+                                   msg=func.__name__)
+
+    def test_result_values_index(self):
+        '''data without time column must keep its index'''
+        data = self.test_data.drop(columns=['Datetime'])
+        store.to_store(data, self.path)
+        result = store.load_store(self.path)
+        pd.testing.assert_frame_equal(data, result, check_index_type=False)
+
+# Test inputs
+class BadInputStore(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+
+    def test_input_not_df(self):
+        '''input data that is not a DataFrame or path raise TypeError'''
+        self.assertRaises(TypeError, store.to_store, self.test_data.values, 'unused')
+
+    def test_not_a_store(self):
+        '''directory without store files raise ValueError'''
+        self.assertRaises(ValueError, store.load_store, 'test_data')
+
+    def test_missing_column(self):
+        '''columns missing from the store raise IndexError'''
+        path = tempfile.mkdtemp()
+        try:
+            store.to_store(self.test_data, path)
+            self.assertRaises(IndexError, store.load_store, path, ['Close', 'Foo'])
+        finally:
+            shutil.rmtree(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import streaming as st
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test streams against batch functions
+class ResultsStreaming(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+    test_series = pd.read_csv('test_data/correct_series.csv')
+
+    # Input parameter
+    ma = 12
+
+    def run_stream(self, stream, bars):
+        '''feed bars one at a time and collect outputs'''
+        return pd.DataFrame([stream.update(bar) for bar in bars])
+
+    def assert_frame_close(self, expected, results):
+        np.testing.assert_allclose(expected.to_numpy(dtype=float),
+                                   results[expected.columns].to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-9)
+
+    def test_result_atr(self):
+        '''atr stream must match batch result'''
+        expected = ti.ATR(self.test_data, self.ma)
+        results = self.run_stream(st.ATRStream(self.ma), self.test_data.to_dict('records'))
+        self.assert_frame_close(expected, results)
+
+    def test_result_adx(self):
+        '''adx stream must match batch result'''
+        expected = ti.ADX(self.test_data, self.ma)
+        results = self.run_stream(st.ADXStream(self.ma), self.test_data.to_dict('records'))
+        self.assert_frame_close(expected, results)
+
+    def test_result_rsi(self):
+        '''rsi stream must match batch result'''
+        expected = ti.RSI(self.test_series, self.ma).to_frame('rsi')
+        results = self.run_stream(st.RSIStream(self.ma), self.test_series['Close'])
+        self.assert_frame_close(expected, results)
+
+    def test_result_macd(self):
+        '''macd stream must match batch result'''
+        expected = ti.MACD(self.test_series, 26, 12, 9)
+        results = self.run_stream(st.MACDStream(26, 12, 9), self.test_series.to_dict('records'))
+        self.assert_frame_close(expected, results)
+
+    def test_result_bollband(self):
+        '''bollinger stream must match batch result'''
+        expected = ti.bollband(self.test_series, self.ma)
+        results = self.run_stream(st.BollingerStream(self.ma), self.test_series['Close'])
+        self.assert_frame_close(expected, results)
+
+    def test_result_bollband_large_prices(self):
+        '''bollinger stream must match batch result for large prices and any multiplier'''
+        prices = 1e9 + np.cumsum(np.random.default_rng(0).normal(0, 0.5, 5000))
+        expected = ti.bollband(pd.Series(prices), self.ma, mult=2.5)
+        results = self.run_stream(st.BollingerStream(self.ma, mult=2.5), prices)
+        np.testing.assert_allclose(expected.to_numpy(), results[expected.columns].to_numpy(),
+                                   rtol=0, atol=1e-5)
+
+    def test_result_obv(self):
+        '''obv stream must match batch result'''
+        expected = ti.OBV(self.test_data)
+        results = self.run_stream(st.OBVStream(), self.test_data.to_dict('records'))
+        self.assert_frame_close(expected, results)
+
+    def test_result_obv_missing_volume(self):
+        '''obv stream must skip missing volumes as batch result'''
+        data = self.test_data.copy()
+        data['Volume'] = data['Volume'].astype(float)
+        data.loc[[3, 10, 11], 'Volume'] = np.nan
+        expected = ti.OBV(data)
+        results = self.run_stream(st.OBVStream(), data.to_dict('records'))
+        self.assert_frame_close(expected, results)
+
+# Test input data
+class BadInputStreaming(unittest.TestCase):
+    # Input data
+    test_bar = {'High': 10.0, 'Low': 9.0, 'Close': 9.5, 'Adj Close': 9.5}
+
+    def test_parameter_not_int(self):
+        '''if ma is not integer should raise TypeError'''
+        self.assertRaises(TypeError, st.RSIStream, 11.59)
+
+    def test_macd_slow_smaller_than_fast(self):
+        '''if slow is not bigger than fast should raise ValueError'''
+        self.assertRaises(ValueError, st.MACDStream, 12, 26, 9)
+
+    def test_bar_missing_column(self):
+        '''if bar has a missing column should raise IndexError'''
+        self.assertRaises(IndexError, st.OBVStream().update, self.test_bar)
+
+    def test_bar_more_than_one_close(self):
+        '''if bar has more than one close column should raise KeyError'''
+        self.assertRaises(KeyError, st.RSIStream(12).update, self.test_bar)
+
+    def test_bar_not_valid_type(self):
+        '''if bar is not a number or mapping should raise TypeError'''
+        self.assertRaises(TypeError, st.MACDStream(26, 12, 9).update, [9.5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import sweep
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test sweep results against one call for each parameter value
+class ResultsSweep(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close'])
+    test_series = pd.read_csv('test_data/correct_series.csv')
+
+    # Input parameters
+    mas = [2, 5, 12, 30, 80]
+    grid = [(26, 12, 9), (24, 12, 9), (26, 5, 3), (26, 12, 3)]
+
+    def test_result_atr(self):
+        '''atr sweep must be equal to atr for every window size'''
+        results = sweep.ATR(self.test_data, self.mas)
+        for ma in self.mas:
+            expected = ti.ATR(self.test_data, ma)['atr']
+            np.testing.assert_allclose(expected, results[ma], rtol=1e-10, err_msg=str(ma))
+
+    def test_result_rsi(self):
+        '''rsi sweep must be equal to rsi for every window size'''
+        results = sweep.RSI(self.test_series, self.mas)
+        for ma in self.mas:
+            expected = ti.RSI(self.test_series, ma)
+            np.testing.assert_allclose(expected, results[ma], rtol=1e-10, err_msg=str(ma))
+
+    def test_result_rsi_missing_value(self):
+        '''rsi sweep must keep missing closes as rsi does'''
+        data = self.test_series.copy()
+        data.loc[30, 'Close'] = np.nan
+        results = sweep.RSI(data, self.mas)
+        for ma in self.mas:
+            expected = ti.RSI(data, ma)
+            np.testing.assert_allclose(expected, results[ma], rtol=1e-10, err_msg=str(ma))
+
+    def test_result_bollband(self):
+        '''bollband sweep must be equal to bollband for every window size'''
+        results = sweep.bollband(self.test_data, self.mas)
+        for ma in self.mas:
+            expected = ti.bollband(self.test_data, ma)
+            for col in ['bollband_up', 'bollband_low']:
+                np.testing.assert_allclose(expected[col], results[(col, ma)], rtol=1e-10,
+                                           err_msg=col + ' ' + str(ma))
+
+    def test_result_bollband_large_prices(self):
+        '''bollband sweep must keep the precision of bollband at large price levels'''
+        data = self.test_data.copy()
+        data['Close'] = data['Close'] + 1e5
+        results = sweep.bollband(data, self.mas)
+        for ma in self.mas:
+            expected = ti.bollband(data, ma)
+            for col in ['bollband_up', 'bollband_low']:
+                np.testing.assert_allclose(expected[col], results[(col, ma)], rtol=0, atol=1e-9,
+                                           err_msg=col + ' ' + str(ma))
+
+    def test_result_macd(self):
+        '''macd sweep must be equal to macd for every parameter set'''
+        results = sweep.MACD(self.test_series, self.grid)
+        for params in self.grid:
+            expected = ti.MACD(self.test_series, *params)
+            for col in ['macd_line', 'macd_signal']:
+                np.testing.assert_allclose(expected[col], results[(col,) + params], rtol=1e-10,
+                                           err_msg=col + ' ' + str(params))
+
+    def test_result_shape(self):
+        '''sweep must return one row for each observation and one column for each window size'''
+        results = sweep.RSI(self.test_series, range(2, 50))
+        self.assertEqual((self.test_series.shape[0], 48), results.shape)
+
+    def test_result_missing_values(self):
+        '''windows with missing values must be NaN like pandas rolling mean'''
+        series = self.test_series['Close'].copy()
+        series.iloc[[10, 11, 40]] = np.nan
+        results = sweep._rolling_means(series.to_numpy(), self.mas)
+        for j, ma in enumerate(self.mas):
+            expected = series.rolling(ma).mean()
+            np.testing.assert_allclose(expected, results[:, j], rtol=1e-10, err_msg=str(ma))
+
+# Test inputs
+class BadInputSweep(unittest.TestCase):
+    # Input data
+    test_data = pd.read_csv('test_data/correct_ohlc.csv')
+    test_series = pd.read_csv('test_data/correct_series.csv')
+
+    def test_parameter_not_int(self):
+        '''window sizes that are not integers raise TypeError'''
+        self.assertRaises(TypeError, sweep.RSI, self.test_series, [12, 11.59])
+
+    def test_parameter_not_positive(self):
+        '''window sizes below 1 raise ValueError'''
+        self.assertRaises(ValueError, sweep.ATR, self.test_data, [0, 12])
+
+    def test_no_parameters(self):
+        '''empty sweep raise ValueError'''
+        self.assertRaises(ValueError, sweep.RSI, self.test_series, [])
+
+    def test_input_data_not_df(self):
+        '''input data that is not a DataFrame raise TypeError'''
+        self.assertRaises(TypeError, sweep.ATR, self.test_series.values, [12])
+
+    def test_df_more_than_one_close_column(self):
+        '''more than one close column raise KeyError'''
+        self.assertRaises(KeyError, sweep.bollband, self.test_data, [12])
+
+    def test_macd_slow_smaller_than_fast(self):
+        '''slow line smaller than fast line raise ValueError'''
+        self.assertRaises(ValueError, sweep.MACD, self.test_series, [(12, 26, 9)])
+
+if __name__ == '__main__':
+    unittest.main()
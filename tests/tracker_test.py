@@ -0,0 +1,94 @@
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from context import performance as pi
+from context import streaming as st
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test tracker against batch functions
+class ResultsTracker(unittest.TestCase):
+    # Input data
+    test_yearly = pd.Series([100, 120, 110, 100, 110, 130])
+    test_monthly = pd.read_csv('test_data/ohlc_monthly.csv')['Close']
+    test_daily = pd.read_csv('test_data/series_daily.csv')['Close']
+
+    # Input parameter
+    rate = 0.05
+
+    def assert_batch(self, tracker, series, frequency, only_business=True):
+        '''tracker must match every batch function'''
+        self.assertAlmostEqual(pi.CAGR(series, frequency, only_business), tracker.cagr())
+        self.assertAlmostEqual(pi.volatility(series, frequency, only_business), tracker.volatility())
+        self.assertAlmostEqual(pi.sharpe(series, self.rate, frequency, only_business),
+                               tracker.sharpe(self.rate))
+        self.assertAlmostEqual(pi.max_dd(series), tracker.max_dd())
+        self.assertAlmostEqual(pi.calmar(series, frequency, only_business), tracker.calmar())
+
+    def test_result_one_at_a_time(self):
+        '''prices added one at a time'''
+        for series, frequency in [(self.test_yearly, 'Y'), (self.test_monthly, 'M'),
+                                  (self.test_daily, 'D')]:
+            tracker = st.PerformanceTracker(frequency)
+            for price in series:
+                tracker.update(price)
+            self.assert_batch(tracker, series, frequency)
+
+    def test_result_chunks(self):
+        '''prices added in chunks'''
+        tracker = st.PerformanceTracker('M')
+        for chunk in np.array_split(self.test_monthly.to_numpy(), 5):
+            tracker.update(chunk)
+        self.assert_batch(tracker, self.test_monthly, 'M')
+
+    def test_result_every_prefix(self):
+        '''tracker must match batch functions after every update'''
+        tracker = st.PerformanceTracker('D', only_business=False)
+        for i, price in enumerate(self.test_daily):
+            tracker.update(price)
+            if i >= 2:
+                self.assert_batch(tracker, self.test_daily[:i+1], 'D', only_business=False)
+
+    def test_result_report(self):
+        '''report must match performance_report'''
+        tracker = st.PerformanceTracker('M')
+        tracker.update(self.test_monthly)
+        expected = pi.performance_report(self.test_monthly, self.rate, 'M')
+        for name, value in tracker.report(self.rate).items():
+            self.assertAlmostEqual(expected[name], value, msg=name)
+
+    def test_result_current_drawdown(self):
+        '''current drawdown from the running peak'''
+        tracker = st.PerformanceTracker()
+        tracker.update([100, 120, 110, 100])
+        self.assertAlmostEqual(20 / 120, tracker.drawdown)
+
+# Test inputs
+class BadInputTracker(unittest.TestCase):
+
+    def test_frequency_parameter(self):
+        '''invalid string for frequency raise ValueError'''
+        self.assertRaises(ValueError, st.PerformanceTracker, frequency='mo')
+
+    def test_business_parameter(self):
+        '''invalid value for only_business raise TypeError'''
+        self.assertRaises(TypeError, st.PerformanceTracker, only_business='Yes')
+
+    def test_volatility_equal_zero(self):
+        '''volatility equal zero must raise ZeroDivisionError'''
+        tracker = st.PerformanceTracker()
+        tracker.update(np.ones(10))
+        self.assertRaises(ZeroDivisionError, tracker.sharpe, 0.1)
+
+    def test_rf_rate_out_of_range(self):
+        '''rf_rate out of range (0-1) raise ValueError'''
+        tracker = st.PerformanceTracker()
+        tracker.update([100, 120, 110])
+        self.assertRaises(ValueError, tracker.sharpe, 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from context import technical as ti
+from context import performance as pi
+from context import universe
+
+# Change working directory
+# This enable running tests from repository root
+if os.getcwd() != os.path.abspath(os.path.dirname(__file__)):
+    os.chdir('tests/')
+
+# Test universe results against one call for each symbol
+class ResultsUniverse(unittest.TestCase):
+    # Input data, third symbol has a shorter history
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv').drop(columns=['Adj Close']).set_index('Datetime')
+    symbols = {
+        'AAA': ohlc,
+        'BBB': ohlc * 1.5,
+        'CCC': ohlc.iloc[20:],
+    }
+
+    # Indicators and input parameters
+    specs = [
+        (ti.ADX, {'ma': 12}),
+        (ti.RSI, {'ma': 12}),
+        (ti.ATR, {'ma': 14}, 'atr14'),
+        (pi.sharpe, {'rf_rate': 0.05, 'frequency': 'D'}),
+        (pi.calmar, {'frequency': 'D'}),
+    ]
+
+    def check(self, panel, summary):
+        '''results must be equal to single symbol results'''
+        for sym, df in self.symbols.items():
+            expected = pd.concat([ti.ADX(df, 12), ti.RSI(df, 12),
+                                  ti.ATR(df, 14).add_prefix('atr14_')], axis=1)
+            result = panel[sym].loc[df.index]
+            self.assertEqual(list(expected.columns), list(result.columns))
+            np.testing.assert_allclose(expected.to_numpy(dtype=float),
+                                       result.to_numpy(dtype=float), err_msg=sym)
+            self.assertAlmostEqual(pi.sharpe(df, 0.05, 'D'), summary.loc[sym, 'sharpe'])
+            self.assertAlmostEqual(pi.calmar(df, 'D'), summary.loc[sym, 'calmar'])
+
+    def test_result_pool(self):
+        '''process pool results must be equal to single symbol results'''
+        self.check(*universe.run_universe(self.symbols, self.specs, workers=2))
+
+    def test_result_single_process(self):
+        '''single process results must be equal to single symbol results'''
+        self.check(*universe.run_universe(self.symbols, self.specs, workers=1))
+
+    def test_result_directory(self):
+        '''a directory of csv files must give the same results as a dict'''
+        path = tempfile.mkdtemp()
+        try:
+            for sym, df in self.symbols.items():
+                df.to_csv(os.path.join(path, sym + '.csv'))
+            self.check(*universe.run_universe(path, self.specs, workers=2))
+        finally:
+            shutil.rmtree(path)
+
+    def test_result_columns(self):
+        '''only the chosen columns must be sent to workers'''
+        data = {'AAA': pd.read_csv('test_data/correct_ohlc.csv')}
+        panel, _ = universe.run_universe(data, [(ti.RSI, {'ma': 12})], workers=2, columns=['Close'])
+        np.testing.assert_allclose(ti.RSI(data['AAA']['Close'], 12), panel[('AAA', 'rsi')])
+
+    def test_result_infer_frequency(self):
+        '''workers must see the DatetimeIndex of each symbol to infer its frequency'''
+        data = {sym: df.set_axis(pd.to_datetime(df.index)) for sym, df in self.symbols.items()}
+        data['CCC'] = data['CCC'].tz_convert('America/New_York')
+        specs = [(pi.sharpe, {'rf_rate': 0.05, 'frequency': 'infer'})]
+        for workers in [1, 2]:
+            _, summary = universe.run_universe(data, specs, workers=workers)
+            for sym, df in data.items():
+                self.assertAlmostEqual(pi.sharpe(df, 0.05, 'infer'), summary.loc[sym, 'sharpe'])
+
+    def test_result_report(self):
+        '''a series of metrics must give one summary column for each metric'''
+        specs = [(pi.performance_report, {'rf_rate': 0.05, 'frequency': 'D'}),
+                 (pi.performance_report, {'rf_rate': 0.05, 'frequency': 'W'}, 'weekly')]
+        for workers in [1, 2]:
+            panel, summary = universe.run_universe(self.symbols, specs, workers=workers)
+            self.assertTrue(panel.empty)
+            for sym, df in self.symbols.items():
+                expected = pi.performance_report(df, 0.05, 'D')
+                for metric, value in expected.items():
+                    self.assertAlmostEqual(value, summary.loc[sym, metric])
+                    self.assertAlmostEqual(pi.performance_report(df, 0.05, 'W')[metric],
+                                           summary.loc[sym, 'weekly_' + metric])
+
+    def test_result_dtypes(self):
+        '''integer columns and results must keep the dtype of a direct call'''
+        # Symbols with the same rows, shorter ones are padded with NaN in the panel
+        data = {sym: self.symbols[sym].astype({'Volume': 'int64'}) for sym in ['AAA', 'BBB']}
+        for workers in [1, 2]:
+            panel, _ = universe.run_universe(data, [(ti.OBV, {}), (ti.RSI, {'ma': 12})], workers=workers)
+            for sym, df in data.items():
+                expected = ti.OBV(df)['obv']
+                result = panel[(sym, 'obv')].loc[df.index]
+                self.assertEqual(expected.dtype, result.dtype)
+                np.testing.assert_array_equal(expected.to_numpy(), result.to_numpy())
+
+# Test inputs
+class BadInputUniverse(unittest.TestCase):
+    # Input data
+    ohlc = pd.read_csv('test_data/correct_ohlc.csv')
+
+    def test_universe_not_dict(self):
+        '''universe that is not a dict or path raise TypeError'''
+        self.assertRaises(TypeError, universe.run_universe, [self.ohlc], [(ti.ADX, {'ma': 12})])
+
+    def test_bad_spec(self):
+        '''spec that is not a tuple raise ValueError'''
+        self.assertRaises(ValueError, universe.run_universe, {'AAA': self.ohlc}, [ti.ADX])
+
+    def test_bad_workers(self):
+        '''non positive number of workers raise ValueError'''
+        self.assertRaises(ValueError, universe.run_universe, {'AAA': self.ohlc},
+                          [(ti.ADX, {'ma': 12})], workers=0)
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'shared memory blocks are not listed')
+    def test_failed_symbol_releases_memory(self):
+        '''a failing symbol raise its error and leave no shared memory blocks'''
+        data = {'BAD': self.ohlc.drop(columns=['High']), 'AAA': self.ohlc, 'BBB': self.ohlc}
+        before = set(os.listdir('/dev/shm'))
+        self.assertRaises(IndexError, universe.run_universe, data,
+                          [(ti.ADX, {'ma': 12}), (ti.ATR, {'ma': 12})], workers=2)
+        self.assertEqual(set(), set(os.listdir('/dev/shm')) - before)
+
+    def test_missing_columns(self):
+        '''columns missing from a symbol raise IndexError'''
+        self.assertRaises(IndexError, universe.run_universe, {'AAA': self.ohlc},
+                          [(ti.ADX, {'ma': 12})], columns=['Close', 'Foo'])
+
+if __name__ == '__main__':
+    unittest.main()
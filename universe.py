@@ -0,0 +1,355 @@
+"""
+Implements a runner that computes technical and performance
+indicators for a whole universe of symbols, spreading the
+symbols over a pool of processes.
+"""
+
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import technical as ti
+
+def _read_universe(data):
+    """
+    Mapping of symbol to DataFrame, read from a directory of
+    csv files (one per symbol, named after it) if a path is given.
+    """
+
+    if isinstance(data, (str, os.PathLike)):
+        if not os.path.isdir(data):
+            raise ValueError('Universe path is not a directory.')
+        universe = {}
+        for path in sorted(glob.glob(os.path.join(data, '*.csv'))):
+            df = pd.read_csv(path)
+            # Time column, if any, becomes the index so symbols align
+            time_cols = [col for col in df.columns if col in ti._TIME_COLS]
+            if time_cols:
+                df = df.set_index(time_cols[0])
+            universe[os.path.splitext(os.path.basename(path))[0]] = df
+        return universe
+
+    if not isinstance(data, dict):
+        raise TypeError('Universe is not a dict or a directory path.')
+    for df in data.values():
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError('Universe values must be pandas DataFrames.')
+
+    return data
+
+def _read_specs(specs):
+    """
+    Check indicator specs, returns (func, params, name) tuples.
+    """
+
+    checked = []
+    for spec in specs:
+        if not isinstance(spec, tuple) or len(spec) not in (2, 3):
+            raise ValueError('Indicator specs must be (func, params) or (func, params, name) tuples.')
+        func, params = spec[0], spec[1]
+        name = spec[2] if len(spec) == 3 else None
+        if not callable(func):
+            raise TypeError('Indicator spec function is not callable.')
+        if not isinstance(params, dict):
+            raise TypeError('Indicator spec parameters must be a dict.')
+        checked.append((func, params, name))
+
+    if len(checked) == 0:
+        raise ValueError('No indicator specs to run.')
+
+    return checked
+
+def _compute(df, specs):
+    """
+    Run every spec on one symbol. A Series with the rows of the
+    symbol is a time series, any other Series (e.g. the metrics of
+    performance_report) gives one scalar result for each entry.
+    Returns
+    ----------
+    tuple
+        Dict of computed series as arrays and dict of scalar results
+    """
+
+    series = {}
+    scalars = {}
+    for func, params, name in specs:
+        result = func(df, **params)
+        if isinstance(result, pd.DataFrame):
+            for col in result.columns:
+                series[col if name is None else name + '_' + str(col)] = result[col].to_numpy()
+        elif isinstance(result, pd.Series) and result.index.equals(df.index):
+            series[result.name if name is None else name] = result.to_numpy()
+        elif isinstance(result, pd.Series):
+            for key, value in result.items():
+                scalars[key if name is None else name + '_' + str(key)] = value
+        else:
+            scalars[func.__name__ if name is None else name] = result
+
+    return series, scalars
+
+def _index_parts(index):
+    """
+    A DatetimeIndex as int64 timestamps, unit, timezone and name,
+    so workers can rebuild it for time based indicators (e.g.
+    frequency='infer'). None for other indexes.
+    """
+
+    if not isinstance(index, pd.DatetimeIndex):
+        return None
+
+    # Timestamps of timezone aware indexes are in UTC. The unit is read
+    # from the dtype, DatetimeIndex.unit needs pandas 2
+    return index.asi8, np.datetime_data(index.values.dtype)[0], index.tz, index.name
+
+def _rebuild_index(parts, rows):
+    """
+    Index of a symbol frame in a worker, see _index_parts.
+    """
+
+    if parts is None:
+        return pd.RangeIndex(rows)
+
+    times, unit, tz, name = parts
+    index = pd.DatetimeIndex(times.view('datetime64[' + unit + ']'), name=name)
+
+    return index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
+
+def _numeric(values):
+    """
+    Array of numbers, integer and float arrays keep their dtype
+    (e.g. an int64 Volume), anything else is read as float64.
+    """
+
+    if isinstance(values, pd.Series):
+        # Nullable and other extension dtypes are read as floats
+        if not isinstance(values.dtype, np.dtype) or values.dtype.kind not in 'iuf':
+            return values.to_numpy(dtype=float, na_value=np.nan)
+        return values.to_numpy()
+
+    values = np.asarray(values)
+    if values.dtype.kind not in 'iuf':
+        values = values.astype(float)
+
+    return values
+
+def _layout(arrays, start=0):
+    """
+    Place of each array in a shared memory block, one after the
+    other from start, each aligned to 8 bytes.
+    Returns
+    ----------
+    tuple
+        List of (name, dtype, offset) and the end of the last array
+    """
+
+    layout = []
+    offset = start
+    for name, arr in arrays.items():
+        layout.append((name, arr.dtype.str, offset))
+        offset += -(-arr.nbytes // 8) * 8
+
+    return layout, offset
+
+def _views(buf, layout, rows):
+    """
+    Arrays of a layout, as views of a shared memory buffer.
+    """
+
+    return {name: np.ndarray((rows,), dtype=dtype, buffer=buf, offset=offset)
+            for name, dtype, offset in layout}
+
+def _worker(block, layout, rows, index, specs):
+    """
+    Run every spec on one symbol, reading its columns from
+    the shared memory block instead of a pickled DataFrame.
+    Series results are written to a new shared memory block,
+    which is released by the parent process.
+    """
+
+    shm = shared_memory.SharedMemory(name=block)
+    try:
+        columns = _views(shm.buf, layout, rows)
+        df = pd.DataFrame(columns, index=_rebuild_index(index, rows))
+        series, scalars = _compute(df, specs)
+        del df, columns
+    finally:
+        shm.close()
+
+    if not series:
+        return None, scalars
+
+    # Each series keeps its dtype in the block
+    series = {name: _numeric(arr) for name, arr in series.items()}
+    out_layout, size = _layout(series)
+    out = shared_memory.SharedMemory(create=True, size=max(1, size))
+    views = None
+    try:
+        views = _views(out.buf, out_layout, rows)
+        for name, arr in series.items():
+            views[name][...] = arr
+    except BaseException:
+        # The parent never learns the name of a failed block
+        out.unlink()
+        raise
+    finally:
+        views = None
+        out.close()
+
+    return (out.name, out_layout), scalars
+
+def _collect(result, rows):
+    """
+    Read the series written by a worker and release their block.
+    """
+
+    layout, scalars = result
+    if layout is None:
+        return {}, scalars
+
+    block, names = layout
+    shm = shared_memory.SharedMemory(name=block)
+    try:
+        series = {name: np.array(arr) for name, arr in _views(shm.buf, names, rows).items()}
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return series, scalars
+
+def _release(result):
+    """
+    Release the block written by a worker without reading it.
+    """
+
+    layout, _ = result
+    if layout is None:
+        return
+
+    shm = shared_memory.SharedMemory(name=layout[0])
+    shm.close()
+    shm.unlink()
+
+def _gather(results, frames):
+    """
+    Join the results of every symbol.
+    Returns
+    ----------
+    tuple
+        Panel with MultiIndex columns (symbol, field) and
+        DataFrame of scalar results with symbols as rows
+    """
+
+    panel = {}
+    summary = {}
+    for sym, (series, scalars) in results.items():
+        if series:
+            panel[sym] = pd.DataFrame(series, index=frames[sym].index)
+        summary[sym] = scalars
+
+    panel = pd.concat(panel, axis=1) if panel else pd.DataFrame()
+    summary = pd.DataFrame.from_dict(summary, orient='index')
+
+    return panel, summary
+
+def run_universe(data, specs, workers=None, columns=None):
+    """
+    Compute indicators for every symbol of a universe,
+    using a pool of processes.
+    Parameters
+    ----------
+    data: dict/str
+        Mapping of symbol to OHLC(+Volume) DataFrame, or the path of
+        a directory with one csv file per symbol (e.g. AAPL.csv). A
+        Datetime or Date column of the csv files becomes the index.
+        A DatetimeIndex is kept in the frames given to the indicators.
+    specs: list
+        (func, params) or (func, params, name) tuples, e.g.
+        (technical.ADX, {'ma': 14}) or (performance.sharpe, {'rf_rate': 0.05}).
+        Each func is called with the symbol DataFrame and params.
+        With a name, output columns are prefixed with it.
+    workers: int
+        Number of processes, defaults to the number of cores.
+        With 1 symbols are computed in this process.
+    columns: list
+        Columns sent to the workers, defaults to all numeric
+        columns. Useful to drop an ambiguous Adj Close column.
+    Returns
+    ----------
+    tuple
+        pd.DataFrame with MultiIndex columns (symbol, field) for
+        series results and pd.DataFrame with one row per symbol
+        for scalar results (e.g. performance indicators)
+    """
+
+    # Handles input data
+    universe = _read_universe(data)
+    specs = _read_specs(specs)
+
+    # Handles parameter input
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise ValueError('Number of workers must be a positive integer.')
+
+    # Numeric columns of each symbol, the only data sent to workers
+    frames = {}
+    for sym, df in universe.items():
+        cols = df.select_dtypes('number').columns if columns is None else columns
+        if not set(cols).issubset(df.columns):
+            raise IndexError('Missing necessary columns (' + ', '.join(map(str, cols)) + ').')
+        frames[sym] = df[list(cols)]
+
+    arrays = {sym: {col: _numeric(df[col]) for col in df.columns} for sym, df in frames.items()}
+
+    if workers == 1:
+        results = {sym: _compute(pd.DataFrame(arrays[sym], index=df.index), specs)
+                   for sym, df in frames.items()}
+        return _gather(results, frames)
+
+    # Every symbol is copied once into a single shared block,
+    # each column with its own dtype
+    layouts = []
+    size = 0
+    for sym in frames:
+        layout, size = _layout(arrays[sym], size)
+        layouts.append(layout)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        tasks = []
+        for (sym, df), layout in zip(frames.items(), layouts):
+            views = _views(shm.buf, layout, df.shape[0])
+            for col, arr in arrays[sym].items():
+                views[col][...] = arr
+            del views
+            tasks.append((shm.name, layout, df.shape[0], _index_parts(df.index), specs))
+
+        # Every symbol is waited for, so the blocks of the others can be
+        # released when one fails
+        outcomes = {}
+        error = None
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {sym: executor.submit(_worker, *task) for sym, task in zip(frames, tasks)}
+            for sym, future in futures.items():
+                try:
+                    outcomes[sym] = future.result()
+                except Exception as exc:
+                    error = exc if error is None else error
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results = {}
+    try:
+        if error is not None:
+            raise error
+        for sym in frames:
+            results[sym] = _collect(outcomes.pop(sym), frames[sym].shape[0])
+    finally:
+        for outcome in outcomes.values():
+            _release(outcome)
+
+    return _gather(results, frames)